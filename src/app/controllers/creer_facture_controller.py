@@ -1,3 +1,4 @@
+from PySide6.QtCore import QObject, Signal
 from app.model.facture import Facture
 from app.model.patient import Patient
 from app.model.rendezVous import RendezVous
@@ -6,11 +7,19 @@ from app.model.ligneFacture import LigneFacture
 from datetime import timedelta, datetime
 import app.services.constantes_manager as cm
 import app.services.facture_generator as fg
-import app.services.mail_sender as ms
+import app.services.facturation as facturation
+from app.services.facturation_masse import BilanFacturation, FacturationMasse
+from app.controllers.taches import ExecuteurTaches
 
 from app.views.creer_facture_view import creerFactureView
 
 
+class SignauxFacturation(QObject):
+    """Signaux émis depuis le thread de facturation de masse (reçus dans le thread de l'interface)."""
+    progression: Signal = Signal(int, int, str)
+    """Avancement (patients traités, total, message)."""
+
+
 class CreerFactureController:
     def __init__(self, model, view: creerFactureView):
         self.patientModel: Patient = Patient
@@ -21,18 +30,47 @@ class CreerFactureController:
         self.typeRDVModel: TypeRDV = TypeRDV
         self.ligneFactureModel: LigneFacture = LigneFacture
         self.view: creerFactureView = view
-        self.type_rdv_liste: list[TypeRDV] = self.typeRDVModel.getAllTypesRDV()
+        # Types de rendez-vous (prix), chargés par une tâche
+        self.type_rdv_liste: list[TypeRDV] = []
+        self.types_rdv_par_id: dict[int, TypeRDV] = {}
+        # Les appels au modèle sont exécutés hors du thread de l'interface
+        self.taches = ExecuteurTaches()
         # Connecter les signaux de la vue aux méthodes du contrôleur
         self.view.mass_facture_generer.connect(self.on_mass_facture_generer)
         self.view.single_facture_generer.connect(self.on_single_facture_generer)
         self.view.refresh.connect(self.on_refresh)
-        self.view.set_patient_list(self.patientModel.getAllPatients())
+        self.view.annuler_facturation.connect(self.on_annuler_facturation)
+        # Facturation de masse exécutée hors du thread de l'interface
+        self.facturation_en_cours: FacturationMasse | None = None
+        self.preparation_en_cours = False
+        self.signaux = SignauxFacturation()
+        self.signaux.progression.connect(self.view.afficher_progression_facturation)
+        self.on_refresh()
 
     def on_refresh(self):
-        self.view.set_patient_list(self.patientModel.getAllPatients())
+        self.taches.soumettre(self.patientModel.getAllPatients, on_resultat=self.view.set_patient_list, on_erreur=self.on_erreur_chargement, cle="patients")
+        self.taches.soumettre(self.typeRDVModel.getAllTypesRDV, on_resultat=self.set_types_rdv, on_erreur=self.on_erreur_chargement, cle="types_rdv")
+
+    def on_erreur_chargement(self, erreur: Exception) -> None:
+        """Signaler l'échec du chargement des patients ou des types de rendez-vous.
+
+        args:
+            erreur (Exception): L'erreur levée pendant le chargement.
+        """
+        print(f"[ERREUR] {erreur}")
+        self.view.afficher_erreur("Les listes de la facturation n'ont pas pu être chargées.", erreur)
+
+    def set_types_rdv(self, type_rdv_liste: list[TypeRDV]) -> None:
+        """Mettre à jour les types de rendez-vous utilisés pour les prix.
+
+        args:
+            type_rdv_liste (list[TypeRDV]): Les types de rendez-vous.
+        """
+        self.type_rdv_liste = type_rdv_liste
+        self.types_rdv_par_id = {type_rdv.id: type_rdv for type_rdv in type_rdv_liste}
 
-    def facturer_patient(self, patient: Patient, start_date: datetime, end_date: datetime) -> tuple[int,str]:
-        """Facturer un patient pour les rendez-vous entre start_date et end_date.
+    def calculer_brouillon(self, patient: Patient, start_date: datetime, end_date: datetime) -> tuple[facturation.BrouillonFacture, list | None]:
+        """Calculer la facture d'un patient sans l'enregistrer. N'interagit pas avec la vue : peut être exécuté dans un thread de travail.
 
         args:
             patient (Patient): Le patient à facturer.
@@ -40,146 +78,163 @@ class CreerFactureController:
             end_date (datetime): La date de fin de la période de facturation.
 
         returns:
-            tuple[int,str]: L'ID de la facture créée et le chemin du PDF généré. Si aucun rendez-vous n'est facturé, retourne -1 et une chaîne vide.
+            tuple[facturation.BrouillonFacture, list | None]: La facture calculée et, si la facturation des absences
+                doit être confirmée par le praticien, l'historique de ses absences (None sinon).
         """
-        print("\n\n\n-----------------------------DEBUT EMISSION FACTURE----------------------------\n\n\n")
-        print("Facturation du patient :",patient.prenom,patient.nom)
-        print("Entre le", start_date, "et le", end_date)
-        liste_rdvs = self.rdvModel.getRendezVousByPatientAndDateRange(patient.id, start_date, end_date)
-        rdvs_factures = []
-        rdvs_patient_absent = []
-        rdvs_a_renseigner = []
-        annulation_factures = []
-        factures_generees = []
-        #Calculer le bon numéro de facture
-        facture = Facture(Facture.generate_numero_facture(datetime.today()),patient.id)
-        msg = f"""Facturation du patient {patient.prenom} {patient.nom} entre le {start_date} et le {end_date}\n
-        numéro de facture : {facture.id}\n
-        Liste des rendez-vous à facturer :
-        {"\n".join([f"- RDV ID {rdv.id} le {rdv.date} avec statut de présence : {rdv.presence}" for rdv in liste_rdvs])}"""
-        #print(msg)
-        
-        for rdv in liste_rdvs:
-            # si le rendez-vous est déjà facturé on ne le compte pas dans les rendez-vous à facturer
-            # on demande si on veut quand meme editer la facture sans ces rdvs
-            print("\nTraitement du rendez-vous ID : ", rdv.id, " le ", rdv.date," présence : ",rdv.presence)
-            
-            if(rdv.facture_id is not None and rdv.facture_id!="-1"):
-                print("Le rendez-vous ID :", rdv.id, "a déjà une facture ID :", rdv.facture_id)
-                annulation_factures.append(rdv.facture_id)
-                #on passe au rendez-vous d'après
-                continue
-            
-            if (rdv.presence == "Absent"):
-                print("Le patient était absent au rendez-vous ID :", rdv.id)
-                #si le patient est absent on ajoute le rdv à la liste des rdv ou il etait absent
-                rdvs_patient_absent.append(rdv)
-            elif (rdv.presence == "Présent"):
-                print("Le patient était présent au rendez-vous ID :", rdv.id)
-                # ca marche car les ids des types de rdv commencent à 1 et sont continus
-                new_ligne = LigneFacture(facture.id,rdv.id,self.type_rdv_liste[rdv.type_id-1].prix)
-                LigneFacture.addLigneFacture(new_ligne)
-                rdv.facture_id = facture.id
-                self.rdvModel.updateRendezVous(rdv.id, rdv)
-                #a enlever peut-etre
-                rdvs_factures.append(rdv)
-            elif (rdv.presence == "A définir"):
-                print("Le statut de présence n'est pas défini pour le rendez-vous ID :", rdv.id)
-                rdvs_a_renseigner.append(rdv)
-            elif (rdv.presence == "Absent excusé" or rdv.presence == "Annulé"):
-                print("Le rendez-vous ID :", rdv.id, "ne sera pas facturé (présence :", rdv.presence,")")
-                rdv.facture_id = -1  # on marque que ce rdv ne sera pas facturé
-                self.rdvModel.updateRendezVous(rdv.id, rdv)
-            else :
-                print("Statut de présence inconnu pour le rendez-vous ID :", rdv.id,"\t",rdv.presence)
+        # Calcul de la facture en mémoire : rien n'est écrit tant qu'elle n'est pas validée
+        # types pas encore chargés par la tâche du démarrage : lecture directe (on est déjà hors du thread de l'interface)
+        types_rdv = self.types_rdv_par_id or {type_rdv.id: type_rdv for type_rdv in self.typeRDVModel.getAllTypesRDV()}
+        brouillon = facturation.preparer_facture(patient, start_date, end_date, types_rdv)
+        if (len(brouillon.rdvs_a_renseigner) > 0):
+            return brouillon, None
 
-        # si un des rendez-vous n'a pas de statut de présence défini, on n'émet pas la facture
-        if (len(rdvs_a_renseigner) > 0):
-            self.view.erreur_completion_rdv(patient, rdvs_a_renseigner)
-            return -1,""
-        
-        if (len(annulation_factures) > 0):
-            for fac in annulation_factures :
-                lignes = LigneFacture.getAllLignesByFactureId(fac)
-                for l in lignes :                    
-                    rdv = self.rdvModel.getRendezVousById(l.rdv_id)
-                    rdv.facture_id = facture.id
-                    self.rdvModel.updateRendezVous(rdv.id, rdv)
-                    rdvs_factures.append(rdv)
-
-                    lfac_test = LigneFacture.getLigneFacture(facture.id,rdv.id)
-                    #on vérifie que la ligne de facture n'existe pas déjà avant de la recréer
-                    if(lfac_test is None) :
-                        lfac = LigneFacture(facture.id,rdv.id,l.montant_facture)
-                        LigneFacture.addLigneFacture(lfac)
-                        
-
-
-        # si le patient a des absences, on demande confirmation avant de facturer
-        
-        elif (len(rdvs_patient_absent) > 0):
+        # si le patient a des absences (et qu'aucune facture n'est remplacée), il faut une confirmation avant de facturer
+        if (len(brouillon.annulation_factures) == 0 and len(brouillon.rdvs_absents) > 0):
             #date a partir de la quelle on voit si le patient à déjà été absent
             historique_date = start_date - cm.get_constante("HISTORIQUE_ABSENCE_JOURS")*timedelta(days=1)
             absence_precedentes = [rdv if(rdv.presence=="Absent") else None for rdv in self.rdvModel.getRendezVousByPatientAndDateRange(patient.id, historique_date, start_date)]
-            facture_ensemble = self.view.erreur_patient_absent(patient, rdvs_patient_absent,absence_precedentes)
-
-            # si on confirme la facturation malgré les absences, on ne facture que 33€ par rendez-vous
-            if(facture_ensemble) :
-                for rdv in rdvs_patient_absent :
-                    
-                    rdv.facture_id = facture.id
-                    self.rdvModel.updateRendezVous(rdv.id, rdv)
-
-                    #TODO peut etre à enlever
-                    rdvs_factures.append(rdv)
-                    lfac = LigneFacture(facture.id,rdv.id,33)
-                    LigneFacture.addLigneFacture(lfac)
-            else :
-                # on marque le chois du praticien en mettant le montant des rendez-vous absents à 0
-                for rdv in rdvs_patient_absent:
-                    
-                    rdv.facture_id = facture.id
-                    self.rdvModel.updateRendezVous(rdv.id, rdv)
-
-                    #TODO peut etre à enlever
-                    rdvs_factures.append(rdv)
-                    lfac = LigneFacture(facture.id,rdv.id,0)
-                    LigneFacture.addLigneFacture(lfac)
+            return brouillon, absence_precedentes
+
+        return brouillon, None
+
+    def confirmer_absences(self, patient: Patient, brouillon: facturation.BrouillonFacture, absence_precedentes: list) -> None:
+        """Demander au praticien s'il faut facturer les absences d'un patient (thread de l'interface).
+
+        args:
+            patient (Patient): Le patient facturé.
+            brouillon (facturation.BrouillonFacture): La facture calculée, modifiée selon la réponse.
+            absence_precedentes (list): L'historique des absences du patient.
+        """
+        facture_ensemble = self.view.erreur_patient_absent(patient, brouillon.rdvs_absents,absence_precedentes)
+
+        # si on confirme la facturation malgré les absences, on ne facture que 33€ par rendez-vous
+        # sinon on marque le choix du praticien en mettant le montant des rendez-vous absents à 0
+        facturation.facturer_absences(brouillon, 33 if facture_ensemble else 0)
+
+    def emettre_facture(self, patient: Patient, brouillon: facturation.BrouillonFacture, start_date: datetime, end_date: datetime) -> tuple[int,str]:
+        """Enregistrer une facture calculée et générer son PDF. N'interagit pas avec la vue : peut être exécuté dans un thread de travail.
+
+        args:
+            patient (Patient): Le patient facturé.
+            brouillon (facturation.BrouillonFacture): La facture calculée, absences confirmées.
+            start_date (datetime): La date de début de la période de facturation.
+            end_date (datetime): La date de fin de la période de facturation.
+
+        returns:
+            tuple[int,str]: L'ID de la facture créée et le chemin du PDF généré. Si aucun rendez-vous n'est facturé, retourne -1 et une chaîne vide.
+        """
+        facture = brouillon.facture
+
+        # enregistrement de la facture, des lignes et des rendez-vous en une seule transaction
+        facturation.enregistrer_facture(brouillon)
 
         # créer la facture si on a des rendez-vous à facturer
-        if (len(rdvs_factures) > 0):
-            print("Création de la facture pour le patient :",patient.prenom,patient.nom)
-            print("\n\n\n-----------------------------FIN EMISSION FACTURE----------------------------\n\n\n")
-            Facture.addFacture(facture)
-            lfacs = LigneFacture.getAllLignesByFactureId(facture.id)
-            fp = fg.create_and_save(facture, patient, lfacs, annulation_factures,start_date,end_date)
+        if (len(brouillon.lignes) > 0):
+            fp = fg.create_and_save(facture, patient, brouillon.lignes, brouillon.annulation_factures,start_date,end_date)
             return facture.id,fp
         else :
-            print("Aucun rendez-vous à facturer pour le patient :",patient.prenom,patient.nom)
             return -1,""
-        
-
 
     def on_mass_facture_generer(self, start_date: datetime, end_date: datetime)-> None:
         """Générer des factures de masse pour tous les patients entre start_date et end_date.
+
+        Les factures sont calculées par un thread de travail (preparer_facturation_masse) ;
+        seuls les patients dont les absences demandent une confirmation du praticien
+        reviennent dans le thread de l'interface (on_facturation_preparee), puis les factures
+        sont enregistrées, rendues en PDF et envoyées en brouillon par un thread de travail.
+        L'avancement arrive par le signal self.signaux.progression, le bilan par self.taches.
+
         args:
             start_date (datetime): La date de début de la période de facturation.
             end_date (datetime): La date de fin de la période de facturation.
         """
+        # le bouton est désactivé pendant la facturation : un second lancement est ignoré
+        if self.facturation_en_cours is not None or self.preparation_en_cours:
+            return
+
+        self.preparation_en_cours = True
+        self.view.debut_preparation_facturation()
+        self.taches.soumettre(
+            self.preparer_facturation_masse, start_date, end_date,
+            on_resultat=lambda preparation: self.on_facturation_preparee(preparation, start_date, end_date),
+            on_erreur=self.on_erreur_facturation
+        )
+
+    def preparer_facturation_masse(self, start_date: datetime, end_date: datetime) -> tuple[list, list, list[Patient]]:
+        """Calculer les factures de tous les patients (exécuté dans un thread de travail).
+
+        args:
+            start_date (datetime): La date de début de la période de facturation.
+            end_date (datetime): La date de fin de la période de facturation.
 
-        print("Génération de factures de masse du", start_date, "au", end_date)
-        patients = self.patientModel.getAllPatients()
-        factures_creees = []
-        for patient in patients:
-            factures_creees.append((self.facturer_patient(patient, start_date, end_date)))
-            ms.save_draft(None, 'me', {
-                'to': patient.email,
-                'subject': f'Votre facture du {start_date.date()} au {end_date.date()}',
-                'body': f'Bonjour {patient.prenom},\n\nVeuillez trouver ci-joint votre facture pour la période du {start_date.date()} au {end_date.date()}.\n\nCordialement,\nVotre Cabinet Médical',
-                'attachments': [factures_creees[-1][1]] if factures_creees [-1][0]!=-1 else []
-            })
+        returns:
+            tuple[list, list, list[Patient]]: Les factures prêtes (patient, brouillon), celles dont les absences
+                sont à confirmer (patient, brouillon, historique des absences) et les patients avec des présences à renseigner.
+        """
+        brouillons = []
+        a_confirmer = []
+        a_renseigner = []
+        for patient in self.patientModel.getAllPatients():
+            brouillon, absence_precedentes = self.calculer_brouillon(patient, start_date, end_date)
+            # un patient avec des présences à renseigner n'est pas facturé, il est listé dans le bilan
+            if (len(brouillon.rdvs_a_renseigner) > 0):
+                a_renseigner.append(patient)
+            elif absence_precedentes is not None:
+                a_confirmer.append((patient, brouillon, absence_precedentes))
+            else:
+                brouillons.append((patient, brouillon))
+        return brouillons, a_confirmer, a_renseigner
 
-        self.view.confirmation_facture_generee([Facture(fac[0],patient.id) for fac,patient in zip(factures_creees,patients) if fac[0]!=-1])
+    def on_facturation_preparee(self, preparation: tuple[list, list, list[Patient]], start_date: datetime, end_date: datetime) -> None:
+        """Demander les confirmations d'absences puis lancer l'émission des factures.
+
+        args:
+            preparation (tuple[list, list, list[Patient]]): Résultat de preparer_facturation_masse.
+            start_date (datetime): La date de début de la période de facturation.
+            end_date (datetime): La date de fin de la période de facturation.
+        """
+        self.preparation_en_cours = False
+        brouillons, a_confirmer, a_renseigner = preparation
+        for patient, brouillon, absence_precedentes in a_confirmer:
+            self.confirmer_absences(patient, brouillon, absence_precedentes)
+            brouillons.append((patient, brouillon))
+
+        self.facturation_en_cours = FacturationMasse(brouillons, start_date, end_date, on_progression=self.signaux.progression.emit)
+        self.view.debut_facturation_masse(len(brouillons))
+        self.taches.soumettre(
+            self.facturation_en_cours.executer,
+            on_resultat=lambda bilan: self.on_facturation_terminee(bilan, a_renseigner),
+            on_erreur=self.on_erreur_facturation
+        )
+
+    def on_erreur_facturation(self, erreur: Exception) -> None:
+        """Signaler l'échec de la facturation de masse (calcul ou émission des factures).
+
+        args:
+            erreur (Exception): L'erreur levée dans le thread de travail.
+        """
+        print(f"[ERREUR] {erreur}")
+        self.preparation_en_cours = False
+        self.facturation_en_cours = None
+        bilan = BilanFacturation()
+        bilan.erreurs.append((None, str(erreur)))
+        self.view.afficher_bilan_facturation(bilan)
+
+    def on_annuler_facturation(self) -> None:
+        """Demander l'arrêt de la facturation de masse en cours."""
+        if self.facturation_en_cours is not None:
+            self.facturation_en_cours.annuler()
+
+    def on_facturation_terminee(self, bilan: BilanFacturation, a_renseigner: list[Patient]) -> None:
+        """Afficher le bilan de la facturation de masse.
+
+        args:
+            bilan (BilanFacturation): Le résumé de la facturation.
+            a_renseigner (list[Patient]): Les patients écartés faute de présence renseignée.
+        """
+        self.facturation_en_cours = None
+        bilan.a_renseigner = a_renseigner
+        self.view.afficher_bilan_facturation(bilan)
 
     def on_single_facture_generer(self, start_date: datetime, end_date: datetime, patient_id: int)-> None:
         """Générer une facture pour un patient spécifique entre start_date et end_date.
@@ -188,11 +243,66 @@ class CreerFactureController:
             end_date (datetime): La date de fin de la période de facturation.
             patient_id (int): L'ID du patient pour lequel la facture est générée.
         """
-        
-        print("Génération d'une facture pour le patient ID", patient_id, "du", start_date, "au", end_date)
+        # calcul hors du thread de l'interface ; seule la confirmation des absences y revient
+        self.taches.soumettre(
+            self.preparer_facture_patient, patient_id, start_date, end_date,
+            on_resultat=lambda preparation: self.on_facture_preparee(preparation, start_date, end_date),
+            on_erreur=self.on_erreur_emission
+        )
+
+    def preparer_facture_patient(self, patient_id: int, start_date: datetime, end_date: datetime) -> tuple[Patient, facturation.BrouillonFacture, list | None]:
+        """Lire un patient et calculer sa facture (exécuté dans un thread de travail).
+
+        args:
+            patient_id (int): L'ID du patient à facturer.
+            start_date (datetime): La date de début de la période de facturation.
+            end_date (datetime): La date de fin de la période de facturation.
+
+        returns:
+            tuple[Patient, facturation.BrouillonFacture, list | None]: Le patient, la facture calculée et
+                l'historique de ses absences si leur facturation doit être confirmée (None sinon).
+        """
         patient = self.patientModel.getPatientById(patient_id)
-        facture_id,fp = self.facturer_patient(patient, start_date, end_date)
+        brouillon, absence_precedentes = self.calculer_brouillon(patient, start_date, end_date)
+        return patient, brouillon, absence_precedentes
+
+    def on_facture_preparee(self, preparation: tuple[Patient, facturation.BrouillonFacture, list | None], start_date: datetime, end_date: datetime) -> None:
+        """Demander la confirmation des absences puis lancer l'émission de la facture.
+
+        args:
+            preparation (tuple[Patient, facturation.BrouillonFacture, list | None]): Résultat de preparer_facture_patient.
+            start_date (datetime): La date de début de la période de facturation.
+            end_date (datetime): La date de fin de la période de facturation.
+        """
+        patient, brouillon, absence_precedentes = preparation
+        # si un des rendez-vous n'a pas de statut de présence défini, on n'émet pas la facture
+        if (len(brouillon.rdvs_a_renseigner) > 0):
+            self.view.erreur_completion_rdv(patient, brouillon.rdvs_a_renseigner)
+            return
+        if absence_precedentes is not None:
+            self.confirmer_absences(patient, brouillon, absence_precedentes)
+
+        # enregistrement et rendu PDF hors du thread de l'interface
+        self.taches.soumettre(self.emettre_facture, patient, brouillon, start_date, end_date, on_resultat=lambda resultat: self.on_facture_emise(patient, resultat), on_erreur=self.on_erreur_emission)
+
+    def on_facture_emise(self, patient: Patient, resultat: tuple[int,str]) -> None:
+        """Confirmer la génération d'une facture individuelle.
+
+        args:
+            patient (Patient): Le patient facturé.
+            resultat (tuple[int,str]): L'ID de la facture et le chemin du PDF (-1 si aucune facture).
+        """
+        facture_id, fp = resultat
         if(facture_id!=-1) :
             self.view.confirmation_facture_generee([Facture(facture_id,patient.id)])
         else :
-            self.view.erreur_generation_facture()
\ No newline at end of file
+            self.view.erreur_generation_facture()
+
+    def on_erreur_emission(self, erreur: Exception) -> None:
+        """Signaler l'échec de la génération d'une facture individuelle.
+
+        args:
+            erreur (Exception): L'erreur levée pendant l'enregistrement ou le rendu.
+        """
+        print(f"[ERREUR] {erreur}")
+        self.view.erreur_generation_facture()
\ No newline at end of file
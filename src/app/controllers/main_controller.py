@@ -3,24 +3,14 @@ from app.controllers.patient_controller import PatientController
 from app.model.patient import Patient
 
 from app.model.rendezVous import RendezVous
-
-from app.views.creer_facture_view import creerFactureView
-from app.controllers.creer_facture_controller import CreerFactureController
 from app.model.facture import Facture
-
-from app.views.suivre_facture_view import SuivreFactureView
-from app.controllers.suivre_facture_controller import SuivreFactureController
-
-from app.views.planning_view import PlanningView
-from app.controllers.planning_controller import PlanningController
-
-from app.views.type_rdv_view import TypeRDVView
-from app.controllers.type_rdv_controller import TypeRDVController
 from app.model.typeRDV import TypeRDV
 
-from app.views.comptabilite_view import ComptabiliteView
-
 from app.views.main_window_view import MainWindow
+from app.services.trace_demarrage import trace
+
+# Les vues et contrôleurs des autres onglets sont importés à leur première ouverture
+# (load_tab) : la facturation (WeasyPrint) et l'agenda ne ralentissent pas le démarrage.
 
 
 
@@ -40,7 +30,9 @@ class MainController:
             pass
         
         # Charger le premier onglet
+        trace.marquer('load_tab("patients") : début')
         self.load_tab("patients")
+        trace.marquer('load_tab("patients") : fin')
     
     def load_tab(self, key: str):
         """Charger un onglet à la demande"""
@@ -74,6 +66,8 @@ class MainController:
             self.controllers["patients"] = self.current_controller
 
         elif key == "planning":
+            from app.views.planning_view import PlanningView
+            from app.controllers.planning_controller import PlanningController
             self.current_view = PlanningView()
             self.current_controller = PlanningController(RendezVous, self.current_view)
             self.main_window.replace_tab(1, self.current_view)
@@ -81,6 +75,8 @@ class MainController:
             self.controllers["planning"] = self.current_controller
 
         elif key == "suivi_factures":
+            from app.views.suivre_facture_view import SuivreFactureView
+            from app.controllers.suivre_facture_controller import SuivreFactureController
             self.current_view = SuivreFactureView()
             self.current_controller = SuivreFactureController(Facture, self.current_view)
             self.main_window.replace_tab(2, self.current_view)
@@ -88,6 +84,8 @@ class MainController:
             self.controllers["suivi_factures"] = self.current_controller
 
         elif key == "types_rdv":
+            from app.views.type_rdv_view import TypeRDVView
+            from app.controllers.type_rdv_controller import TypeRDVController
             self.current_view = TypeRDVView()
             self.current_controller = TypeRDVController(TypeRDV, self.current_view)
             self.main_window.replace_tab(3, self.current_view)
@@ -95,6 +93,7 @@ class MainController:
             self.controllers["types_rdv"] = self.current_controller
 
         elif key == "comptabilite":
+            from app.views.comptabilite_view import ComptabiliteView
             self.current_view = ComptabiliteView()
             self.current_controller = None
             self.main_window.replace_tab(4, self.current_view)
@@ -119,6 +118,8 @@ class MainController:
             self.load_tab("comptabilite")
             # Réutilise la vue/contrôleur si déjà créés
             if "facture" not in self.views:
+                from app.views.creer_facture_view import creerFactureView
+                from app.controllers.creer_facture_controller import CreerFactureController
                 view = creerFactureView()
                 controller = CreerFactureController(Facture, view)
                 self.views["facture"] = view
@@ -1,3 +1,7 @@
+from app.controllers.taches import ExecuteurTaches
+from app.services.trace_demarrage import trace
+
+
 class PatientController:
     """CONTROLLER - Gère la logique entre le Model et la View"""
     
@@ -9,6 +13,8 @@ class PatientController:
         """
         self.model = model
         self.view = view
+        # Les appels au modèle sont exécutés hors du thread de l'interface
+        self.taches = ExecuteurTaches()
         
         # Connecter les signaux de la vue aux méthodes du controller
         self.view.patient_selected.connect(self.on_patient_selected)
@@ -25,39 +31,71 @@ class PatientController:
         self
     
     def load_patients(self):
-        """Charger tous les patients depuis le modèle vers la vue"""
-        self.view.load_patients(self.model.getAllPatients())
+        """Charger la liste des patients (colonnes affichées seulement) depuis le modèle vers la vue"""
+        self.taches.soumettre(self.lire_patients, on_resultat=self.afficher_patients, on_erreur=lambda erreur: self.on_erreur("La liste des patients n'a pas pu être chargée.", erreur), cle="patients")
+
+    def lire_patients(self):
+        """Lire la liste des patients (exécuté dans un thread de travail)"""
+        patients = self.model.getListePatients()
+        trace.marquer("liste des patients lue en base")
+        return patients
+
+    def afficher_patients(self, patients):
+        """Afficher la liste des patients lue"""
+        self.view.load_patients(patients)
+        trace.marquer("liste des patients affichée")
 
     def on_patient_selected(self, row):
         """Gérer la sélection d'un patient dans la table"""
         # Récupérer les données de la ligne sélectionnée
-        patient_id = self.view.patient_table.item(row, 0).text()
-        patient = self.model.getPatientById(patient_id)
-
-        # Afficher dans le formulaire
-        self.view.display_patient_details(patient)
+        patient_id = self.view.patient_id_a(row)
+        # Le détail complet n'est chargé qu'à la sélection (seule la dernière sélection est affichée)
+        self.taches.soumettre(self.model.getPatientById, patient_id, on_resultat=self.view.display_patient_details, on_erreur=lambda erreur: self.on_erreur("Le patient n'a pas pu être chargé.", erreur), cle="patient_selectionne")
     
     def on_patient_updated(self, patient):
         """Gérer la mise à jour d'un patient"""
         row = self.view.get_selected_row()
         if row is not None:
-            # Mettre à jour la table
+            # Mettre à jour la table sans attendre l'enregistrement (remise en l'état en cas d'échec)
             self.view.update_table_row(row, patient)
             
-            self.model.updatePatient(patient.id, patient)
+            self.taches.soumettre(self.model.updatePatient, patient.id, patient, on_erreur=lambda erreur: self.on_erreur_modification(patient.id, erreur))
+
+    def on_erreur_modification(self, patient_id, erreur):
+        """Signaler l'échec de la mise à jour d'un patient et remettre sa ligne aux valeurs de la base"""
+        self.on_erreur("Les modifications du patient n'ont pas été enregistrées.", erreur)
+        self.taches.soumettre(self.model.getPatientById, patient_id, on_resultat=self.view.restaurer_patient, on_erreur=lambda erreur: self.on_erreur("La liste des patients n'a pas pu être remise à jour.", erreur))
     
     def on_search_changed(self, search_text):
         """Gérer le changement de texte dans la barre de recherche"""
-        self.view.filter_rows(search_text)
+        if not search_text.strip():
+            # une recherche encore en cours ne doit pas refiltrer la liste complète
+            self.taches.abandonner("recherche")
+            self.view.filtrer_patients(None)
+            return
+        # Recherche dans l'index plein texte ; seul le résultat de la dernière frappe est affiché
+        self.taches.soumettre(self.model.rechercherPatients, search_text, on_resultat=self.view.filtrer_patients, on_erreur=lambda erreur: self.on_erreur("La recherche n'a pas pu être effectuée.", erreur), cle="recherche")
 
     def on_patient_deleted(self, patient_id):
         """Gérer la suppression d'un patient"""
-        self.model.deletePatient(patient_id)
-        self.view.load_patients(self.model.getAllPatients())
+        self.taches.soumettre(self.model.deletePatient, patient_id, on_resultat=lambda _: self.view.retirer_patient(patient_id), on_erreur=lambda erreur: self.on_erreur("Le patient n'a pas pu être supprimé.", erreur))
 
     def on_patient_created(self, patient):
         """Gérer la création d'un nouveau patient"""
-        patient_id = self.model.addPatient(patient)
+        self.taches.soumettre(self.model.addPatient, patient, on_resultat=lambda patient_id: self.on_patient_ajoute(patient, patient_id), on_erreur=lambda erreur: self.on_erreur_creation(patient, erreur))
+
+    def on_erreur_creation(self, patient, erreur):
+        """Signaler l'échec de la création d'un patient et remettre sa saisie dans le formulaire"""
+        self.on_erreur("Le patient n'a pas pu être créé.", erreur)
+        self.view.display_patient_details(patient)
+
+    def on_patient_ajoute(self, patient, patient_id):
+        """Ajouter le patient créé à la liste"""
         if patient_id:
-            # Recharger la liste des patients
-            self.view.load_patients(self.model.getAllPatients())
+            patient.id = patient_id
+            self.view.ajouter_patient(patient)
+
+    def on_erreur(self, message, erreur):
+        """Signaler dans la vue l'échec d'une tâche"""
+        print(f"[ERREUR] {erreur}")
+        self.view.afficher_erreur(message, erreur)
@@ -1,13 +1,28 @@
-from PySide6.QtCore import QObject
-from datetime import timedelta
+from PySide6.QtCore import QObject, Signal
+from datetime import date, datetime, time, timedelta
 from app.model.patient import Patient
 from app.model.typeRDV import TypeRDV
 from app.model.rendezVous import RendezVous
 from app.views.planning_view import PlanningView
+from app.services.recurrence import RegleRecurrence, creer_serie
+from app.controllers.taches import ExecuteurTaches
+from app.services.cache_semaines import CacheSemaines, lundi
+from app.services.occupation import occupation_periode
+from app.services.synchro_calendrier import nombre_en_attente, operations_abandonnees, relancer_abandonnees, synchro
+
+MOIS = ["Janvier", "Février", "Mars", "Avril", "Mai", "Juin", "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre"]
+
+# Nombre de semaines affichées par les vues d'ensemble à durée fixe
+SEMAINES_PAR_MODE = {"4 semaines": 4, "Trimestre": 13}
 
 class PlanningController(QObject):
     """Contrôleur pour gérer le planning des rendez-vous"""
 
+    # Dates des rendez-vous modifiés depuis Google Agenda (émis par le thread de synchronisation)
+    agenda_modifie = Signal(list)
+    # L'état de la file de synchronisation a pu changer (émis par le thread de synchronisation)
+    etat_synchro_modifie = Signal()
+
     def __init__(self, model: RendezVous, view:PlanningView):
         super().__init__()  # Initialiser QObject
         self.rendez_vous_model = model  # RendezVous
@@ -15,41 +30,122 @@ class PlanningController(QObject):
         self.type_rendez_vous: TypeRDV = TypeRDV
         self.view = view
         self.current_week_start = self.view.get_current_week_start()
-        self.view.set_liste_patients(self.patient_model.getAllPatients())
-        self.view.set_liste_type_rdv(self.type_rendez_vous.getAllTypesRDV())
+        # Les appels au modèle sont exécutés hors du thread de l'interface
+        self.taches = ExecuteurTaches(parent=self)
+        # Semaines déjà chargées : la navigation vers une semaine en cache est immédiate
+        self.cache_semaines = CacheSemaines()
+        # Mode d'affichage ("Semaine" ou vue d'ensemble) et premier jour de la vue d'ensemble
+        self.mode = "Semaine"
+        self.debut_apercu: date = lundi(self.current_week_start)
+        self.load_listes()
         
         # Connecter les signaux
         self.view.creer_clicked.connect(self.on_creer_clicked)
+        self.view.creer_serie_clicked.connect(self.on_creer_serie_clicked)
         self.view.supprimer_clicked.connect(self.on_supprimer_clicked)
         self.view.previous_week_clicked.connect(self.on_previous_week)
         self.view.next_week_clicked.connect(self.on_next_week)
         self.view.cell_clicked.connect(self.on_cell_clicked)
         self.view.refresh.connect(self.on_refresh)
+        self.view.mode_changed.connect(self.on_mode_changed)
+        self.view.jour_apercu_clicked.connect(self.on_jour_apercu_clicked)
+        self.view.relancer_synchro_clicked.connect(self.on_relancer_synchro)
+        # le signal ramène les modifications de l'agenda dans le thread de l'interface
+        self.agenda_modifie.connect(self.on_agenda_modifie)
+        synchro.ajouter_ecouteur(self.agenda_modifie.emit)
+        self.etat_synchro_modifie.connect(self.load_etat_synchro)
+        synchro.ajouter_ecouteur_etat(self.etat_synchro_modifie.emit)
         # Charger les données initiales
         self.load_week_rdvs()
+        self.load_etat_synchro()
 
     def on_refresh(self):
         """Met à jour la liste des patients ainsi que les types de RDV et recharge les RDV de la semaine"""
-        self.load_week_rdvs()
-        self.view.set_liste_patients(self.patient_model.getAllPatients())
-        self.view.set_liste_type_rdv(self.type_rendez_vous.getAllTypesRDV())
+        # noms des patients et couleurs des types ont pu changer dans les autres onglets
+        self.cache_semaines.vider()
+        self.charger_affichage()
+        self.load_listes()
+        self.load_etat_synchro()
+
+    def load_listes(self) -> None:
+        """Charger les listes de patients et de types de RDV du formulaire"""
+        self.taches.soumettre(self.patient_model.getAllPatients, on_resultat=self.view.set_liste_patients, on_erreur=lambda erreur: self.on_erreur("La liste des patients n'a pas pu être chargée.", erreur), cle="patients")
+        self.taches.soumettre(self.type_rendez_vous.getAllTypesRDV, on_resultat=self.view.set_liste_type_rdv, on_erreur=lambda erreur: self.on_erreur("Les types de rendez-vous n'ont pas pu être chargés.", erreur), cle="types_rdv")
     
     def on_previous_week(self):
-        """Naviguer vers la semaine précédente"""
+        """Naviguer vers la semaine (ou la période de la vue d'ensemble) précédente"""
+        if self.mode != "Semaine":
+            self.deplacer_apercu(-1)
+            return
         self.current_week_start -= timedelta(days=7)
-        print(self.current_week_start)
         self.load_week_rdvs()
-        print("fin de on previous week")
     
     def on_next_week(self):
-        """Naviguer vers la semaine suivante"""
-        try :
-            self.current_week_start += timedelta(days=7)
-            self.load_week_rdvs()
-            print("fin de on next week")
-        except Exception as e:
-            print(f"Error in on_next_week: {e}")
+        """Naviguer vers la semaine (ou la période de la vue d'ensemble) suivante"""
+        if self.mode != "Semaine":
+            self.deplacer_apercu(1)
+            return
+        self.current_week_start += timedelta(days=7)
+        self.load_week_rdvs()
     
+    def on_mode_changed(self, mode: str) -> None:
+        """Passer de la grille de la semaine à une vue d'ensemble (ou inversement)
+        Args:
+            mode (str): "Semaine", "Mois", "4 semaines" ou "Trimestre".
+        """
+        self.mode = mode
+        self.view.set_mode(mode)
+        if mode == "Mois":
+            self.debut_apercu = self.current_week_start.date().replace(day=1)
+        elif mode != "Semaine":
+            self.debut_apercu = lundi(self.current_week_start)
+        self.charger_affichage()
+
+    def on_jour_apercu_clicked(self, jour: date) -> None:
+        """Ouvrir la semaine d'un jour cliqué dans la vue d'ensemble
+        Args:
+            jour (date): Jour cliqué.
+        """
+        self.current_week_start = datetime.combine(lundi(jour), time())
+        self.on_mode_changed("Semaine")
+
+    def charger_affichage(self) -> None:
+        """Recharger la semaine ou la vue d'ensemble selon le mode courant"""
+        if self.mode == "Semaine":
+            self.load_week_rdvs()
+        else:
+            self.load_apercu()
+
+    def deplacer_apercu(self, sens: int) -> None:
+        """Avancer ou reculer la vue d'ensemble d'une période
+        Args:
+            sens (int): 1 pour la période suivante, -1 pour la précédente.
+        """
+        if self.mode == "Mois":
+            mois = self.debut_apercu.month - 1 + sens
+            self.debut_apercu = date(self.debut_apercu.year + mois // 12, mois % 12 + 1, 1)
+        else:
+            self.debut_apercu += timedelta(weeks=sens * SEMAINES_PAR_MODE[self.mode])
+        self.load_apercu()
+
+    def load_apercu(self) -> None:
+        """Charger l'occupation de la période de la vue d'ensemble (une seule requête agrégée)"""
+        if self.mode == "Mois":
+            mois = self.debut_apercu.month
+            debut = lundi(self.debut_apercu)
+            fin_mois = (self.debut_apercu + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+            nb_semaines = (lundi(fin_mois) - debut).days // 7 + 1
+            self.view.set_periode_label(f"{MOIS[mois - 1]} {self.debut_apercu.year}")
+        else:
+            mois = None
+            debut = self.debut_apercu
+            nb_semaines = SEMAINES_PAR_MODE[self.mode]
+        fin = debut + timedelta(weeks=nb_semaines, days=-1)
+        if mois is None:
+            self.view.set_periode_label(f"Du {debut.strftime('%d/%m/%Y')} au {fin.strftime('%d/%m/%Y')}")
+
+        self.taches.soumettre(occupation_periode, debut, fin, on_resultat=lambda occupation: self.view.set_apercu(debut, nb_semaines, occupation, mois), on_erreur=lambda erreur: self.on_erreur("La vue d'ensemble n'a pas pu être chargée.", erreur), cle="apercu")
+
     def on_cell_clicked(self, day_index: int, time_slot: str) -> None:
         """Gérer le clic sur une cellule du planning
         Args:
@@ -64,7 +160,14 @@ class PlanningController(QObject):
         minutes = int(time_slot.split(":")[1])
         
         date = self.current_week_start + timedelta(days=days, hours=hours, minutes=minutes)
-        rendez_vous = self.rendez_vous_model.getRendezVousByDateTime(date)
+        self.taches.soumettre(self.rendez_vous_model.getRendezVousByDateTime, date, on_resultat=lambda rendez_vous: self.afficher_cellule(date, rendez_vous), on_erreur=lambda erreur: self.on_erreur("Les rendez-vous du créneau n'ont pas pu être chargés.", erreur), cle="cellule")
+
+    def afficher_cellule(self, date, rendez_vous: list[RendezVous]) -> None:
+        """Afficher les rendez-vous d'un créneau cliqué, ou un formulaire vide pour ce créneau
+        Args:
+            date (datetime): Date et heure du créneau.
+            rendez_vous (list[RendezVous]): Rendez-vous trouvés à cette date.
+        """
         if (rendez_vous is not None and rendez_vous!=[]):
             self.view.rdvs_selectionne = rendez_vous
             self.view.afficher_details_rdv()
@@ -85,22 +188,50 @@ class PlanningController(QObject):
 
         # Mettre à jour le label
         self.view.set_week_label(week_start, week_end)
-        # Effacer le planning
-        self.view.clear_planning()
-        # Récupérer les RDV de la semaine depuis la base de données
-        rdvs = self.rendez_vous_model.getRendezVousByPlage(week_start, week_end)
-        if (rdvs is not None and rdvs!=[]):
-            # Ajouter les RDV au planning
-            for rdv in rdvs:
-                if (rdv is None):
-                    continue
-                patient = self.patient_model.getPatientById(rdv.patient_id)
-                rdv_type = self.type_rendez_vous.getTypeRDVById(rdv.type_id)
-                if patient is None:
-                    continue
-                if rdv_type is None:
-                    continue
-                self.view.add_rdv_to_planning(rdv, patient, rdv_type)
+
+        lignes = self.cache_semaines.get(week_start)
+        if lignes is not None:
+            # semaine en cache : affichage immédiat, un chargement encore en cours est abandonné
+            self.taches.abandonner("semaine")
+            self.view.set_rdvs_semaine(week_start, lignes)
+        else:
+            # Effacer le planning
+            self.view.clear_planning()
+            # Récupérer les RDV de la semaine (patient et type inclus) en une seule requête.
+            # Si l'utilisateur change encore de semaine avant la fin, seul le dernier chargement est affiché
+            version = self.cache_semaines.version(week_start)
+            self.taches.soumettre(self.rendez_vous_model.getRendezVousSemaine, week_start, week_end, on_resultat=lambda lignes: self.afficher_semaine(week_start, lignes, version), on_erreur=lambda erreur: self.on_erreur("Les rendez-vous de la semaine n'ont pas pu être chargés.", erreur), cle="semaine")
+
+        # Précharger les semaines voisines pour une navigation immédiate
+        self.precharger_semaine(week_start - timedelta(days=7))
+        self.precharger_semaine(week_start + timedelta(days=7))
+
+    def precharger_semaine(self, week_start) -> None:
+        """Charger en arrière-plan une semaine absente du cache
+        Args:
+            week_start (datetime): Lundi de la semaine à précharger.
+        """
+        if week_start in self.cache_semaines:
+            return
+        version = self.cache_semaines.version(week_start)
+        self.taches.soumettre(
+            self.rendez_vous_model.getRendezVousSemaine, week_start, week_start + timedelta(days=6),
+            on_resultat=lambda lignes: self.cache_semaines.put(week_start, lignes, version),
+            # échec sans message : la semaine sera relue à son affichage, qui signalera l'erreur
+            on_erreur=lambda erreur: None,
+            cle=f"prechargement_{lundi(week_start)}"
+        )
+
+    def afficher_semaine(self, week_start, lignes, version: tuple[int, int] | None = None) -> None:
+        """Mettre en cache et afficher les rendez-vous de la semaine chargée
+        Args:
+            week_start (datetime): Lundi de la semaine chargée.
+            lignes (list[RendezVousSemaine]): Rendez-vous de la semaine avec patient et type.
+            version (tuple[int, int] | None, optionnel): Version du cache relevée au lancement du chargement.
+        """
+        self.cache_semaines.put(week_start, lignes, version)
+        # Remplacement des données du modèle du planning, sans reconstruire la grille
+        self.view.set_rdvs_semaine(week_start, lignes)
 
     def on_creer_clicked(self, rdv):
         """Gérer la création ou la modification d'un rendez-vous"""
@@ -110,24 +241,154 @@ class PlanningController(QObject):
         elif( rdv.patient_id is None or rdv.date is None or rdv.type_id is None or rdv.presence is None):
             self.view.afficher_champs_obligatoires()
             return
-        elif not self.rendez_vous_model.creneauLibre(rdv):
-            self.view.afficher_creneau_indisponible()
+        elif(rdv.id is None and not (rdv.date and rdv.patient_id and rdv.type_id)):
+            self.view.afficher_champs_obligatoires()
             return
-        
+
+        # vérification du créneau et enregistrement (base et Google Agenda) hors du thread de l'interface
+        self.taches.soumettre(self.enregistrer_rdv, rdv, on_resultat=self.on_rdv_enregistre, on_erreur=self.on_erreur_enregistrement)
+
+    def enregistrer_rdv(self, rdv: RendezVous) -> list | None:
+        """Créer ou modifier un rendez-vous si son créneau est libre (exécuté dans un thread de travail)
+        Args:
+            rdv (RendezVous): Rendez-vous à enregistrer.
+        Returns:
+            list | None: Dates touchées (ancienne et nouvelle date du rendez-vous), None si le créneau est déjà pris.
+        """
+        if not self.rendez_vous_model.creneauLibre(rdv):
+            return None
+        dates = [rdv.date]
         if(rdv.id is None):
-            if (rdv.date and rdv.patient_id and rdv.type_id):
-                self.rendez_vous_model.addRendezVous(rdv)
-            else :
-                self.view.afficher_champs_obligatoires()
-                return
+            self.rendez_vous_model.addRendezVous(rdv)
         else :
+            # un rendez-vous déplacé change aussi la semaine qu'il quitte
+            ancien = self.rendez_vous_model.getRendezVousById(rdv.id)
+            if ancien is not None:
+                dates.append(ancien.date)
             self.rendez_vous_model.updateRendezVous(rdv.id, rdv)
-        
+        return dates
+
+    def on_rdv_enregistre(self, dates: list | None) -> None:
+        """Recharger la semaine après l'enregistrement d'un rendez-vous
+        Args:
+            dates (list | None): Dates touchées par l'enregistrement, None si le créneau était déjà pris.
+        """
+        if dates is None:
+            self.view.afficher_creneau_indisponible()
+            return
+        self.cache_semaines.invalider(*dates)
         # Recharger la semaine actuelle
-        self.load_week_rdvs()
+        self.charger_affichage()
+
+    def on_erreur_enregistrement(self, erreur: Exception) -> None:
+        """Signaler l'échec de l'enregistrement d'un rendez-vous (la base n'a pas été modifiée)
+        Args:
+            erreur (Exception): Erreur levée par l'enregistrement.
+        """
+        self.on_erreur("Le rendez-vous n'a pas pu être enregistré.", erreur)
+
+    def on_erreur(self, message: str, erreur: Exception) -> None:
+        """Signaler dans la vue l'échec d'une tâche
+        Args:
+            message (str): Ce qui n'a pas pu être fait.
+            erreur (Exception): Erreur levée par la tâche.
+        """
+        print(f"[ERREUR] {erreur}")
+        self.view.afficher_erreur(message, erreur)
+
+    def load_etat_synchro(self) -> None:
+        """Charger l'état de la synchronisation avec Google Agenda (file d'attente et opérations en échec)"""
+        self.taches.soumettre(self.lire_etat_synchro, on_resultat=self.afficher_etat_synchro, on_erreur=lambda erreur: self.on_erreur("L'état de la synchronisation avec Google Agenda n'a pas pu être lu.", erreur), cle="etat_synchro")
+
+    def lire_etat_synchro(self) -> tuple[int, list[tuple]]:
+        """Lire l'état de la file de synchronisation (exécuté hors du thread de l'interface)
+        Returns:
+            tuple[int, list[tuple]]: Nombre d'opérations en attente et opérations abandonnées.
+        """
+        return nombre_en_attente(), operations_abandonnees()
+
+    def afficher_etat_synchro(self, etat: tuple[int, list[tuple]]) -> None:
+        """Afficher l'état de la synchronisation avec Google Agenda
+        Args:
+            etat (tuple[int, list[tuple]]): Nombre d'opérations en attente et opérations abandonnées.
+        """
+        en_attente, abandonnees = etat
+        self.view.set_etat_synchro(en_attente, abandonnees, synchro.erreur)
+
+    def on_relancer_synchro(self) -> None:
+        """Remettre en file les envois à Google Agenda abandonnés, à la demande du praticien"""
+        self.taches.soumettre(relancer_abandonnees, on_resultat=self.on_synchro_relancee, on_erreur=lambda erreur: self.on_erreur("Les envois à Google Agenda n'ont pas pu être relancés.", erreur))
+
+    def on_synchro_relancee(self, _nombre: int) -> None:
+        """Relancer la synchronisation (arrêtée ou en attente) après la remise en file des envois abandonnés
+        Args:
+            _nombre (int): Nombre d'opérations remises en file.
+        """
+        # sans effet si la boucle tourne ; la relance si elle s'était arrêtée sur une erreur
+        synchro.demarrer()
+        synchro.reveiller()
+        self.load_etat_synchro()
+
+    def on_agenda_modifie(self, dates: list) -> None:
+        """Recharger l'affichage après des rendez-vous déplacés ou supprimés dans Google Agenda
+        Args:
+            dates (list): Dates touchées (anciennes et nouvelles dates des rendez-vous).
+        """
+        self.cache_semaines.invalider(*dates)
+        self.charger_affichage()
+
+    def on_creer_serie_clicked(self, rdv: RendezVous, regle: RegleRecurrence) -> None:
+        """Gérer la création d'une série de rendez-vous récurrents
+        Args:
+            rdv (RendezVous): Premier rendez-vous de la série.
+            regle (RegleRecurrence): Règle de répétition.
+        """
+        if (rdv is None or rdv.patient_id is None or rdv.date is None or rdv.type_id is None or rdv.presence is None):
+            self.view.afficher_champs_obligatoires()
+            return
+
+        self.taches.soumettre(creer_serie, rdv, regle, on_resultat=self.on_serie_creee, on_erreur=self.on_erreur_serie)
+
+    def on_serie_creee(self, resultat: tuple[list[RendezVous], list[RendezVous]]) -> None:
+        """Afficher le bilan d'une série et recharger la semaine
+        Args:
+            resultat (tuple[list[RendezVous], list[RendezVous]]): Rendez-vous créés et rendez-vous en conflit.
+        """
+        crees, conflits = resultat
+        self.view.afficher_bilan_serie(crees, conflits)
+        self.cache_semaines.invalider(*(rdv.date for rdv in crees))
+
+        # Recharger la semaine actuelle
+        self.charger_affichage()
+
+    def on_erreur_serie(self, erreur: Exception) -> None:
+        """Signaler l'échec de l'enregistrement d'une série (aucun rendez-vous n'a été créé)
+        Args:
+            erreur (Exception): Erreur levée par l'enregistrement.
+        """
+        print(f"[ERREUR] {erreur}")
+        self.view.afficher_erreur_serie(erreur)
 
     def on_supprimer_clicked(self, rdv):
         """Gérer la suppression d'un rendez-vous"""
         if rdv.id is not None:
-            self.rendez_vous_model.deleteRendezVous(rdv.id)
-            self.load_week_rdvs()
\ No newline at end of file
+            # seul le créneau du rendez-vous supprimé est redessiné
+            self.taches.soumettre(self.rendez_vous_model.deleteRendezVous, rdv.id, on_resultat=lambda _: self.on_rdv_supprime(rdv), on_erreur=self.on_erreur_suppression)
+
+    def on_erreur_suppression(self, erreur: Exception) -> None:
+        """Signaler l'échec de la suppression d'un rendez-vous (il est conservé)
+        Args:
+            erreur (Exception): Erreur levée par la suppression.
+        """
+        self.on_erreur("Le rendez-vous n'a pas pu être supprimé.", erreur)
+
+    def on_rdv_supprime(self, rdv: RendezVous) -> None:
+        """Retirer un rendez-vous supprimé du planning et du cache
+        Args:
+            rdv (RendezVous): Rendez-vous supprimé.
+        """
+        self.cache_semaines.invalider(rdv.date)
+        if self.mode != "Semaine":
+            self.load_apercu()
+            return
+        self.view.retirer_rdv_du_planning(rdv.id)
\ No newline at end of file
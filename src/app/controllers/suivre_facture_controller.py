@@ -1,10 +1,13 @@
 from app.model.ligneFacture import LigneFacture
+from app.controllers.taches import ExecuteurTaches
 
 class SuivreFactureController:
     def __init__(self, model, view):
         self.facturemodel = model
         self.ligneFactureModel = LigneFacture
         self.view = view
+        # Les appels au modèle sont exécutés hors du thread de l'interface
+        self.taches = ExecuteurTaches()
 
         # Connecter les signaux de la vue aux méthodes du controller
         self.view.facture_selected.connect(self.on_facture_selected)
@@ -18,16 +21,23 @@ class SuivreFactureController:
         self.load_factures()
 
     def load_factures(self):
-        factures_objects = self.facturemodel.getAllFactures()
-        self.view.load_factures(factures_objects)
+        self.taches.soumettre(self.facturemodel.getAllFactures, on_resultat=self.view.load_factures, on_erreur=lambda erreur: self.on_erreur("Les factures n'ont pas pu être chargées.", erreur), cle="factures")
 
     def on_search_changed(self, search_text):
         self.view.filter_rows(search_text)
     
     def on_facture_selected(self, row):
         facture_id = self.view.facture_table.item(row, 0).text()
+        # seule la dernière sélection est affichée
+        self.taches.soumettre(self.charger_facture, facture_id, on_resultat=lambda resultat: self.view.display_facture_details(*resultat), on_erreur=lambda erreur: self.on_erreur("La facture n'a pas pu être chargée.", erreur), cle="facture_selectionnee")
+
+    def charger_facture(self, facture_id):
+        """Lire une facture et ses lignes (exécuté dans un thread de travail)"""
         facture = self.facturemodel.getFactureById(facture_id)
-    
         lignes_facture = self.ligneFactureModel.getAllLignesByFactureId(facture_id)
+        return facture, lignes_facture
 
-        self.view.display_facture_details(facture, lignes_facture)
\ No newline at end of file
+    def on_erreur(self, message, erreur):
+        """Signaler dans la vue l'échec d'un chargement"""
+        print(f"[ERREUR] {erreur}")
+        self.view.afficher_erreur(message, erreur)
\ No newline at end of file
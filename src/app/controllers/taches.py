@@ -0,0 +1,159 @@
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _Tache(QRunnable):
+    """Appel de fonction exécuté par un thread du QThreadPool."""
+
+    def __init__(self, executeur: "ExecuteurTaches", numero: int, fonction: Callable, args: tuple, kwargs: dict) -> None:
+        """
+        Initialise la tâche.
+
+        Args:
+            executeur (ExecuteurTaches): Exécuteur à prévenir à la fin de la tâche.
+            numero (int): Numéro de la tâche dans l'exécuteur.
+            fonction (Callable): Fonction à appeler.
+            args (tuple): Arguments positionnels de la fonction.
+            kwargs (dict): Arguments nommés de la fonction.
+        """
+        super().__init__()
+        # l'objet Python reste propriétaire de la tâche (elle peut être retirée de la file avec tryTake)
+        self.setAutoDelete(False)
+        self.executeur = executeur
+        self.numero = numero
+        self.fonction = fonction
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self) -> None:
+        """
+        Appelle la fonction et transmet le résultat, ou l'exception, au thread de l'interface.
+        """
+        try:
+            valeur = self.fonction(*self.args, **self.kwargs)
+        except Exception as e:
+            succes, valeur = False, e
+        else:
+            succes = True
+        try:
+            self.executeur._termine.emit(self.numero, succes, valeur)
+        except RuntimeError:
+            # l'exécuteur a été détruit (fermeture de l'application) : plus personne n'attend le résultat
+            pass
+
+
+class ExecuteurTaches(QObject):
+    """
+    Exécute les appels au modèle (base de données, Google, PDF) hors du thread de l'interface.
+
+    Les résultats sont remis dans le thread de l'interface par un signal : les
+    fonctions on_resultat / on_erreur peuvent donc manipuler la vue directement.
+
+    Les tâches soumises avec la même `cle` se remplacent : une tâche pas encore
+    démarrée est retirée de la file, et le résultat d'une tâche déjà lancée est
+    ignoré s'il en existe une plus récente (ex : clics répétés sur "Semaine suivante").
+
+    Chaque tâche a un rappel d'erreur : un échec est toujours signalé dans la vue.
+
+    Exemple:
+        self.taches = ExecuteurTaches()
+        self.taches.soumettre(Patient.getListePatients, on_resultat=self.view.load_patients, on_erreur=self.on_erreur_chargement, cle="patients")
+    """
+    _termine: Signal = Signal(int, bool, object)
+    """Fin d'une tâche (numéro, succès, résultat ou exception), émis depuis le thread de travail."""
+
+    def __init__(self, pool: QThreadPool | None = None, parent: QObject | None = None) -> None:
+        """
+        Initialise l'exécuteur. A créer dans le thread de l'interface.
+
+        Args:
+            pool (QThreadPool | None, optionnel): Pool de threads à utiliser. Défaut: le pool global de Qt.
+            parent (QObject | None, optionnel): Parent Qt de l'exécuteur.
+        """
+        super().__init__(parent)
+        self.pool = pool if pool is not None else QThreadPool.globalInstance()
+        self._numero = 0
+        self._taches: dict[int, _Tache] = {}
+        self._rappels: dict[int, tuple[Callable[[Any], None] | None, Callable[[Exception], None], str | None]] = {}
+        self._derniere_par_cle: dict[str, int] = {}
+        self._termine.connect(self._on_termine)
+
+    def soumettre(self, fonction: Callable, *args, on_resultat: Callable[[Any], None] | None = None, on_erreur: Callable[[Exception], None], cle: str | None = None, **kwargs) -> int:
+        """
+        Lance `fonction(*args, **kwargs)` dans un thread de travail.
+
+        Args:
+            fonction (Callable): Fonction à exécuter (typiquement une méthode du modèle).
+            *args: Arguments positionnels de la fonction.
+            on_resultat (Callable[[Any], None] | None, optionnel): Appelé dans le thread de l'interface avec la valeur retournée.
+            on_erreur (Callable[[Exception], None]): Appelé dans le thread de l'interface avec l'exception levée.
+            cle (str | None, optionnel): Clé de regroupement : seule la dernière tâche soumise avec cette clé est livrée.
+            **kwargs: Arguments nommés de la fonction.
+
+        Returns:
+            int: Numéro de la tâche.
+        """
+        self._numero += 1
+        numero = self._numero
+        if cle is not None:
+            precedent = self._derniere_par_cle.get(cle)
+            if precedent is not None and precedent in self._taches and self.pool.tryTake(self._taches[precedent]):
+                # la tâche remplacée n'avait pas démarré : elle ne sera jamais exécutée
+                del self._taches[precedent]
+                del self._rappels[precedent]
+            self._derniere_par_cle[cle] = numero
+
+        tache = _Tache(self, numero, fonction, args, kwargs)
+        self._taches[numero] = tache
+        self._rappels[numero] = (on_resultat, on_erreur, cle)
+        self.pool.start(tache)
+        return numero
+
+    def abandonner(self, cle: str) -> None:
+        """
+        Abandonne la dernière tâche soumise avec une clé : retirée de la file si elle
+        n'a pas démarré, résultat ignoré sinon.
+
+        Args:
+            cle (str): Clé de regroupement de la tâche.
+        """
+        numero = self._derniere_par_cle.pop(cle, None)
+        if numero is not None and numero in self._taches and self.pool.tryTake(self._taches[numero]):
+            del self._taches[numero]
+            del self._rappels[numero]
+
+    def en_cours(self) -> int:
+        """
+        Retourne le nombre de tâches soumises et pas encore livrées.
+
+        Returns:
+            int: Nombre de tâches en attente ou en cours.
+        """
+        return len(self._taches)
+
+    def _on_termine(self, numero: int, succes: bool, valeur: object) -> None:
+        """
+        Livre le résultat d'une tâche dans le thread de l'interface.
+
+        Args:
+            numero (int): Numéro de la tâche.
+            succes (bool): False si la fonction a levé une exception.
+            valeur (object): Valeur retournée ou exception levée.
+        """
+        self._taches.pop(numero, None)
+        rappels = self._rappels.pop(numero, None)
+        if rappels is None:
+            return
+        on_resultat, on_erreur, cle = rappels
+        if cle is not None:
+            if self._derniere_par_cle.get(cle) != numero:
+                # résultat périmé : une tâche plus récente a été soumise avec la même clé
+                return
+            del self._derniere_par_cle[cle]
+
+        if succes:
+            if on_resultat is not None:
+                on_resultat(valeur)
+        else:
+            on_erreur(valeur)
@@ -0,0 +1,117 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.database import conversions  # noqa: F401 (enregistre adaptateurs et convertisseurs sqlite3)
+from app.database.setup_db import DB_PATH
+
+# Pragmas appliqués une seule fois à l'ouverture de chaque connexion
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Une connexion longue durée par thread (les objets sqlite3 ne se partagent pas entre threads)
+_local = threading.local()
+
+
+def _ouvrir_connexion() -> sqlite3.Connection:
+    """
+    Ouvre une nouvelle connexion vers la base et applique les pragmas.
+
+    La connexion est en mode autocommit (isolation_level=None) : les transactions
+    sont gérées explicitement par session().
+
+    Returns:
+        sqlite3.Connection: Connexion prête à l'emploi.
+    """
+    connexion = sqlite3.connect(DB_PATH, isolation_level=None, detect_types=sqlite3.PARSE_COLNAMES)
+    for pragma in PRAGMAS:
+        connexion.execute(pragma)
+    return connexion
+
+
+def get_connexion() -> sqlite3.Connection:
+    """
+    Retourne la connexion du thread courant, en l'ouvrant au premier appel.
+
+    Returns:
+        sqlite3.Connection: Connexion associée au thread courant.
+    """
+    connexion = getattr(_local, "connexion", None)
+    if connexion is None:
+        connexion = _ouvrir_connexion()
+        _local.connexion = connexion
+        _local.profondeur = 0
+    return connexion
+
+
+def fermer_connexion() -> None:
+    """
+    Ferme la connexion du thread courant si elle existe.
+    A appeler à la fin d'un thread de travail ou à la fermeture de l'application.
+    """
+    connexion = getattr(_local, "connexion", None)
+    if connexion is not None:
+        connexion.close()
+        _local.connexion = None
+        _local.profondeur = 0
+
+
+@contextmanager
+def session(ecriture: bool = False) -> Iterator[sqlite3.Connection]:
+    """
+    Ouvre une portée transactionnelle sur la connexion du thread courant.
+
+    La session la plus externe ouvre une transaction validée à la sortie, ou annulée
+    si une exception est levée. Les sessions imbriquées utilisent des SAVEPOINT, ce
+    qui permet à une méthode du modèle d'être appelée seule ou à l'intérieur d'un
+    traitement plus large sans valider trop tôt.
+
+    Une session qui écrit doit être ouverte avec ecriture=True : la transaction
+    prend alors le verrou d'écriture dès son début (BEGIN IMMEDIATE) et attend
+    (busy_timeout) qu'un autre thread ait fini d'écrire. Avec un BEGIN différé,
+    une transaction qui lit puis écrit pendant qu'un autre thread écrit échoue
+    aussitôt avec "database is locked", sans attente possible. Le verrou est pris
+    par la session la plus externe : un traitement qui regroupe des écritures
+    doit lui-même ouvrir sa session avec ecriture=True.
+
+    Exemple:
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.execute("...")
+
+    Args:
+        ecriture (bool, optionnel): La session modifie la base. Défaut: False (lecture seule).
+
+    Yields:
+        sqlite3.Connection: Connexion du thread courant.
+    """
+    connexion = get_connexion()
+    profondeur = _local.profondeur
+    savepoint = f"session_{profondeur}"
+    if profondeur == 0:
+        connexion.execute("BEGIN IMMEDIATE" if ecriture else "BEGIN")
+    else:
+        connexion.execute(f"SAVEPOINT {savepoint}")
+    _local.profondeur = profondeur + 1
+    try:
+        yield connexion
+    except BaseException:
+        _local.profondeur = profondeur
+        if profondeur == 0:
+            connexion.rollback()
+        else:
+            connexion.execute(f"ROLLBACK TO {savepoint}")
+            connexion.execute(f"RELEASE {savepoint}")
+        raise
+    else:
+        _local.profondeur = profondeur
+        if profondeur == 0:
+            connexion.commit()
+        else:
+            connexion.execute(f"RELEASE {savepoint}")
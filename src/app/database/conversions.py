@@ -0,0 +1,106 @@
+import sqlite3
+from datetime import date, datetime, timedelta
+
+# Formats de stockage : texte ISO 8601 à largeur fixe, donc l'ordre alphabétique est
+# l'ordre chronologique (BETWEEN et les index sur les dates restent utilisables) et
+# les fonctions date()/strftime() de SQLite lisent les valeurs sans conversion.
+FORMAT_HORODATAGE = "%Y-%m-%d %H:%M:%S"
+FORMAT_JOUR = "%Y-%m-%d"
+
+# Formats anciens encore acceptés à la lecture (saisies manuelles, versions précédentes)
+FORMATS_ANCIENS = (
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+)
+
+
+def lire_horodatage(texte: str) -> datetime:
+    """
+    Convertit une date stockée en datetime.
+
+    Le format de stockage ("AAAA-MM-JJ HH:MM:SS") et ses variantes ISO (date seule,
+    séparateur "T", fractions de seconde) passent par datetime.fromisoformat, bien plus
+    rapide que strptime ; les formats anciens ne sont essayés qu'en dernier recours.
+
+    Args:
+        texte (str): Date lue dans la base.
+
+    Returns:
+        datetime: Date et heure correspondantes.
+
+    Raises:
+        ValueError: Si le texte ne correspond à aucun format connu.
+    """
+    try:
+        return datetime.fromisoformat(texte)
+    except ValueError:
+        pass
+    for format_ancien in FORMATS_ANCIENS:
+        try:
+            return datetime.strptime(texte, format_ancien)
+        except ValueError:
+            continue
+    raise ValueError(f"Date non reconnue : {texte!r}")
+
+
+def ecrire_horodatage(valeur: datetime) -> str:
+    """
+    Format de stockage d'une date et heure (à la seconde).
+
+    Args:
+        valeur (datetime): Date et heure.
+
+    Returns:
+        str: Texte "AAAA-MM-JJ HH:MM:SS".
+    """
+    return valeur.isoformat(" ", "seconds")
+
+
+def ecrire_jour(valeur: date) -> str:
+    """
+    Format de stockage d'une date sans heure (l'heure d'un datetime est ignorée).
+
+    Args:
+        valeur (date): Date.
+
+    Returns:
+        str: Texte "AAAA-MM-JJ".
+    """
+    return valeur.isoformat()[:10]
+
+
+def _convertir_horodatage(valeur: bytes) -> datetime | None:
+    """Convertisseur "horodatage" : chemin rapide pour le format de stockage."""
+    if not valeur:
+        return None
+    texte = valeur.decode()
+    if len(texte) == 19:
+        return datetime.fromisoformat(texte)
+    return lire_horodatage(texte)
+
+
+def _convertir_jour(valeur: bytes) -> date | None:
+    """Convertisseur "jour" : les dix premiers caractères suffisent au format de stockage."""
+    if not valeur:
+        return None
+    texte = valeur.decode()
+    if len(texte) >= 10 and texte[4] == "-":
+        return date.fromisoformat(texte[:10])
+    return lire_horodatage(texte).date()
+
+
+# Adaptateurs : les dates passées en paramètre d'une requête sont écrites au format de
+# stockage (ceux fournis par sqlite3 sont dépréciés depuis Python 3.12). datetime est
+# enregistré à part : sqlite3 cherche l'adaptateur du type exact.
+sqlite3.register_adapter(datetime, ecrire_horodatage)
+sqlite3.register_adapter(date, ecrire_jour)
+sqlite3.register_adapter(timedelta, lambda valeur: int(valeur.total_seconds() // 60))
+
+# Convertisseurs, appliqués aux colonnes dont l'alias porte le type entre crochets
+# (ex : date AS "date [horodatage]") grâce à detect_types=PARSE_COLNAMES sur la connexion.
+# Les valeurs NULL ne passent pas par le convertisseur.
+sqlite3.register_converter("horodatage", _convertir_horodatage)
+sqlite3.register_converter("jour", _convertir_jour)
+sqlite3.register_converter("minutes", lambda valeur: timedelta(minutes=int(valeur)))
+sqlite3.register_converter("booleen", lambda valeur: valeur not in (b"0", b"", b"False"))
@@ -0,0 +1,86 @@
+import inspect
+import sqlite3
+from operator import itemgetter
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+# Plan de construction par (classe, colonnes de la requête) : calculé une fois par forme de requête
+_PLANS: dict[tuple[type, tuple[str, ...]], Callable[[tuple], object]] = {}
+
+
+def _plan(classe: type[T], noms: tuple[str, ...]) -> Callable[[tuple], T]:
+    """
+    Construit la fonction qui transforme une ligne en objet pour une liste de colonnes.
+
+    Les colonnes sont associées aux paramètres du constructeur par leur nom (alias SQL) ;
+    les paramètres présents dès le début du constructeur sont passés par position.
+
+    Args:
+        classe (type[T]): Classe à instancier.
+        noms (tuple[str, ...]): Noms des colonnes de la requête.
+
+    Returns:
+        Callable[[tuple], T]: Fonction ligne -> objet.
+    """
+    parametres = list(inspect.signature(classe).parameters)
+    inconnues = set(noms) - set(parametres)
+    if inconnues:
+        raise ValueError(f"Colonnes sans paramètre correspondant dans {classe.__name__} : {sorted(inconnues)}")
+    positions = {nom: index for index, nom in enumerate(noms)}
+
+    positionnels = []
+    for parametre in parametres:
+        if parametre not in positions:
+            break
+        positionnels.append(positions[parametre])
+    nommes = [(parametre, positions[parametre]) for parametre in parametres[len(positionnels):] if parametre in positions]
+
+    if not nommes:
+        if positionnels == list(range(len(noms))):
+            return lambda ligne: classe(*ligne)
+        valeurs = itemgetter(*positionnels) if len(positionnels) > 1 else (lambda ligne: (ligne[positionnels[0]],))
+        return lambda ligne: classe(*valeurs(ligne))
+    return lambda ligne: classe(*[ligne[index] for index in positionnels], **{nom: ligne[index] for nom, index in nommes})
+
+
+def en_objets(cursor: sqlite3.Cursor, classe: type[T]) -> list[T]:
+    """
+    Lit toutes les lignes d'une requête exécutée et les transforme en objets.
+
+    Les colonnes doivent être nommées (ou aliasées) comme les paramètres du
+    constructeur ; les conversions de types se font par les alias "[type]".
+
+    Exemple:
+        cursor.execute(f"SELECT {RendezVous.COLONNES} FROM rendez_vous WHERE patient_id = ?", (patient_id,))
+        rdvs = en_objets(cursor, RendezVous)
+
+    Args:
+        cursor (sqlite3.Cursor): Curseur sur lequel la requête a été exécutée.
+        classe (type[T]): Classe à instancier.
+
+    Returns:
+        list[T]: Un objet par ligne.
+    """
+    if cursor.description is None:
+        return []
+    noms = tuple(colonne[0] for colonne in cursor.description)
+    plan = _PLANS.get((classe, noms))
+    if plan is None:
+        plan = _PLANS[(classe, noms)] = _plan(classe, noms)
+    return [plan(ligne) for ligne in cursor.fetchall()]
+
+
+def en_objet(cursor: sqlite3.Cursor, classe: type[T]) -> T | None:
+    """
+    Lit la première ligne d'une requête exécutée et la transforme en objet.
+
+    Args:
+        cursor (sqlite3.Cursor): Curseur sur lequel la requête a été exécutée.
+        classe (type[T]): Classe à instancier.
+
+    Returns:
+        T | None: L'objet, ou None si la requête ne retourne aucune ligne.
+    """
+    objets = en_objets(cursor, classe)
+    return objets[0] if objets else None
@@ -0,0 +1,119 @@
+import threading
+from typing import Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class CarteIdentites(Generic[T]):
+    """
+    Cache de lecture partagé par tout le processus (identity map) : un objet du
+    modèle par identifiant, renvoyé tel quel à chaque lecture.
+
+    Les méthodes du modèle qui modifient ou suppriment un enregistrement appellent
+    invalider ; un chargement lancé avant une invalidation (autre thread) ne remet
+    pas en cache la valeur qu'il a lue. Les objets partagés ne doivent pas être
+    modifiés par les appelants.
+    """
+    nom: str
+    hits: int
+    misses: int
+
+    def __init__(self, nom: str) -> None:
+        """
+        Initialise une carte vide.
+
+        Args:
+            nom (str): Nom de la classe mise en cache (affichage).
+        """
+        self.nom = nom
+        self.hits = 0
+        self.misses = 0
+        self._objets: dict[Hashable, T] = {}
+        # incrémenté à chaque invalidation
+        self._generation = 0
+        self._verrou = threading.Lock()
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle de la carte.
+
+        Returns:
+            str: Représentation lisible de la carte et de ses compteurs.
+        """
+        return f"CarteIdentites({self.nom}: {len(self._objets)} objet(s), {self.hits} hit(s), {self.misses} miss(es))"
+
+    def __len__(self) -> int:
+        """Nombre d'objets en cache."""
+        return len(self._objets)
+
+    def lire(self, identifiant: Hashable, chargeur: Callable[[Hashable], T | None]) -> T | None:
+        """
+        Retourne l'objet d'un identifiant, chargé par chargeur au premier accès.
+
+        Args:
+            identifiant (Hashable): Identifiant de l'objet.
+            chargeur (Callable[[Hashable], T | None]): Lecture en base, appelée en cas d'absence.
+
+        Returns:
+            T | None: L'objet, ou None s'il n'existe pas (une absence n'est pas mise en cache).
+        """
+        with self._verrou:
+            objet = self._objets.get(identifiant)
+            if objet is not None:
+                self.hits += 1
+                return objet
+            self.misses += 1
+            generation = self._generation
+
+        objet = chargeur(identifiant)
+        if objet is None:
+            return None
+        with self._verrou:
+            if generation != self._generation:
+                return objet
+            # un autre thread a pu charger le même objet entre-temps : c'est lui qui est partagé
+            return self._objets.setdefault(identifiant, objet)
+
+    def lire_tous(self, chargeur: Callable[[], list[T]], identifiant: Callable[[T], Hashable]) -> list[T]:
+        """
+        Exécute une lecture de plusieurs objets (ex : liste complète) et les met en cache.
+
+        Args:
+            chargeur (Callable[[], list[T]]): Lecture en base.
+            identifiant (Callable[[T], Hashable]): Identifiant d'un objet.
+
+        Returns:
+            list[T]: Objets lus.
+        """
+        with self._verrou:
+            generation = self._generation
+        objets = chargeur()
+        with self._verrou:
+            if generation == self._generation:
+                for objet in objets:
+                    self._objets[identifiant(objet)] = objet
+        return objets
+
+    def invalider(self, *identifiants: Hashable) -> None:
+        """
+        Retire des objets du cache après leur modification ou suppression.
+
+        Args:
+            *identifiants (Hashable): Identifiants touchés ; sans argument, tout le cache est vidé.
+        """
+        with self._verrou:
+            self._generation += 1
+            if not identifiants:
+                self._objets.clear()
+            for identifiant in identifiants:
+                self._objets.pop(identifiant, None)
+
+    def statistiques(self) -> dict[str, int]:
+        """
+        Compteurs de la carte.
+
+        Returns:
+            dict[str, int]: Nombre d'objets en cache, de hits et de misses.
+        """
+        with self._verrou:
+            return {"objets": len(self._objets), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,214 @@
+import sqlite3
+from typing import Callable
+
+from app.database.connexion import session
+from app.database.conversions import FORMAT_HORODATAGE, FORMAT_JOUR, lire_horodatage
+
+# Colonnes de dates et leur format de stockage (voir app.database.conversions)
+COLONNES_DATES = (
+    ("rendez_vous", "date", FORMAT_HORODATAGE),
+    ("patient", "date_naissance", FORMAT_JOUR),
+    ("facture", "date_emission", FORMAT_JOUR),
+    ("facture", "date_paiement", FORMAT_JOUR),
+)
+
+
+def _normaliser_dates(cursor: sqlite3.Cursor) -> None:
+    """
+    Réécrit au format de stockage les dates enregistrées dans un autre format.
+
+    Seules les valeurs différentes de leur forme normalisée sont relues et réécrites ;
+    une valeur illisible est laissée telle quelle et signalée.
+
+    Args:
+        cursor (sqlite3.Cursor): Curseur de la migration.
+    """
+    for table, colonne, format_stockage in COLONNES_DATES:
+        lignes = cursor.execute(
+            f"SELECT rowid, {colonne} FROM {table}"
+            f" WHERE {colonne} IS NOT NULL AND {colonne} IS NOT strftime(?, {colonne})",
+            (format_stockage,)
+        ).fetchall()
+        corrections = []
+        for rowid, valeur in lignes:
+            if valeur == "":
+                corrections.append((None, rowid))
+                continue
+            try:
+                corrections.append((lire_horodatage(str(valeur)).strftime(format_stockage), rowid))
+            except ValueError as e:
+                print(f"[ERREUR] {table}.{colonne} (ligne {rowid}) : {e}")
+        cursor.executemany(f"UPDATE {table} SET {colonne} = ? WHERE rowid = ?", corrections)
+
+
+# Chaque migration est un tuple (version, description, étapes).
+# Une étape est soit une requête SQL, soit une fonction recevant le curseur.
+# Les versions doivent être croissantes : la version courante de la base est
+# stockée dans PRAGMA user_version et seules les migrations suivantes sont jouées.
+MIGRATIONS: list[tuple[int, str, list[str | Callable[[sqlite3.Cursor], None]]]] = [
+    (1, "Schéma initial", [
+        "CREATE TABLE IF NOT EXISTS patient"
+        "(id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " nom TEXT,"
+        " prenom TEXT,"
+        " sexe TEXT,"
+        "date_naissance DATE,"
+        " adresse TEXT,"
+        "Amenagement TEXT,"
+        "niveau TEXT,"
+        "ecole TEXT,"
+        "ville TEXT,"
+        "telephone1 TEXT,"
+        "typeTelephone1 TEXT,"
+        "telephone2 TEXT,"
+        "typeTelephone2 TEXT,"
+        "email TEXT,"
+        "etat_suivi TEXT,"
+        "description TEXT)",
+        "CREATE TABLE IF NOT EXISTS rendez_vous"
+        "(id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " patient_id INTEGER,"
+        " date DATETIME,"
+        "motif TEXT,"
+        "type_id INTEGER,"
+        "presence TEXT,"
+        "facture_id TEXT,"
+        "FOREIGN KEY(type_id) REFERENCES type_rdv(id),"
+        " FOREIGN KEY(patient_id) REFERENCES patient(id),"
+        " FOREIGN KEY(facture_id) REFERENCES facture(id))",
+        "CREATE TABLE IF NOT EXISTS type_rdv"
+        "(id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " nom TEXT,"
+        " description TEXT,"
+        "prix REAL,"
+        "duree INTEGER,"
+        "localisation TEXT,"
+        "couleur TEXT,"
+        "estgroupe BOOL)",
+        "CREATE TABLE IF NOT EXISTS facture"
+        "(id TEXT PRIMARY KEY,"
+        " patient_id INTEGER,"
+        " date_emission DATE,"
+        " description TEXT,"
+        " statut TEXT,"
+        " date_paiement DATE,"
+        " FOREIGN KEY(patient_id) REFERENCES patient(id))",
+        "CREATE TABLE IF NOT EXISTS ligne_facture"
+        "(idRendezVous INTEGER ,"
+        "idFacture TEXT ,"
+        "montant_facture REAL,"
+        "PRIMARY KEY (idRendezVous, idFacture),"
+        " FOREIGN KEY(idFacture) REFERENCES facture(id),"
+        " FOREIGN KEY(idRendezVous) REFERENCES rendez_vous(id))",
+    ]),
+    (2, "Index des chemins d'accès du planning et de la facturation", [
+        # Planning (BETWEEN sur la date) et recherche par date/heure exacte
+        "CREATE INDEX IF NOT EXISTS idx_rendez_vous_date ON rendez_vous(date, type_id)",
+        # Rendez-vous d'un patient, éventuellement sur une période (facturation)
+        "CREATE INDEX IF NOT EXISTS idx_rendez_vous_patient_date ON rendez_vous(patient_id, date)",
+        "CREATE INDEX IF NOT EXISTS idx_rendez_vous_facture ON rendez_vous(facture_id)",
+        # Factures impayées d'un patient
+        "CREATE INDEX IF NOT EXISTS idx_facture_patient_statut ON facture(patient_id, statut)",
+        # Lignes d'une facture (la clé primaire commence par idRendezVous)
+        "CREATE INDEX IF NOT EXISTS idx_ligne_facture_facture ON ligne_facture(idFacture, idRendezVous, montant_facture)",
+        "ANALYZE",
+    ]),
+    (3, "Recherche plein texte des patients (FTS5)", [
+        # Index externe : le texte reste dans patient, patient_fts ne stocke que l'index.
+        # remove_diacritics 2 : "lea" trouve "Léa", "andre" trouve "André".
+        "CREATE VIRTUAL TABLE IF NOT EXISTS patient_fts USING fts5("
+        " nom, prenom, ville, ecole, niveau, email, telephone1, telephone2, etat_suivi, date_naissance,"
+        " content='patient', content_rowid='id',"
+        " tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER IF NOT EXISTS patient_fts_insert AFTER INSERT ON patient BEGIN"
+        " INSERT INTO patient_fts(rowid, nom, prenom, ville, ecole, niveau, email, telephone1, telephone2, etat_suivi, date_naissance)"
+        " VALUES (new.id, new.nom, new.prenom, new.ville, new.ecole, new.niveau, new.email, new.telephone1, new.telephone2, new.etat_suivi, new.date_naissance);"
+        " END",
+        "CREATE TRIGGER IF NOT EXISTS patient_fts_delete AFTER DELETE ON patient BEGIN"
+        " INSERT INTO patient_fts(patient_fts, rowid, nom, prenom, ville, ecole, niveau, email, telephone1, telephone2, etat_suivi, date_naissance)"
+        " VALUES ('delete', old.id, old.nom, old.prenom, old.ville, old.ecole, old.niveau, old.email, old.telephone1, old.telephone2, old.etat_suivi, old.date_naissance);"
+        " END",
+        "CREATE TRIGGER IF NOT EXISTS patient_fts_update AFTER UPDATE ON patient BEGIN"
+        " INSERT INTO patient_fts(patient_fts, rowid, nom, prenom, ville, ecole, niveau, email, telephone1, telephone2, etat_suivi, date_naissance)"
+        " VALUES ('delete', old.id, old.nom, old.prenom, old.ville, old.ecole, old.niveau, old.email, old.telephone1, old.telephone2, old.etat_suivi, old.date_naissance);"
+        " INSERT INTO patient_fts(rowid, nom, prenom, ville, ecole, niveau, email, telephone1, telephone2, etat_suivi, date_naissance)"
+        " VALUES (new.id, new.nom, new.prenom, new.ville, new.ecole, new.niveau, new.email, new.telephone1, new.telephone2, new.etat_suivi, new.date_naissance);"
+        " END",
+        # Indexation des patients déjà présents
+        "INSERT INTO patient_fts(patient_fts) VALUES ('rebuild')",
+    ]),
+    (4, "Dates enregistrées au format ISO 8601", [
+        _normaliser_dates,
+    ]),
+    (5, "File d'attente de synchronisation Google Agenda", [
+        # Une ligne par rendez-vous à synchroniser : les modifications successives d'un même
+        # rendez-vous sont regroupées (version incrémentée) en attendant leur envoi.
+        "CREATE TABLE IF NOT EXISTS outbox_calendrier"
+        "(id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " rdv_id INTEGER NOT NULL UNIQUE,"
+        " operation TEXT NOT NULL,"
+        " ancienne_date DATETIME,"
+        " ancien_type_id INTEGER,"
+        " version INTEGER NOT NULL DEFAULT 1,"
+        " tentatives INTEGER NOT NULL DEFAULT 0,"
+        " prochain_essai DATETIME NOT NULL,"
+        " derniere_erreur TEXT)",
+        "CREATE INDEX IF NOT EXISTS idx_outbox_calendrier_essai ON outbox_calendrier(prochain_essai)",
+    ]),
+    (6, "Identifiant de l'événement Google Agenda de chaque rendez-vous", [
+        "ALTER TABLE rendez_vous ADD COLUMN google_event_id TEXT",
+        # une suppression doit encore connaître l'événement quand le rendez-vous n'existe plus
+        "ALTER TABLE outbox_calendrier ADD COLUMN google_event_id TEXT",
+        # état des synchronisations (rattachement des événements existants, jetons...)
+        "CREATE TABLE IF NOT EXISTS synchro_etat"
+        "(cle TEXT PRIMARY KEY,"
+        " valeur TEXT)",
+    ]),
+    (7, "Abandon des opérations de synchronisation en échec", [
+        # une opération abandonnée reste dans la file avec sa dernière erreur, sans être réessayée
+        "ALTER TABLE outbox_calendrier ADD COLUMN abandonnee INTEGER NOT NULL DEFAULT 0",
+    ]),
+]
+
+
+def get_version(connexion: sqlite3.Connection) -> int:
+    """
+    Retourne la version du schéma enregistrée dans la base.
+
+    Args:
+        connexion (sqlite3.Connection): Connexion à la base.
+
+    Returns:
+        int: Valeur de PRAGMA user_version (0 pour une base jamais migrée).
+    """
+    return connexion.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrer() -> int:
+    """
+    Applique, dans l'ordre, les migrations dont la version est supérieure à celle de la base.
+
+    Chaque migration est jouée dans sa propre transaction avec la mise à jour de
+    PRAGMA user_version : une migration qui échoue laisse la base dans la version
+    précédente. Les données existantes sont conservées.
+
+    Returns:
+        int: Version du schéma après migration.
+    """
+    with session() as connexion:
+        version = get_version(connexion)
+
+    for numero, description, etapes in MIGRATIONS:
+        if numero <= version:
+            continue
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            for etape in etapes:
+                if callable(etape):
+                    etape(cursor)
+                else:
+                    cursor.execute(etape)
+            cursor.execute(f"PRAGMA user_version = {int(numero)}")
+        version = numero
+
+    return version
@@ -1,8 +1,21 @@
-from app.database.setup_db import DB_PATH
-import sqlite3
-from datetime import datetime
-
+from app.database.connexion import session
+from app.database.conversions import ecrire_jour
+from app.database.fabrique import en_objet, en_objets
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import ClassVar
+
+@dataclass(slots=True, eq=False)
 class Facture:
+    id: str
+    patient_id: int
+    date_emission: date | None
+    description: str
+    statut: str
+    date_paiement: date | None
+
+    COLONNES: ClassVar[str] = 'id, patient_id, date_emission AS "date_emission [jour]", description, statut, date_paiement AS "date_paiement [jour]"'
+    """Colonnes de facture dans l'ordre du constructeur, avec leurs conversions."""
 
     def __init__(self, id: int, patient_id: int, date_emission: 'datetime.date' = datetime.today().date(), description: str = "", statut: str = "IMPAYE", date_paiement: 'datetime.date' = None) -> None:
         """
@@ -43,15 +56,13 @@ class Facture:
         Returns:
             str: L'identifiant de la facture ajoutée.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        id_fac = Facture.generate_numero_facture(facture.date_emission)
-        cursor.execute(
-            "INSERT INTO facture (id,patient_id, date_emission, description, statut, date_paiement) VALUES (?, ?, ?, ?, ?, ?)",
-            (id_fac, facture.patient_id, facture.date_emission, facture.description, facture.statut, facture.date_paiement)
-        )
-        connexion.commit()
-        connexion.close()
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            id_fac = Facture.generate_numero_facture(facture.date_emission)
+            cursor.execute(
+                "INSERT INTO facture (id,patient_id, date_emission, description, statut, date_paiement) VALUES (?, ?, ?, ?, ?, ?)",
+                (id_fac, facture.patient_id, ecrire_jour(facture.date_emission), facture.description, facture.statut, facture.date_paiement and ecrire_jour(facture.date_paiement))
+            )
         return id_fac
 
     @staticmethod
@@ -65,21 +76,10 @@ class Facture:
         Returns:
             Facture | None: Instance de Facture si trouvée, sinon None.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM facture WHERE id = ?", (facture_id,))
-        data = cursor.fetchone()
-        connexion.close()
-        if data:
-            return Facture(
-                id=data[0],
-                patient_id=data[1],
-                date_emission=datetime.strptime(data[2], "%Y-%m-%d").date() if data[2] else None,
-                description=data[3],
-                statut=data[4],
-                date_paiement=datetime.strptime(data[5], "%Y-%m-%d").date() if data[5] else None
-            )
-        return None
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {Facture.COLONNES} FROM facture WHERE id = ?", (facture_id,))
+            return en_objet(cursor, Facture)
     
     @staticmethod
     def getAllFactures() -> list['Facture']:
@@ -89,23 +89,10 @@ class Facture:
         Returns:
             list[Facture]: Liste de toutes les factures.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM facture")
-        factures_data = cursor.fetchall()
-        connexion.close()
-        factures = []
-        for data in factures_data:
-            facture = Facture(
-                id=data[0],
-                patient_id=data[1],
-                date_emission=datetime.strptime(data[2], "%Y-%m-%d").date() if data[2] else None,
-                description=data[3],
-                statut=data[4],
-                date_paiement=datetime.strptime(data[5], "%Y-%m-%d").date() if data[5] else None
-            )
-            factures.append(facture)
-        return factures
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {Facture.COLONNES} FROM facture")
+            return en_objets(cursor, Facture)
     
     @staticmethod
     def updateFactureStatus(facture_id: str, new_statut: str = "IMPAYE", date_paiement: 'datetime.date' = None) -> None:
@@ -117,14 +104,12 @@ class Facture:
             new_statut (str, optionnel): Nouveau statut ('IMPAYE', 'PAYE', etc.).
             date_paiement (datetime.date, optionnel): Nouvelle date de paiement.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute(
-            "UPDATE facture SET statut = ?, date_paiement = ? WHERE id = ?",
-            (new_statut, date_paiement, facture_id)
-        )
-        connexion.commit()
-        connexion.close()
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(
+                "UPDATE facture SET statut = ?, date_paiement = ? WHERE id = ?",
+                (new_statut, date_paiement and ecrire_jour(date_paiement), facture_id)
+            )
 
     @staticmethod
     def deleteFacture(facture_id: str) -> None:
@@ -134,11 +119,9 @@ class Facture:
         Args:
             facture_id (str): Identifiant de la facture à supprimer.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("DELETE FROM facture WHERE id = ?", (facture_id,))
-        connexion.commit()
-        connexion.close()
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.execute("DELETE FROM facture WHERE id = ?", (facture_id,))
         
     @staticmethod
     def getFacturesImpayeByPatientId(patient_id: int) -> list['Facture']:
@@ -151,23 +134,10 @@ class Facture:
         Returns:
             list[Facture]: Liste des factures impayées du patient.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM facture WHERE statut = 'IMPAYE' AND patient_id = ?", (patient_id,))
-        factures_data = cursor.fetchall()
-        connexion.close()
-        factures = []
-        for data in factures_data:
-            facture = Facture(
-                id=data[0],
-                patient_id=data[1],
-                date_emission=datetime.strptime(data[2], "%Y-%m-%d").date() if data[2] else None,
-                description=data[3],
-                statut=data[4],
-                date_paiement=datetime.strptime(data[5], "%Y-%m-%d").date() if data[5] else None
-            )
-            factures.append(facture)
-        return factures
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {Facture.COLONNES} FROM facture WHERE statut = 'IMPAYE' AND patient_id = ?", (patient_id,))
+            return en_objets(cursor, Facture)
     
     @staticmethod
     def generate_numero_facture(date_emission: 'datetime.date' = None) -> str:
@@ -181,14 +151,13 @@ class Facture:
             str: Numéro de facture généré.
         """
         if date_emission is None:
-            date_emission = datetime.date.today()
+            date_emission = date.today()
         annee_mois = date_emission.strftime('%Y-%m')
         prefix = f"FAC-{annee_mois}-"
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT id FROM facture WHERE id LIKE ? ORDER BY id DESC", (prefix + '%',))
-        facture = cursor.fetchone()
-        connexion.close()
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute("SELECT id FROM facture WHERE id LIKE ? ORDER BY id DESC", (prefix + '%',))
+            facture = cursor.fetchone()
         num = int(facture[0].split('-')[-1]) if facture else 0
         next_num = num + 1
         return f"{prefix}{str(next_num).zfill(3)}"
\ No newline at end of file
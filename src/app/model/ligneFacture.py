@@ -1,12 +1,19 @@
-from app.database.setup_db import DB_PATH
-import sqlite3
+from dataclasses import dataclass
+from typing import ClassVar
 
+from app.database.connexion import session
+from app.database.fabrique import en_objet, en_objets
 
+
+@dataclass(slots=True, eq=False)
 class LigneFacture:
     facture_id: str
     rdv_id: int
     montant_facture: float
 
+    COLONNES: ClassVar[str] = "idFacture AS facture_id, idRendezVous AS rdv_id, montant_facture"
+    """Colonnes de ligne_facture dans l'ordre du constructeur."""
+
     def __init__(self, facture_id: str, rdv_id: int, montant_facture: float) -> None:
         """
         Initialise une instance de LigneFacture.
@@ -20,14 +27,14 @@ class LigneFacture:
         self.rdv_id = rdv_id
         self.montant_facture = montant_facture
 
-        def __repr__(self) -> str:
-            """
-            Retourne une représentation textuelle de la ligne de facture.
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle de la ligne de facture.
 
-            Returns:
-                str: Représentation lisible de la ligne de facture.
-            """
-            return f"LigneFacture(Facture ID: {self.facture_id}, Rendez-vous ID: {self.rdv_id})"
+        Returns:
+            str: Représentation lisible de la ligne de facture.
+        """
+        return f"LigneFacture(Facture ID: {self.facture_id}, Rendez-vous ID: {self.rdv_id})"
     
     @staticmethod
     def getAllLignesFacture() -> list['LigneFacture']:
@@ -37,20 +44,10 @@ class LigneFacture:
         Returns:
             list[LigneFacture]: Liste de toutes les lignes de facture.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM ligne_facture")
-        lignes_data = cursor.fetchall()
-        connexion.close()
-        lignes = []
-        for data in lignes_data:
-            ligne = LigneFacture(
-                facture_id=data[1],
-                rdv_id=data[0],
-                montant_facture=data[2]
-            )
-            lignes.append(ligne)
-        return lignes
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {LigneFacture.COLONNES} FROM ligne_facture")
+            return en_objets(cursor, LigneFacture)
     
     @staticmethod
     def getLigneFacture(idFacture: str, idRendezVous: int) -> 'LigneFacture | None':
@@ -64,18 +61,10 @@ class LigneFacture:
         Returns:
             LigneFacture | None: Instance de LigneFacture si trouvée, sinon None.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM ligne_facture WHERE idFacture = ? AND idRendezVous = ?", (idFacture, idRendezVous))
-        data = cursor.fetchone()
-        connexion.close()
-        if data:
-            return LigneFacture(
-                facture_id=data[1],
-                rdv_id=data[0],
-                montant_facture=data[2]
-            )
-        return None
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {LigneFacture.COLONNES} FROM ligne_facture WHERE idFacture = ? AND idRendezVous = ?", (idFacture, idRendezVous))
+            return en_objet(cursor, LigneFacture)
     
     @staticmethod
     def addLigneFacture(ligne_facture: 'LigneFacture') -> None:
@@ -85,15 +74,28 @@ class LigneFacture:
         Args:
             ligne_facture (LigneFacture): Instance de la ligne de facture à ajouter.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute(
-            "INSERT INTO ligne_facture (idRendezVous, idFacture, montant_facture) VALUES (?, ?, ?)",
-            (ligne_facture.rdv_id, ligne_facture.facture_id, ligne_facture.montant_facture)
-        )
-        connexion.commit()
-        connexion.close()
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(
+                "INSERT INTO ligne_facture (idRendezVous, idFacture, montant_facture) VALUES (?, ?, ?)",
+                (ligne_facture.rdv_id, ligne_facture.facture_id, ligne_facture.montant_facture)
+            )
     
+    @staticmethod
+    def addLignesFacture(lignes: list['LigneFacture']) -> None:
+        """
+        Ajoute plusieurs lignes de facture en une seule instruction.
+
+        Args:
+            lignes (list[LigneFacture]): Lignes de facture à ajouter.
+        """
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.executemany(
+                "INSERT INTO ligne_facture (idRendezVous, idFacture, montant_facture) VALUES (?, ?, ?)",
+                [(ligne.rdv_id, ligne.facture_id, ligne.montant_facture) for ligne in lignes]
+            )
+
     @staticmethod
     def deleteLigneFacture(idFacture: str, idRendezVous: int) -> None:
         """
@@ -103,14 +105,12 @@ class LigneFacture:
             idFacture (str): Identifiant de la facture.
             idRendezVous (int): Identifiant du rendez-vous.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute(
-            "DELETE FROM ligne_facture WHERE idFacture = ? AND idRendezVous = ?",
-            (idFacture, idRendezVous)
-        )
-        connexion.commit()
-        connexion.close()
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(
+                "DELETE FROM ligne_facture WHERE idFacture = ? AND idRendezVous = ?",
+                (idFacture, idRendezVous)
+            )
 
     @staticmethod
     def getAllLignesByFactureId(facture_id: str) -> list['LigneFacture']:
@@ -123,38 +123,40 @@ class LigneFacture:
         Returns:
             list[LigneFacture]: Liste des lignes de facture associées.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM ligne_facture WHERE idFacture = ?", (facture_id,))
-        lignes_data = cursor.fetchall()
-        connexion.close()
-        lignes = []
-        for data in lignes_data:
-            ligne = LigneFacture(
-                facture_id=data[1],
-                rdv_id=data[0],
-                montant_facture=data[2]
-            )
-            lignes.append(ligne)
-        return lignes
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {LigneFacture.COLONNES} FROM ligne_facture WHERE idFacture = ?", (facture_id,))
+            return en_objets(cursor, LigneFacture)
     
     @staticmethod
-    def getAllLignesByPatientId(patient_id):
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
+    def getAllLignesByFactureIds(facture_ids: list[str]) -> list['LigneFacture']:
+        """
+        Récupère en une requête les lignes de plusieurs factures.
 
+        Args:
+            facture_ids (list[str]): Identifiants des factures.
 
-        cursor.execute("SELECT lf FROM lignes_facture lf, rendez_vous rv WHERE lf.idRendezVous = rv.id AND rv.patient_id = ?", (patient_id,))
-        lignes_data = cursor.fetchall()
-        connexion.close()
+        Returns:
+            list[LigneFacture]: Lignes des factures, dans l'ordre des identifiants fournis.
+        """
+        if not facture_ids:
+            return []
+        with session() as connexion:
+            cursor = connexion.cursor()
+            marqueurs = ", ".join("?" for _ in facture_ids)
+            cursor.execute(f"SELECT {LigneFacture.COLONNES} FROM ligne_facture WHERE idFacture IN ({marqueurs})", list(facture_ids))
+            lignes = en_objets(cursor, LigneFacture)
+        ordre = {facture_id: position for position, facture_id in enumerate(facture_ids)}
+        lignes.sort(key=lambda ligne: ordre[ligne.facture_id])
+        return lignes
 
-        lignes = []
-        for data in lignes_data:
-            ligne = LigneFacture(
-                rdv_id=data[0],
-                facture_id=data[1],
-                montant_facture=data[2]
+    @staticmethod
+    def getAllLignesByPatientId(patient_id):
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(
+                "SELECT lf.idFacture AS facture_id, lf.idRendezVous AS rdv_id, lf.montant_facture"
+                " FROM ligne_facture lf JOIN rendez_vous rv ON lf.idRendezVous = rv.id WHERE rv.patient_id = ?",
+                (patient_id,)
             )
-            lignes.append(ligne)
-        
-        return lignes
\ No newline at end of file
+            return en_objets(cursor, LigneFacture)
\ No newline at end of file
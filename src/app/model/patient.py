@@ -1,7 +1,14 @@
 import datetime
-from app.database.setup_db import DB_PATH
-import sqlite3
+import re
+from array import array
+from dataclasses import dataclass
+from typing import ClassVar
+from app.database.connexion import session
+from app.database.conversions import ecrire_jour
+from app.database.fabrique import en_objet, en_objets
+from app.database.identites import CarteIdentites
 
+@dataclass(slots=True, eq=False)
 class Patient:
     id: int
     nom: str
@@ -21,6 +28,13 @@ class Patient:
     etat_suivi: str | None
     description: str | None
 
+    COLONNES: ClassVar[str] = ('nom, prenom, sexe, date_naissance AS "date_naissance [horodatage]", adresse, ville, telephone1, typeTelephone1,'
+                               ' telephone2, typeTelephone2, email, niveau, ecole, Amenagement AS amenagement, etat_suivi, description, id')
+    """Colonnes de patient dans l'ordre du constructeur, avec leurs conversions."""
+
+    identites: ClassVar[CarteIdentites['Patient']] = CarteIdentites("Patient")
+    """Patients déjà lus, partagés par tout le processus (invalidés par updatePatient et deletePatient)."""
+
     def __init__(self, nom: str, prenom: str, sexe: str, date_naissance: 'datetime.datetime', adresse: str, ville: str, telephone1: str, typeTelephone1: str, telephone2: str, typeTelephone2: str, email: str, niveau: str = None, ecole: str = None, amenagement: str = None, etat_suivi: str = None, description: str = None, id: int = 0) -> None:
         """
         Initialise une instance de Patient.
@@ -79,39 +93,35 @@ class Patient:
         Returns:
             list[Patient]: Liste de tous les patients.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM patient")
-        patients_data = cursor.fetchall()
-        connexion.close()
-        patients = []
-        for data in patients_data:
-            patient = Patient(
-                id=data[0],
-                nom=data[1],
-                prenom=data[2],
-                sexe=data[3],
-                date_naissance=datetime.datetime.strptime(data[4], "%Y-%m-%d"),
-                adresse=data[5],
-                amenagement=data[6],
-                niveau=data[7],
-                ecole=data[8],
-                ville=data[9],
-                telephone1=data[10],
-                typeTelephone1=data[11],
-                telephone2=data[12],
-                typeTelephone2=data[13],
-                email=data[14],
-                etat_suivi=data[15],
-                description=data[16]
-            )
-            patients.append(patient)
-        return patients
+        return Patient.identites.lire_tous(Patient._chargerPatients, lambda patient: patient.id)
+
+    @staticmethod
+    def _chargerPatients() -> list['Patient']:
+        """Lit tous les patients en base."""
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {Patient.COLONNES} FROM patient")
+            return en_objets(cursor, Patient)
     
+    @staticmethod
+    def getListePatients() -> 'ListePatients':
+        """
+        Récupère uniquement les colonnes affichées dans la liste des patients.
+        Le détail complet d'un patient est chargé à la demande (getPatientById).
+
+        Returns:
+            ListePatients: Colonnes de la liste des patients.
+        """
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {', '.join(ListePatients.COLONNES)} FROM patient")
+            return ListePatients(cursor.fetchall())
+
     @staticmethod
     def getPatientById(patient_id: int) -> 'Patient | None':
         """
         Récupère un patient par son identifiant.
+        Seule la première lecture d'un identifiant interroge la base (voir identites).
 
         Args:
             patient_id (int): Identifiant du patient.
@@ -119,70 +129,200 @@ class Patient:
         Returns:
             Patient | None: Instance de Patient si trouvée, sinon None.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM patient WHERE id = ?", (patient_id,))
-        data = cursor.fetchone()
-        connexion.close()
-        if data:
-            return Patient(
-                id=data[0],
-                nom=data[1],
-                prenom=data[2],
-                sexe=data[3],
-                date_naissance=datetime.datetime.strptime(data[4], "%Y-%m-%d"),
-                adresse=data[5],
-                amenagement=data[6],
-                niveau=data[7],
-                ecole=data[8],
-                ville=data[9],
-                telephone1=data[10],
-                typeTelephone1=data[11],
-                telephone2=data[12],
-                typeTelephone2=data[13],
-                email=data[14],
-                etat_suivi=data[15],
-                description=data[16]
-            )
-        return None
+        return Patient.identites.lire(patient_id, Patient._chargerPatient)
+
+    @staticmethod
+    def _chargerPatient(patient_id: int) -> 'Patient | None':
+        """Lit un patient en base."""
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {Patient.COLONNES} FROM patient WHERE id = ?", (patient_id,))
+            return en_objet(cursor, Patient)
         
+    @staticmethod
+    def rechercherPatients(texte: str, limite: int | None = None) -> list[int]:
+        """
+        Recherche des patients dans l'index plein texte (nom, prénom, ville, école, email, téléphones...).
+
+        La recherche ignore casse et accents ; chaque mot saisi doit correspondre
+        au début d'un mot indexé ("le mar" trouve "Léa Martin").
+
+        Args:
+            texte (str): Texte saisi dans la barre de recherche.
+            limite (int | None, optionnel): Nombre maximum de résultats. Défaut: tous.
+
+        Returns:
+            list[int]: Identifiants des patients trouvés, du plus pertinent au moins pertinent.
+        """
+        # chaque mot devient un préfixe entre guillemets : la syntaxe FTS5 (AND, *, ...) n'est pas interprétée
+        mots = re.findall(r"\w+", texte)
+        if not mots:
+            return []
+        requete = " ".join(f'"{mot}"*' for mot in mots)
+        with session() as connexion:
+            cursor = connexion.cursor()
+            # nom et prénom pèsent plus dans le classement que les autres colonnes
+            cursor.execute(
+                "SELECT rowid FROM patient_fts WHERE patient_fts MATCH ?"
+                " ORDER BY bm25(patient_fts, 10.0, 8.0, 2.0, 2.0, 1.0, 2.0, 2.0, 2.0, 1.0, 1.0) LIMIT ?",
+                (requete, -1 if limite is None else limite)
+            )
+            return [row[0] for row in cursor.fetchall()]
+
     @staticmethod
     def addPatient(patient):
-        try:
-            connexion = sqlite3.connect(DB_PATH)
+        with session(ecriture=True) as connexion:
             cursor = connexion.cursor()
 
             cursor.execute("""
                 INSERT INTO patient (nom, prenom, sexe, date_naissance, adresse, amenagement, niveau, ecole, ville, telephone1, typeTelephone1, telephone2, typeTelephone2, email, etat_suivi, description)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (patient.nom, patient.prenom, patient.sexe, patient.date_naissance.strftime("%Y-%m-%d"), patient.adresse, patient.amenagement, patient.niveau, patient.ecole, patient.ville, patient.telephone1, patient.typeTelephone1, patient.telephone2, patient.typeTelephone2, patient.email, patient.etat_suivi, patient.description))
-            
+            """, (patient.nom, patient.prenom, patient.sexe, ecrire_jour(patient.date_naissance), patient.adresse, patient.amenagement, patient.niveau, patient.ecole, patient.ville, patient.telephone1, patient.typeTelephone1, patient.telephone2, patient.typeTelephone2, patient.email, patient.etat_suivi, patient.description))
+
             patient_id = cursor.lastrowid  # Récupérer l'ID du patient inséré
-            connexion.commit()
-            connexion.close()
-            
-            return patient_id  # Retourner l'ID pour confirmation
-        except Exception as e:
-            print(f"✗ Erreur lors de l'ajout du patient : {e}")
-            return None
+
+        return patient_id  # Retourner l'ID pour confirmation
 
     @staticmethod
     def updatePatient(patient_id, patient):
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
 
-        cursor.execute("""
-            UPDATE patient
-            SET nom = ?, prenom = ?, sexe = ?, date_naissance = ?, adresse = ?, amenagement = ?, niveau = ?, ecole = ?, ville = ?, telephone1 = ?, typeTelephone1 = ?, telephone2 = ?, typeTelephone2 = ?, email = ?, etat_suivi = ?, description = ?
-            WHERE id = ?""", (patient.nom, patient.prenom, patient.sexe, patient.date_naissance.strftime("%Y-%m-%d"), patient.adresse, patient.amenagement, patient.niveau, patient.ecole, patient.ville, patient.telephone1, patient.typeTelephone1, patient.telephone2, patient.typeTelephone2, patient.email, patient.etat_suivi, patient.description, patient_id))
-        connexion.commit()
-        connexion.close()
+            cursor.execute("""
+                UPDATE patient
+                SET nom = ?, prenom = ?, sexe = ?, date_naissance = ?, adresse = ?, amenagement = ?, niveau = ?, ecole = ?, ville = ?, telephone1 = ?, typeTelephone1 = ?, telephone2 = ?, typeTelephone2 = ?, email = ?, etat_suivi = ?, description = ?
+                WHERE id = ?""", (patient.nom, patient.prenom, patient.sexe, ecrire_jour(patient.date_naissance), patient.adresse, patient.amenagement, patient.niveau, patient.ecole, patient.ville, patient.telephone1, patient.typeTelephone1, patient.telephone2, patient.typeTelephone2, patient.email, patient.etat_suivi, patient.description, patient_id))
+        Patient.identites.invalider(patient_id)
 
     @staticmethod
     def deletePatient(patient_id):
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+
+            cursor.execute("DELETE FROM patient WHERE id = ?", (patient_id,))
+        Patient.identites.invalider(patient_id)
+
+
+class ListePatients:
+    """
+    Liste des patients stockée par colonnes (une liste par champ affiché).
+
+    Seuls les champs de la liste sont gardés ; l'âge est calculé une fois au
+    chargement. Les identifiants et les âges sont stockés dans des tableaux
+    d'entiers compacts.
+    """
+    COLONNES = ("id", "nom", "prenom", "date_naissance", "niveau", "ecole", "ville", "telephone1", "email", "etat_suivi")
+    """Colonnes de la table patient chargées pour la liste."""
+
+    def __init__(self, lignes: list[tuple]) -> None:
+        """
+        Initialise la liste à partir des lignes de la requête.
+
+        Args:
+            lignes (list[tuple]): Lignes contenant les champs de COLONNES, dans cet ordre.
+        """
+        colonnes = list(zip(*lignes)) if lignes else [() for _ in self.COLONNES]
+        self.colonnes: dict[str, list] = {nom: list(valeurs) for nom, valeurs in zip(self.COLONNES[1:], colonnes[1:])}
+        self.ids = array('q', colonnes[0])
+        aujourd_hui = datetime.date.today()
+        self.ages = array('q', (self._age(date_naissance, aujourd_hui) for date_naissance in self.colonnes["date_naissance"]))
+        self._ligne_par_id: dict[int, int] = {patient_id: ligne for ligne, patient_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre de patients.
+
+        Returns:
+            int: Nombre de patients de la liste.
+        """
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle de la liste.
+
+        Returns:
+            str: Représentation lisible de la liste.
+        """
+        return f"ListePatients({len(self)} patient(s))"
+
+    def valeur(self, ligne: int, colonne: str):
+        """
+        Retourne un champ d'un patient.
+
+        Args:
+            ligne (int): Position du patient dans la liste.
+            colonne (str): Nom du champ ("id", "age" ou un champ de COLONNES).
+
+        Returns:
+            Valeur du champ.
+        """
+        if colonne == "id":
+            return self.ids[ligne]
+        if colonne == "age":
+            return self.ages[ligne]
+        return self.colonnes[colonne][ligne]
+
+    def ligne(self, patient_id: int) -> int | None:
+        """
+        Retourne la position d'un patient dans la liste.
+
+        Args:
+            patient_id (int): Identifiant du patient.
 
-        cursor.execute("DELETE FROM patient WHERE id = ?", (patient_id,))
-        connexion.commit()
-        connexion.close()
\ No newline at end of file
+        Returns:
+            int | None: Position du patient, ou None s'il n'est pas dans la liste.
+        """
+        return self._ligne_par_id.get(patient_id)
+
+    def ajouter(self, patient: Patient) -> int:
+        """
+        Ajoute un patient à la fin de la liste.
+
+        Args:
+            patient (Patient): Patient enregistré (avec son identifiant).
+
+        Returns:
+            int: Position du patient ajouté.
+        """
+        ligne = len(self.ids)
+        self.ids.append(patient.id)
+        self.ages.append(0)
+        for colonne in self.colonnes.values():
+            colonne.append(None)
+        self._ligne_par_id[patient.id] = ligne
+        self.mettre_a_jour(ligne, patient)
+        return ligne
+
+    def mettre_a_jour(self, ligne: int, patient: Patient) -> None:
+        """
+        Remplace les champs d'un patient par ceux d'une instance complète.
+
+        Args:
+            ligne (int): Position du patient dans la liste.
+            patient (Patient): Nouvelles données du patient.
+        """
+        for colonne in self.colonnes:
+            self.colonnes[colonne][ligne] = getattr(patient, colonne)
+        self.colonnes["date_naissance"][ligne] = ecrire_jour(patient.date_naissance)
+        self.ages[ligne] = self._age(self.colonnes["date_naissance"][ligne], datetime.date.today())
+
+    def retirer(self, ligne: int) -> None:
+        """
+        Retire un patient de la liste.
+
+        Args:
+            ligne (int): Position du patient dans la liste.
+        """
+        del self.ids[ligne]
+        del self.ages[ligne]
+        for colonne in self.colonnes.values():
+            del colonne[ligne]
+        self._ligne_par_id = {patient_id: position for position, patient_id in enumerate(self.ids)}
+
+    @staticmethod
+    def _age(date_naissance: str | None, aujourd_hui: datetime.date) -> int:
+        """Âge en années révolues (même calcul que le formulaire)."""
+        if not date_naissance:
+            return 0
+        return (aujourd_hui - datetime.date.fromisoformat(date_naissance)).days // 365
@@ -1,10 +1,13 @@
-from app.database.setup_db import DB_PATH
-import sqlite3
-from datetime import datetime,timedelta
+from app.database.connexion import session
+from app.database.conversions import ecrire_jour, lire_horodatage
+from app.database.fabrique import en_objet, en_objets
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import ClassVar
 
-from datetime import datetime
 from app.model.typeRDV import TypeRDV
 
+@dataclass(slots=True, eq=False)
 class RendezVous:
     id: int | None
     patient_id: int
@@ -13,6 +16,10 @@ class RendezVous:
     type_id: int
     presence: str
     facture_id: str
+    google_event_id: str | None
+
+    COLONNES: ClassVar[str] = 'patient_id, date AS "date [horodatage]", motif, type_id, presence, facture_id, id, google_event_id'
+    """Colonnes de rendez_vous dans l'ordre du constructeur, avec leurs conversions."""
 
     def __init__(
         self,
@@ -22,7 +29,8 @@ class RendezVous:
         type_id: int,
         presence: str,
         facture_id: str = "-1",
-        id: int | None = None
+        id: int | None = None,
+        google_event_id: str | None = None
     ) -> None:
         """
         Initialise une instance de RendezVous.
@@ -35,6 +43,7 @@ class RendezVous:
             presence (str): Statut de présence ('présent', 'absent', etc.).
             facture_id (str, optionnel): Identifiant de la facture associée.
             id (int | None, optionnel): Identifiant unique du rendez-vous.
+            google_event_id (str | None, optionnel): Identifiant de l'événement Google Agenda, une fois synchronisé.
         """
         self.id = id
         self.patient_id = patient_id
@@ -43,6 +52,7 @@ class RendezVous:
         self.type_id = type_id
         self.presence = presence
         self.facture_id = facture_id
+        self.google_event_id = google_event_id
 
     def __repr__(self) -> str:
         """
@@ -61,12 +71,10 @@ class RendezVous:
         Returns:
             list[RendezVous]: Liste de tous les rendez-vous.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM rendez_vous")
-        rdv_data = cursor.fetchall()
-        connexion.close()
-        return RendezVous.data_to_rendezvous(rdv_data)
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {RendezVous.COLONNES} FROM rendez_vous")
+            return en_objets(cursor, RendezVous)
     
     @staticmethod
     def getRendezVousById(rdv_id: int) -> 'RendezVous | None':
@@ -79,12 +87,10 @@ class RendezVous:
         Returns:
             RendezVous | None: Instance de RendezVous si trouvée, sinon None.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM rendez_vous WHERE id = ?", (rdv_id,))
-        data = cursor.fetchall()
-        connexion.close()
-        return RendezVous.data_to_rendezvous(data)[0] if data else None
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {RendezVous.COLONNES} FROM rendez_vous WHERE id = ?", (rdv_id,))
+            return en_objet(cursor, RendezVous)
     
     @staticmethod
     def getRendezVousByPatientId(patient_id: int) -> list['RendezVous']:
@@ -97,12 +103,10 @@ class RendezVous:
         Returns:
             list[RendezVous]: Liste des rendez-vous du patient.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM rendez_vous WHERE patient_id = ?", (patient_id,))
-        rdv_data = cursor.fetchall()
-        connexion.close()
-        return RendezVous.data_to_rendezvous(rdv_data)
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {RendezVous.COLONNES} FROM rendez_vous WHERE patient_id = ?", (patient_id,))
+            return en_objets(cursor, RendezVous)
     
     @staticmethod
     def getRendezVousByPlage(date_debut: datetime, date_fin: datetime) -> list['RendezVous']:
@@ -116,45 +120,131 @@ class RendezVous:
         Returns:
             list[RendezVous]: Liste des rendez-vous dans la plage.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM rendez_vous WHERE date BETWEEN ? AND ?", (date_debut.strftime('%Y-%m-%d %H:%M:%S'), date_fin.strftime('%Y-%m-%d %H:%M:%S')))
-        rdv_data = cursor.fetchall()
-        connexion.close()
-        return RendezVous.data_to_rendezvous(rdv_data)
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {RendezVous.COLONNES} FROM rendez_vous WHERE date BETWEEN ? AND ?", (date_debut, date_fin))
+            return en_objets(cursor, RendezVous)
     
+    @staticmethod
+    def getRendezVousSemaine(date_debut: datetime, date_fin: datetime) -> list['RendezVousSemaine']:
+        """
+        Récupère en une seule requête les rendez-vous d'une plage avec les
+        informations du patient et du type nécessaires à l'affichage du planning.
+
+        Args:
+            date_debut (datetime): Date de début de la plage.
+            date_fin (datetime): Date de fin de la plage.
+
+        Returns:
+            list[RendezVousSemaine]: Rendez-vous de la plage, triés par date.
+        """
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute("""
+                SELECT r.id, r.patient_id, r.date AS "date [horodatage]", r.motif, r.type_id, r.presence, r.facture_id,
+                       p.nom, p.prenom,
+                       t.nom, t.duree AS "duree [minutes]", t.couleur, t.localisation, t.estgroupe AS "estgroupe [booleen]"
+                FROM rendez_vous r
+                JOIN patient p ON p.id = r.patient_id
+                JOIN type_rdv t ON t.id = r.type_id
+                WHERE r.date BETWEEN ? AND ?
+                ORDER BY r.date
+            """, (date_debut, date_fin))
+            rows = cursor.fetchall()
+
+        return [
+            RendezVousSemaine(RendezVous(row[1], row[2], row[3], row[4], row[5], row[6], row[0]), *row[7:])
+            for row in rows
+        ]
+
+    @staticmethod
+    def getOccupationPeriode(date_debut: date, date_fin: date, debut_apres_midi: str = "12:00") -> list['OccupationDemiJournee']:
+        """
+        Récupère en une seule requête agrégée l'occupation d'une période, par
+        demi-journée et par type de rendez-vous, sans charger les rendez-vous.
+        Les rendez-vous annulés ne comptent pas ; une séance de groupe n'occupe
+        son créneau qu'une fois, quel que soit le nombre de patients.
+
+        Args:
+            date_debut (date): Premier jour de la période.
+            date_fin (date): Dernier jour de la période (inclus).
+            debut_apres_midi (str, optionnel): Heure "HH:MM" de début de l'après-midi. Défaut: "12:00".
+
+        Returns:
+            list[OccupationDemiJournee]: Occupation triée par jour puis demi-journée.
+        """
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute("""
+                SELECT jour AS "jour [jour]", apres_midi AS "apres_midi [booleen]", type_id, nom AS type_nom, couleur,
+                       SUM(nombre) AS nombre, COALESCE(SUM(duree), 0) AS minutes
+                FROM (
+                    SELECT date(r.date) AS jour, strftime('%H:%M', r.date) >= ? AS apres_midi,
+                           r.type_id, t.nom, t.couleur, t.duree, COUNT(*) AS nombre
+                    FROM rendez_vous r
+                    JOIN type_rdv t ON t.id = r.type_id
+                    WHERE r.date >= ? AND r.date < ? AND r.presence IS NOT 'Annulé'
+                    GROUP BY r.date, r.type_id
+                )
+                GROUP BY jour, apres_midi, type_id
+                ORDER BY jour, apres_midi
+            """, (debut_apres_midi, ecrire_jour(date_debut), ecrire_jour(date_fin + timedelta(days=1))))
+            return en_objets(cursor, OccupationDemiJournee)
+
     @staticmethod
     def addRendezVous(rdv: 'RendezVous') -> None:
         """
         Ajoute un rendez-vous à la base de données.
+        L'envoi à Google Agenda est mis en file (synchro_calendrier) et fait en arrière-plan.
 
         Args:
             rdv (RendezVous): Instance du rendez-vous à ajouter.
+
+        Raises:
+            sqlite3.Error: Si l'insertion échoue ; le rendez-vous n'est alors pas ajouté.
         """
-        from app.services.calendar_api import insert_rdv
-        try :
+        from app.services.synchro_calendrier import ajouter_insertions, synchro
+        with session(ecriture=True) as connexion:
+            rdv_id = connexion.execute(
+                "INSERT INTO rendez_vous (patient_id, date, motif, type_id, presence, facture_id) VALUES (?, ?, ?, ?, ?, ?) RETURNING id",
+                (rdv.patient_id, rdv.date, rdv.motif, rdv.type_id, rdv.presence, rdv.facture_id)
+            ).fetchone()[0]
+            ajouter_insertions(connexion, [rdv_id])
+        rdv.id = rdv_id
+        synchro.reveiller()
 
-            connexion = sqlite3.connect(DB_PATH)
-            cursor = connexion.cursor()
+    @staticmethod
+    def addRendezVousSerie(rdvs: list['RendezVous']) -> list[int]:
+        """
+        Ajoute plusieurs rendez-vous en une seule transaction (séries récurrentes).
+        Les identifiants attribués sont renseignés sur chaque instance ; l'envoi à
+        Google Agenda est mis en file comme pour addRendezVous.
 
-            # store date as standardized string to match data_to_rendezvous parsing
-            date_str = rdv.date.strftime('%Y-%m-%d %H:%M:%S') if isinstance(rdv.date, datetime) else str(rdv.date)
+        Args:
+            rdvs (list[RendezVous]): Rendez-vous à ajouter.
 
-            cursor.execute(
-                "INSERT INTO rendez_vous (patient_id, date, motif, type_id, presence, facture_id) VALUES (?, ?, ?, ?, ?, ?)",
-                (rdv.patient_id, date_str, rdv.motif, rdv.type_id, rdv.presence, rdv.facture_id)
-            )
-            rdv.id = cursor.lastrowid
-            connexion.commit()
-            connexion.close()
-        except Exception as e :
-            print(f"[ERREUR] {e}")
-            return
-        try :
-            insert_rdv(rdv)
-        except Exception as e :
-            print(f"[ERREUR CALENDAR] {e}")
-            return
+        Returns:
+            list[int]: Identifiants attribués, dans l'ordre des rendez-vous.
+
+        Raises:
+            sqlite3.Error: Si l'insertion échoue ; aucun rendez-vous n'est alors ajouté.
+        """
+        from app.services.synchro_calendrier import ajouter_insertions, synchro
+        if not rdvs:
+            return []
+        with session(ecriture=True) as connexion:
+            ids = [
+                connexion.execute(
+                    "INSERT INTO rendez_vous (patient_id, date, motif, type_id, presence, facture_id) VALUES (?, ?, ?, ?, ?, ?) RETURNING id",
+                    (rdv.patient_id, rdv.date, rdv.motif, rdv.type_id, rdv.presence, rdv.facture_id)
+                ).fetchone()[0]
+                for rdv in rdvs
+            ]
+            ajouter_insertions(connexion, ids)
+        for rdv, rdv_id in zip(rdvs, ids):
+            rdv.id = rdv_id
+        synchro.reveiller()
+        return ids
 
     @staticmethod
     def updateRendezVous(rdv_id: int, rdv: 'RendezVous') -> None:
@@ -164,28 +254,79 @@ class RendezVous:
         Args:
             rdv_id (int): Identifiant du rendez-vous à mettre à jour.
             rdv (RendezVous): Nouvelle instance du rendez-vous.
-        """
-        from app.services.calendar_api import modify_rdv
-        old_rdv = RendezVous.getRendezVousById(rdv_id)
 
-        try : 
-            connexion = sqlite3.connect(DB_PATH)
+        Raises:
+            sqlite3.Error: Si la mise à jour échoue ; le rendez-vous n'est alors pas modifié.
+        """
+        from app.services.synchro_calendrier import ajouter_modification, synchro
+        with session(ecriture=True) as connexion:
+            old_rdv = RendezVous.getRendezVousById(rdv_id)
             cursor = connexion.cursor()
             cursor.execute(
                 "UPDATE rendez_vous SET patient_id = ?, date = ?, motif = ?, type_id = ?, presence= ?, facture_id=? WHERE id = ?",
                 (rdv.patient_id, rdv.date, rdv.motif, rdv.type_id, rdv.presence, rdv.facture_id, rdv_id)
             )
-            connexion.commit()
-            connexion.close()
-        except Exception as e :
-            print(f"[ERREUR] {e}")
-            return
-        try :
-            
-            modify_rdv(old_rdv, rdv)
-        except Exception as e :
-            print(f"[ERREUR CALENDAR] {e}")
-            return
+            if old_rdv is not None:
+                ajouter_modification(connexion, rdv_id, old_rdv.date, old_rdv.type_id)
+        synchro.reveiller()
+
+    @staticmethod
+    def deleteRendezVous(rdv_id: int) -> None:
+        """
+        Supprime un rendez-vous de la base de données.
+        La suppression de l'événement Google Agenda est mise en file (synchro_calendrier).
+
+        Args:
+            rdv_id (int): Identifiant du rendez-vous à supprimer.
+
+        Raises:
+            sqlite3.Error: Si la suppression échoue ; le rendez-vous est alors conservé.
+        """
+        from app.services.synchro_calendrier import ajouter_suppression, synchro
+        with session(ecriture=True) as connexion:
+            rdv = RendezVous.getRendezVousById(rdv_id)
+            if rdv is None:
+                return
+            connexion.execute("DELETE FROM rendez_vous WHERE id = ?", (rdv_id,))
+            ajouter_suppression(connexion, rdv)
+        synchro.reveiller()
+
+    @staticmethod
+    def updateGoogleEventIds(associations: list[tuple[str, int]], seulement_manquants: bool = False) -> int:
+        """
+        Enregistre l'événement Google Agenda de rendez-vous synchronisés.
+
+        Args:
+            associations (list[tuple[str, int]]): Couples (identifiant de l'événement, identifiant du rendez-vous).
+            seulement_manquants (bool, optionnel): Ne pas remplacer un identifiant déjà connu. Défaut: False.
+
+        Returns:
+            int: Nombre de rendez-vous mis à jour.
+        """
+        requete = "UPDATE rendez_vous SET google_event_id = ? WHERE id = ?"
+        if seulement_manquants:
+            requete += " AND google_event_id IS NULL"
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.executemany(requete, associations)
+            return cursor.rowcount
+
+    @staticmethod
+    def updateFactureIdRendezVous(rdv_ids: list[int], facture_id: str) -> None:
+        """
+        Associe plusieurs rendez-vous à une facture en une seule instruction.
+        Seule la colonne facture_id est modifiée : l'agenda Google n'est pas concerné.
+
+        Args:
+            rdv_ids (list[int]): Identifiants des rendez-vous.
+            facture_id (str): Identifiant de la facture ("-1" pour un rendez-vous non facturable).
+        """
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.executemany(
+                "UPDATE rendez_vous SET facture_id = ? WHERE id = ?",
+                [(facture_id, rdv_id) for rdv_id in rdv_ids]
+            )
 
     @staticmethod
     def getRendezVousByDateTime(date_time: datetime) -> list['RendezVous']:
@@ -198,68 +339,28 @@ class RendezVous:
         Returns:
             list[RendezVous]: Liste des rendez-vous à cette date/heure.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM rendez_vous WHERE date = ?", (date_time.strftime('%Y-%m-%d %H:%M:%S'),))
-        data = cursor.fetchall()
-        connexion.close()
-        return RendezVous.data_to_rendezvous(data)
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {RendezVous.COLONNES} FROM rendez_vous WHERE date = ?", (date_time,))
+            return en_objets(cursor, RendezVous)
     
     @staticmethod
     def creneauLibre(rendezvous: 'RendezVous') -> bool:
         """
         Vérifie si un créneau est libre pour un rendez-vous donné.
 
+        Le rendez-vous lui-même est exclu de la vérification (cas d'une modification).
+        Pour une séance de groupe, le créneau reste libre si tous les rendez-vous
+        qui le chevauchent sont du même type.
+
         Args:
             rendezvous (RendezVous): Rendez-vous à vérifier.
 
         Returns:
             bool: True si le créneau est libre, False sinon.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        type_rdv: TypeRDV = cursor.execute("SELECT * FROM type_rdv WHERE id = ?", (rendezvous.type_id,)).fetchall()[0]
-        duree = int(type_rdv[4])
-        dureetime: timedelta= timedelta(minutes=duree)
-        date_fin :str = (rendezvous.date + dureetime).strftime('%Y-%m-%d %H:%M:%S')
-        date_debut :str = rendezvous.date.strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute("""
-                SELECT * FROM rendez_vous r, type_rdv t
-                WHERE r.type_id = t.id AND (
-                       date <= ? and datetime(date, '+' || duree || ' minutes') > ?
-                       OR
-                       date >= ? and datetime(date, '+' || duree || ' minutes') <= ?
-                       OR
-                       date < ? and datetime(date, '+' || duree || ' minutes') > ?
-                       OR
-                       date <= ? and datetime(date, '+' || duree || ' minutes') >= ?
-                      )
-                       AND r.id != ?
-        """, (date_debut, date_debut,
-              date_debut,date_fin,
-              date_fin,date_fin,
-              date_debut,date_fin,
-              rendezvous.id if rendezvous.id is not None else -1))
-        # l'id du rendez-vous est exclu de la vérification pour les modifications -1 signifie qu'on ajoute un nouveau rdv
-        rdv_data = cursor.fetchall()
-        connexion.close()
-        
-        # si c'est un type groupé il faut vérifier que tous les rendez vous sont en même temps
-        if (type_rdv[7]) :
-
-            rdv = []
-            for data in rdv_data :
-                # on vérifie que tous les rdv sont du même type
-                if (int(data[4])!=rendezvous.type_id):
-                    return False
-            # si tous les rdv sont du même type et que c'est une séance groupée
-            return True
-        # si ce n'est pas un rendez-vous groupé siil y à un autre rdv sur le créneau ce n'est pas libre
-        else :
-
-            if (not rdv_data):
-                return True
-            return False
+        from app.services.disponibilite import creneau_libre
+        return creneau_libre(rendezvous)
         
     @staticmethod
     def getRendezVousByPatientAndDateRange(patient_id: int, start_date: datetime, end_date: datetime) -> list['RendezVous']:
@@ -274,12 +375,10 @@ class RendezVous:
         Returns:
             list[RendezVous]: Liste des rendez-vous du patient dans la plage.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM rendez_vous WHERE patient_id = ? AND date BETWEEN ? AND ?", (patient_id, start_date.strftime('%Y-%m-%d %H:%M:%S'), end_date.strftime('%Y-%m-%d %H:%M:%S')))
-        rdv_data = cursor.fetchall()
-        connexion.close()
-        return RendezVous.data_to_rendezvous(rdv_data)
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {RendezVous.COLONNES} FROM rendez_vous WHERE patient_id = ? AND date BETWEEN ? AND ?", (patient_id, start_date, end_date))
+            return en_objets(cursor, RendezVous)
     
     @staticmethod
     def getRendezVousByFactureId(facture_id: str) -> list['RendezVous']:
@@ -292,19 +391,16 @@ class RendezVous:
         Returns:
             list[RendezVous]: Liste des rendez-vous de la facture.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-
-        cursor.execute("SELECT * FROM rendez_vous WHERE facture_id = ?", (facture_id,))
-        rdv_data = cursor.fetchall()
-        connexion.close()
-
-        return RendezVous.data_to_rendezvous(rdv_data)
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {RendezVous.COLONNES} FROM rendez_vous WHERE facture_id = ?", (facture_id,))
+            return en_objets(cursor, RendezVous)
     
     @staticmethod
     def data_to_rendezvous(data: list[str]) -> list['RendezVous']:
         """
-        Convertit une liste de tuples SQL en objets RendezVous.
+        Convertit des lignes brutes de rendez_vous (SELECT *, dates en texte) en objets RendezVous.
+        Les méthodes du modèle utilisent COLONNES et en_objets, qui convertissent les dates à la lecture.
 
         Args:
             data (list): Liste de tuples représentant les lignes SQL.
@@ -312,22 +408,76 @@ class RendezVous:
         Returns:
             list[RendezVous]: Liste d'instances RendezVous.
         """
-        rdvs: list[RendezVous] = []
-        if (data is None or data==[]):
-            return rdvs
-        
-        for row in data:
-            rdv = RendezVous(
-                id=row[0],
-                patient_id=row[1],
-                date=datetime.strptime(row[2], '%Y-%m-%d %H:%M:%S'),
-                motif=row[3],
-                type_id=row[4],
-                presence=row[5],
-                facture_id=row[6]
-            )
-            rdvs.append(rdv)
+        if not data:
+            return []
+        return [
+            RendezVous(row[1], lire_horodatage(row[2]), row[3], row[4], row[5], row[6], row[0])
+            for row in data
+        ]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class RendezVousSemaine:
+    """
+    Rendez-vous hydraté avec les champs d'affichage du patient et du type (planning).
+
+    Attributes:
+        rdv (RendezVous): Rendez-vous affiché.
+        patient_nom (str): Nom du patient.
+        patient_prenom (str): Prénom du patient.
+        type_nom (str): Nom du type de rendez-vous.
+        duree (timedelta): Durée du type de rendez-vous.
+        couleur (str): Couleur associée au type.
+        localisation (str): Lieu du rendez-vous.
+        estgroupe (bool): Indique si le rendez-vous est groupé.
+    """
+    rdv: RendezVous
+    patient_nom: str
+    patient_prenom: str
+    type_nom: str
+    duree: timedelta
+    couleur: str
+    localisation: str
+    estgroupe: bool
 
-        print(f"Converted {len(rdvs)} rows to RendezVous instances.")
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle de la ligne du planning.
 
-        return rdvs
\ No newline at end of file
+        Returns:
+            str: Représentation lisible de la ligne.
+        """
+        return f"RendezVousSemaine(ID: {self.rdv.id}, {self.patient_nom} {self.patient_prenom}, Date: {self.rdv.date}, Type: {self.type_nom})"
+
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class OccupationDemiJournee:
+    """
+    Occupation agrégée d'une demi-journée pour un type de rendez-vous (vues mois et multi-semaines).
+
+    Attributes:
+        jour (date): Jour concerné.
+        apres_midi (bool): True pour l'après-midi, False pour le matin.
+        type_id (int): Identifiant du type de rendez-vous.
+        type_nom (str): Nom du type de rendez-vous.
+        couleur (str): Couleur associée au type.
+        nombre (int): Nombre de rendez-vous (patients) de ce type.
+        minutes (int): Temps occupé en minutes (une fois par créneau).
+    """
+    jour: date
+    apres_midi: bool
+    type_id: int
+    type_nom: str
+    couleur: str
+    nombre: int
+    minutes: int
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle de la ligne d'occupation.
+
+        Returns:
+            str: Représentation lisible de la ligne.
+        """
+        return f"OccupationDemiJournee({self.jour} {'après-midi' if self.apres_midi else 'matin'}, Type: {self.type_nom}, {self.nombre} RDV, {self.minutes} min)"
\ No newline at end of file
@@ -1,8 +1,26 @@
-from app.database.setup_db import DB_PATH
-import sqlite3
+from app.database.connexion import session
+from app.database.fabrique import en_objet, en_objets
+from app.database.identites import CarteIdentites
+from dataclasses import dataclass
 from datetime import timedelta
+from typing import ClassVar
 
+@dataclass(frozen=True, slots=True, eq=False)
 class TypeRDV:
+    """
+    Type de rendez-vous. Les instances ne sont pas modifiables : une
+    modification passe par une nouvelle instance enregistrée avec updateTypeRDV.
+
+    Attributes:
+        id (int): Identifiant du type de rendez-vous.
+        nom (str): Nom du type de rendez-vous.
+        description (str): Description du type de rendez-vous.
+        prix (float): Prix du rendez-vous.
+        duree (timedelta): Durée du rendez-vous.
+        localisation (str): Lieu du rendez-vous.
+        couleur (str): Couleur associée.
+        estgroupe (bool): Indique si le rendez-vous est groupé.
+    """
     id: int
     nom: str
     description: str
@@ -12,28 +30,11 @@ class TypeRDV:
     couleur: str
     estgroupe: bool
 
-    def __init__(self, id: int, nom: str, description: str, prix: float, duree: 'timedelta', localisation: str, couleur: str, estgroupe: bool) -> None:
-        """
-        Initialise une instance de TypeRDV.
+    COLONNES: ClassVar[str] = 'id, nom, description, prix, duree AS "duree [minutes]", localisation, couleur, estgroupe AS "estgroupe [booleen]"'
+    """Colonnes de type_rdv dans l'ordre du constructeur, avec leurs conversions."""
 
-        Args:
-            id (int): Identifiant du type de rendez-vous.
-            nom (str): Nom du type de rendez-vous.
-            description (str): Description du type de rendez-vous.
-            prix (float): Prix du rendez-vous.
-            duree (timedelta): Durée du rendez-vous.
-            localisation (str): Lieu du rendez-vous.
-            couleur (str): Couleur associée.
-            estgroupe (bool): Indique si le rendez-vous est groupé.
-        """
-        self.id = id
-        self.nom = nom
-        self.description = description
-        self.prix = prix
-        self.duree = duree
-        self.localisation = localisation
-        self.couleur = couleur
-        self.estgroupe = estgroupe
+    identites: ClassVar[CarteIdentites['TypeRDV']] = CarteIdentites("TypeRDV")
+    """Types déjà lus, partagés par tout le processus (invalidés par updateTypeRDV et deleteTypeRDV)."""
 
     def __repr__(self) -> str:
         """
@@ -52,30 +53,21 @@ class TypeRDV:
         Returns:
             list[TypeRDV]: Liste de tous les types de rendez-vous.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM type_rdv")
-        types_data = cursor.fetchall()
-        connexion.close()
-        types = []
-        for data in types_data:
-            type_rdv = TypeRDV(
-                id=data[0],
-                nom=data[1],
-                description=data[2],
-                prix=data[3],
-                duree=timedelta(minutes=int(data[4])),
-                localisation=data[5],
-                couleur=data[6],
-                estgroupe=data[7]
-            )
-            types.append(type_rdv)
-        return types
+        return TypeRDV.identites.lire_tous(TypeRDV._chargerTypesRDV, lambda type_rdv: type_rdv.id)
+
+    @staticmethod
+    def _chargerTypesRDV() -> list['TypeRDV']:
+        """Lit tous les types de rendez-vous en base."""
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {TypeRDV.COLONNES} FROM type_rdv")
+            return en_objets(cursor, TypeRDV)
     
     @staticmethod
     def getTypeRDVById(type_id: int) -> 'TypeRDV | None':
         """
         Récupère un type de rendez-vous par son identifiant.
+        Seule la première lecture d'un identifiant interroge la base (voir identites).
 
         Args:
             type_id (int): Identifiant du type de rendez-vous.
@@ -83,23 +75,15 @@ class TypeRDV:
         Returns:
             TypeRDV | None: Instance de TypeRDV si trouvée, sinon None.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("SELECT * FROM type_rdv WHERE id = ?", (type_id,))
-        data = cursor.fetchone()
-        connexion.close()
-        if data:
-            return TypeRDV(
-                id=data[0],
-                nom=data[1],
-                description=data[2],
-                prix=data[3],
-                duree=timedelta(minutes=int(data[4])),
-                localisation=data[5],
-                couleur=data[6],
-                estgroupe=data[7]
-            )
-        return None
+        return TypeRDV.identites.lire(type_id, TypeRDV._chargerTypeRDV)
+
+    @staticmethod
+    def _chargerTypeRDV(type_id: int) -> 'TypeRDV | None':
+        """Lit un type de rendez-vous en base."""
+        with session() as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(f"SELECT {TypeRDV.COLONNES} FROM type_rdv WHERE id = ?", (type_id,))
+            return en_objet(cursor, TypeRDV)
     
     @staticmethod
     def addTypeRDV(typeRDV: 'TypeRDV') -> None:
@@ -109,14 +93,12 @@ class TypeRDV:
         Args:
             typeRDV (TypeRDV): Instance du type de rendez-vous à ajouter.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute(
-            "INSERT INTO type_rdv (nom, description, prix, duree, localisation, couleur,estgroupe) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (typeRDV.nom, typeRDV.description, typeRDV.prix, typeRDV.duree.total_seconds() // 60, typeRDV.localisation, typeRDV.couleur, typeRDV.estgroupe)
-        )
-        connexion.commit()
-        connexion.close()
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.execute(
+                "INSERT INTO type_rdv (nom, description, prix, duree, localisation, couleur,estgroupe) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (typeRDV.nom, typeRDV.description, typeRDV.prix, typeRDV.duree, typeRDV.localisation, typeRDV.couleur, typeRDV.estgroupe)
+            )
     
     @staticmethod
     def updateTypeRDV(type_rdv: 'TypeRDV') -> None:
@@ -124,15 +106,14 @@ class TypeRDV:
         Args:
             type_rdv (TypeRDV): Instance du type de rendez-vous à mettre à jour.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("""
-            UPDATE type_rdv 
-            SET nom = ?, description = ?, prix = ?, duree = ?, localisation = ?, couleur = ?, estgroupe = ?
-            WHERE id = ?
-        """, (type_rdv.nom, type_rdv.description, type_rdv.prix, type_rdv.duree, type_rdv.localisation, type_rdv.couleur, type_rdv.estgroupe, type_rdv.id))
-        connexion.commit()
-        connexion.close()
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.execute("""
+                UPDATE type_rdv 
+                SET nom = ?, description = ?, prix = ?, duree = ?, localisation = ?, couleur = ?, estgroupe = ?
+                WHERE id = ?
+            """, (type_rdv.nom, type_rdv.description, type_rdv.prix, type_rdv.duree, type_rdv.localisation, type_rdv.couleur, type_rdv.estgroupe, type_rdv.id))
+        TypeRDV.identites.invalider(type_rdv.id)
     
     @staticmethod
     def deleteTypeRDV(type_rdv_id: int) -> None:
@@ -140,8 +121,7 @@ class TypeRDV:
         Args:
             type_rdv_id (int): Identifiant du type de rendez-vous à supprimer.
         """
-        connexion = sqlite3.connect(DB_PATH)
-        cursor = connexion.cursor()
-        cursor.execute("DELETE FROM type_rdv WHERE id = ?", (type_rdv_id,))
-        connexion.commit()
-        connexion.close()
\ No newline at end of file
+        with session(ecriture=True) as connexion:
+            cursor = connexion.cursor()
+            cursor.execute("DELETE FROM type_rdv WHERE id = ?", (type_rdv_id,))
+        TypeRDV.identites.invalider(type_rdv_id)
\ No newline at end of file
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+from app.model.rendezVous import RendezVousSemaine
+
+
+def lundi(jour: date | datetime) -> date:
+    """
+    Retourne le lundi de la semaine d'une date.
+
+    Args:
+        jour (date | datetime): Date quelconque.
+
+    Returns:
+        date: Lundi de la même semaine.
+    """
+    if isinstance(jour, datetime):
+        jour = jour.date()
+    return jour - timedelta(days=jour.weekday())
+
+
+class CacheSemaines:
+    """
+    Cache LRU des semaines du planning, indexé par la date du lundi.
+
+    Chaque semaine a un numéro de version incrémenté à chaque invalidation :
+    un chargement lancé avant une modification (ex : préchargement en arrière-plan)
+    ne peut donc pas remettre en cache des données périmées.
+    """
+    capacite: int
+
+    def __init__(self, capacite: int = 12) -> None:
+        """
+        Initialise un cache vide.
+
+        Args:
+            capacite (int, optionnel): Nombre maximum de semaines gardées. Défaut: 12.
+        """
+        self.capacite = capacite
+        self._semaines: OrderedDict[date, list[RendezVousSemaine]] = OrderedDict()
+        self._versions: dict[date, int] = {}
+        # incrémenté quand tout le cache est vidé
+        self._generation = 0
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle du cache.
+
+        Returns:
+            str: Représentation lisible du cache.
+        """
+        return f"CacheSemaines({len(self._semaines)}/{self.capacite} semaine(s): {[str(l) for l in self._semaines]})"
+
+    def __contains__(self, jour: date | datetime) -> bool:
+        """
+        Indique si la semaine d'une date est en cache.
+
+        Args:
+            jour (date | datetime): Date de la semaine.
+
+        Returns:
+            bool: True si la semaine est en cache.
+        """
+        return lundi(jour) in self._semaines
+
+    def get(self, jour: date | datetime) -> list[RendezVousSemaine] | None:
+        """
+        Retourne les rendez-vous d'une semaine en cache et la marque comme récemment utilisée.
+
+        Args:
+            jour (date | datetime): Date de la semaine.
+
+        Returns:
+            list[RendezVousSemaine] | None: Rendez-vous de la semaine, ou None si elle n'est pas en cache.
+        """
+        cle = lundi(jour)
+        lignes = self._semaines.get(cle)
+        if lignes is not None:
+            self._semaines.move_to_end(cle)
+        return lignes
+
+    def version(self, jour: date | datetime) -> tuple[int, int]:
+        """
+        Retourne la version courante d'une semaine, à relever avant de lancer son chargement.
+
+        Args:
+            jour (date | datetime): Date de la semaine.
+
+        Returns:
+            tuple[int, int]: Génération du cache et numéro de version de la semaine.
+        """
+        return self._generation, self._versions.get(lundi(jour), 0)
+
+    def put(self, jour: date | datetime, lignes: list[RendezVousSemaine], version: tuple[int, int] | None = None) -> bool:
+        """
+        Met une semaine en cache en évinçant la moins récemment utilisée si besoin.
+
+        Args:
+            jour (date | datetime): Date de la semaine.
+            lignes (list[RendezVousSemaine]): Rendez-vous de la semaine.
+            version (tuple[int, int] | None, optionnel): Version relevée au lancement du chargement ; si la
+                semaine a été invalidée depuis, les données sont ignorées.
+
+        Returns:
+            bool: True si la semaine a été mise en cache.
+        """
+        cle = lundi(jour)
+        if version is not None and version != (self._generation, self._versions.get(cle, 0)):
+            return False
+        self._semaines[cle] = lignes
+        self._semaines.move_to_end(cle)
+        while len(self._semaines) > self.capacite:
+            self._semaines.popitem(last=False)
+        return True
+
+    def invalider(self, *jours: date | datetime | None) -> None:
+        """
+        Retire du cache les semaines contenant les dates données (création,
+        modification ou suppression d'un rendez-vous à ces dates).
+
+        Args:
+            *jours (date | datetime | None): Dates touchées ; None est ignoré.
+        """
+        for jour in jours:
+            if jour is None:
+                continue
+            cle = lundi(jour)
+            self._semaines.pop(cle, None)
+            self._versions[cle] = self._versions.get(cle, 0) + 1
+
+    def vider(self) -> None:
+        """
+        Vide le cache (ex : patients ou types modifiés dans un autre onglet).
+        """
+        self._generation += 1
+        self._semaines.clear()
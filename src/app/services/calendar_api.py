@@ -1,17 +1,17 @@
+import re
 from datetime import datetime, timedelta,timezone
 from app.services.google_api_manager import get_calendarV3_service
 import app.services.constantes_manager as cm
+from app.services.calendrier_lots import INSERTION, OperationCalendrier, convertir_erreur, executer_par_lots
 from app.model.rendezVous import RendezVous
 from app.model.patient import Patient
 from app.model.typeRDV import TypeRDV
 
-try:
-  from googleapiclient.errors import HttpError
-except Exception:
-  HttpError = Exception
-
 CALENDAR_ID = None
 
+# Propriété privée des événements : identifiant du rendez-vous CabiLib
+PROPRIETE_RDV_ID = "cabilib_rdv_id"
+
 def create_calendar_if_not_exist ():
   """Creates a Google Calendar if it does not already exist.
 
@@ -88,7 +88,8 @@ def get_event_by_plage(start_datetime, end_datetime):
         .execute()
     )
   except Exception as e:
-    if isinstance(e, HttpError):
+    # HttpError (réponse HTTP reçue), repérée sans importer googleapiclient
+    if hasattr(e, "resp"):
       try:
         content = e.content.decode() if hasattr(e, "content") else str(e)
       except Exception:
@@ -119,16 +120,19 @@ def create_event(rdv:RendezVous):
   end_date = end_date.isoformat()
 
   summary = f"RDV avec {patient.nom} {patient.prenom} - {typerdv.nom}"
-  if (patient.adresse is None) :
-    patient.adresse = "Adresse non renseignée"
-  elif (patient.ville is None) :
-    patient.ville = "Ville non renseignée"
-  elif (patient.adresse == "") :
-    patient.adresse = "Adresse non renseignée"
-  elif (patient.ville == "") :
-    patient.ville = "Ville non renseignée"
+  # le patient est partagé (Patient.identites) : les valeurs par défaut restent locales
+  adresse = patient.adresse
+  ville = patient.ville
+  if (adresse is None) :
+    adresse = "Adresse non renseignée"
+  elif (ville is None) :
+    ville = "Ville non renseignée"
+  elif (adresse == "") :
+    adresse = "Adresse non renseignée"
+  elif (ville == "") :
+    ville = "Ville non renseignée"
   elif (typerdv.localisation is not None and typerdv.localisation != "Domicile") :
-    localisation = f"{patient.adresse}, {patient.ville}"
+    localisation = f"{adresse}, {ville}"
   elif (typerdv.localisation == "Cabinet") :
     localisation = cm.get_constante("CABINET_ADDRESS")
 
@@ -150,65 +154,145 @@ def create_event(rdv:RendezVous):
       'reminders': {
           'useDefault': True,
       },
+      'extendedProperties': {
+          'private': {PROPRIETE_RDV_ID: str(rdv.id)},
+      },
   }
   return event
 
+def _fuseau(dt):
+  """Rend une date naïve consciente de son fuseau (Europe/Paris, comme dans create_event)."""
+  if dt.tzinfo is not None:
+    return dt
+  try:
+    from zoneinfo import ZoneInfo
+    tz = ZoneInfo("Europe/Paris")
+  except Exception:
+    tz = timezone.utc
+  return dt.replace(tzinfo=tz)
+
+def rdv_id_evenement(event):
+  """
+  Retrouve le rendez-vous CabiLib d'un événement Google.
+
+  Args:
+      event (dict): Evénement renvoyé par l'API.
+  Returns:
+      int | None: Identifiant du rendez-vous, ou None si l'événement ne vient pas de CabiLib.
+  """
+  rdv_id = event.get('extendedProperties', {}).get('private', {}).get(PROPRIETE_RDV_ID)
+  if rdv_id is None:
+    # événements créés avant la propriété privée : "id : <n>" dans la description
+    trouve = re.search(r"\bid : (\d+)\b", event.get('description') or '')
+    rdv_id = trouve.group(1) if trouve else None
+  return int(rdv_id) if rdv_id is not None and str(rdv_id).isdigit() else None
+
+def chercher_evenement(rdv:RendezVous):
+  """
+  Recherche l'événement d'un rendez-vous sans identifiant d'événement connu,
+  parmi les événements autour de sa date (rendez-vous synchronisés avant google_event_id).
+
+  Args:
+      rdv (RendezVous): Le rendez-vous tel qu'il est dans l'agenda (date et type).
+  Returns:
+      dict | None: L'événement trouvé, ou None.
+  """
+  start_dt = _fuseau(rdv.date - timedelta(minutes=1))
+  end_dt = _fuseau(rdv.date + TypeRDV.getTypeRDVById(rdv.type_id).duree + timedelta(minutes=1))
+  service = get_calendarV3_service()
+  eventlist = service.events().list(calendarId=str(CALENDAR_ID), timeMin=start_dt.isoformat(), timeMax=end_dt.isoformat()).execute()
+  for e in eventlist.get('items', []):
+    if rdv_id_evenement(e) == rdv.id:
+      return e
+  return None
+
 def modify_rdv (oldRDV:RendezVous,newRDV:RendezVous) : 
   """
-  Modification d'un rendez-vous déjà dans l'agenda
+  Modification d'un rendez-vous déjà dans l'agenda.
+  L'événement est mis à jour directement par son identifiant (google_event_id) ;
+  sans identifiant connu, il est d'abord recherché autour de l'ancienne date.
 
   Args:
-      rdv (RendezVous): L'objet RendezVous à modifier dans le calendrier.
-  """
-  # Ensure datetimes are timezone-aware (RFC3339). If naive, assume Europe/Paris.
-  start_dt = oldRDV.date - timedelta(minutes=1)
-  end_dt = oldRDV.date + TypeRDV.getTypeRDVById(oldRDV.type_id).duree + timedelta(minutes=1)
-  if start_dt.tzinfo is None:
-    # assume Europe/Paris as used elsewhere in create_event
-    try:
-      from zoneinfo import ZoneInfo
-      tz = ZoneInfo("Europe/Paris")
-    except Exception:
-      tz = timezone.utc
-    start_dt = start_dt.replace(tzinfo=tz)
-  if end_dt.tzinfo is None:
-    try:
-      from zoneinfo import ZoneInfo
-      tz = ZoneInfo("Europe/Paris")
-    except Exception:
-      tz = timezone.utc
-    end_dt = end_dt.replace(tzinfo=tz)
-
-  old_start_date = start_dt.isoformat()
-  old_end_date = end_dt.isoformat()
+      oldRDV (RendezVous): Le rendez-vous tel qu'il est dans l'agenda.
+      newRDV (RendezVous): Le rendez-vous à jour.
+  Returns:
+      dict | None: L'événement mis à jour, ou None en cas d'échec.
+  """
   service = get_calendarV3_service()
   event = create_event(newRDV)
   global CALENDAR_ID
   if CALENDAR_ID is None :
     create_calendar_if_not_exist()
   try : 
-    print("--------------------[DEBUG]--------------------")
-    print(CALENDAR_ID)
-    print("old_start_date:", old_start_date)
-    print("old_end_date:", old_end_date)
-    print("-----------------------------------------------")
-    eventlist = service.events().list(calendarId=str(CALENDAR_ID), timeMin=old_start_date, timeMax=old_end_date).execute()
-    print("NOMBRE d'éléments : ",len(eventlist.get('items', [])))
-    for e in eventlist.get('items', []):
-      print("EVENT : ",e)
-      print("DESCRIPTION RDV calendar :",e.get('description', ''))
-      print("DESCRIPTION RDV local   :",event["description"])
-      if event["description"] in e.get('description', ''):
-        event["description"] = e.get('description', '')
-        print("too good avant update")
-        event = service.events().update(calendarId=CALENDAR_ID, eventId=e['id'], body=event).execute()
-        print('après update')
-        return event
-    
+    event_id = newRDV.google_event_id or oldRDV.google_event_id
+    if event_id is None:
+      ancien = chercher_evenement(oldRDV)
+      if ancien is None:
+        return None
+      event_id = ancien['id']
+    return service.events().update(calendarId=CALENDAR_ID, eventId=event_id, body=event).execute()
   except Exception as e:
-    print(f"An error occurred while inserting the event: {e}")
+    print(f"An error occurred while updating the event: {e}")
     return None
-  return None
+
+def delete_rdv (rdv:RendezVous) :
+  """
+  Supprime l'événement d'un rendez-vous de l'agenda.
+
+  Args:
+      rdv (RendezVous): Le rendez-vous supprimé, tel qu'il était dans l'agenda.
+  Returns:
+      bool: True si l'événement est supprimé (ou n'existait plus), False en cas d'échec.
+  """
+  service = get_calendarV3_service()
+  global CALENDAR_ID
+  if CALENDAR_ID is None :
+    create_calendar_if_not_exist()
+  try :
+    event_id = rdv.google_event_id
+    if event_id is None:
+      ancien = chercher_evenement(rdv)
+      if ancien is None:
+        return True
+      event_id = ancien['id']
+    service.events().delete(calendarId=CALENDAR_ID, eventId=event_id).execute()
+  except Exception as e:
+    if convertir_erreur(e).absent:
+      # déjà supprimé dans l'agenda
+      return True
+    print(f"An error occurred while deleting the event: {e}")
+    return False
+  return True
+
+def rattacher_evenements():
+  """
+  Rattrapage unique : enregistre le google_event_id des rendez-vous synchronisés
+  avant son introduction, en parcourant une fois les événements de l'agenda.
+
+  Returns:
+      int: Nombre de rendez-vous rattachés à leur événement.
+  """
+  service = get_calendarV3_service()
+  global CALENDAR_ID
+  if CALENDAR_ID is None :
+    create_calendar_if_not_exist()
+  associations = []
+  page_token = None
+  while True:
+    page = service.events().list(
+        calendarId=str(CALENDAR_ID),
+        pageToken=page_token,
+        maxResults=2500,
+        fields="items(id,description,extendedProperties),nextPageToken",
+    ).execute()
+    for e in page.get('items', []):
+      rdv_id = rdv_id_evenement(e)
+      if rdv_id is not None:
+        associations.append((e['id'], rdv_id))
+    page_token = page.get('nextPageToken')
+    if not page_token:
+      break
+  return RendezVous.updateGoogleEventIds(associations, seulement_manquants=True)
 
 def insert_rdv (rdv:RendezVous) : 
   """
@@ -237,13 +321,19 @@ def main():
       datetime.now() - timedelta(days=1),
       datetime.now() + timedelta(days=20)
   )
-  rdvs = RendezVous.getAllRendezVous()
+  # rendez-vous jamais synchronisés, envoyés par requêtes groupées
+  rdvs = [rdv for rdv in RendezVous.getAllRendezVous() if rdv.google_event_id is None]
+  operations = []
   for rdv in rdvs:
     try :
-      insert_rdv(rdv)
+      operations.append(OperationCalendrier(INSERTION, rdv.id, create_event(rdv)))
     except Exception as e :
       print(f"[ERREUR] {e}")
-      continue
+  resultats = executer_par_lots(operations, get_calendarV3_service(), CALENDAR_ID)
+  RendezVous.updateGoogleEventIds([(r.evenement['id'], r.operation.rdv_id) for r in resultats if r.reussi])
+  for r in resultats:
+    if not r.reussi:
+      print(f"[ERREUR] {r}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,248 @@
+import json
+import time
+from typing import Any, Iterable
+
+# Nombre maximum de requêtes par requête groupée (limite de l'API Google Agenda)
+TAILLE_MAX_LOT = 50
+# Essais d'une opération en échec temporaire (le premier envoi compris)
+ESSAIS = 3
+# Attente avant le deuxième essai, doublée ensuite (secondes)
+ATTENTE_INITIALE = 1.0
+
+INSERTION = "insert"
+MODIFICATION = "update"
+SUPPRESSION = "delete"
+
+# Raisons d'un refus 403 qui ne sont que des limites de débit
+RAISONS_QUOTA = ("rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded")
+
+
+class ErreurCalendrier(Exception):
+    """Echec d'une requête Google Agenda, classé pour décider de la suite."""
+    statut: int | None
+    raison: str
+    reessayable: bool
+    absent: bool
+
+    def __init__(self, message: str, statut: int | None = None, raison: str = "", reessayable: bool = False, absent: bool = False) -> None:
+        """
+        Initialise l'erreur.
+
+        Args:
+            message (str): Description de l'erreur.
+            statut (int | None, optionnel): Code HTTP, None pour une erreur réseau.
+            raison (str, optionnel): Raison renvoyée par l'API (ex : "rateLimitExceeded").
+            reessayable (bool, optionnel): Un nouvel essai peut réussir (réseau, quota, erreur serveur).
+            absent (bool, optionnel): L'événement n'existe pas ou plus (404, 410).
+        """
+        super().__init__(message)
+        self.statut = statut
+        self.raison = raison
+        self.reessayable = reessayable
+        self.absent = absent
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle de l'erreur.
+
+        Returns:
+            str: Représentation lisible de l'erreur.
+        """
+        return f"ErreurCalendrier({self.statut}, {self.raison or '-'}, réessayable: {self.reessayable}, absent: {self.absent})"
+
+
+def convertir_erreur(erreur: Exception) -> ErreurCalendrier:
+    """
+    Classe une exception levée par l'API (ou par le transport).
+
+    Args:
+        erreur (Exception): Exception reçue pour une requête.
+
+    Returns:
+        ErreurCalendrier: L'erreur classée.
+    """
+    if isinstance(erreur, ErreurCalendrier):
+        return erreur
+    statut = getattr(getattr(erreur, "resp", None), "status", None)
+    if statut is None:
+        # pas de réponse HTTP : coupure réseau, délai dépassé...
+        return ErreurCalendrier(str(erreur), reessayable=True)
+    statut = int(statut)
+    raison = _raison(erreur)
+    if statut in (404, 410):
+        return ErreurCalendrier(str(erreur), statut, raison, absent=True)
+    if statut == 429 or statut >= 500 or (statut == 403 and raison in RAISONS_QUOTA):
+        return ErreurCalendrier(str(erreur), statut, raison, reessayable=True)
+    return ErreurCalendrier(str(erreur), statut, raison)
+
+
+def _raison(erreur: Exception) -> str:
+    """Raison de l'erreur dans le corps JSON d'une HttpError ("" si absente)."""
+    contenu = getattr(erreur, "content", b"") or b""
+    try:
+        detail = json.loads(contenu.decode() if isinstance(contenu, bytes) else contenu)
+        return detail["error"]["errors"][0]["reason"]
+    except Exception:
+        return ""
+
+
+class OperationCalendrier:
+    """Requête Google Agenda à envoyer dans une requête groupée."""
+    type: str
+    rdv_id: int
+    corps: dict | None
+    event_id: str | None
+
+    def __init__(self, type: str, rdv_id: int, corps: dict | None = None, event_id: str | None = None) -> None:
+        """
+        Initialise une opération.
+
+        Args:
+            type (str): INSERTION, MODIFICATION ou SUPPRESSION.
+            rdv_id (int): Identifiant du rendez-vous concerné.
+            corps (dict | None, optionnel): Evénement à envoyer (insertion, modification).
+            event_id (str | None, optionnel): Evénement visé (modification, suppression).
+        """
+        self.type = type
+        self.rdv_id = rdv_id
+        self.corps = corps
+        self.event_id = event_id
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle de l'opération.
+
+        Returns:
+            str: Représentation lisible de l'opération.
+        """
+        return f"OperationCalendrier({self.type}, RDV: {self.rdv_id}, Evénement: {self.event_id})"
+
+    def requete(self, service: Any, calendar_id: str) -> Any:
+        """
+        Construit la requête de l'API (non exécutée).
+
+        Args:
+            service (Any): Service Calendar v3.
+            calendar_id (str): Agenda visé.
+
+        Returns:
+            Any: Requête à ajouter à une requête groupée.
+        """
+        evenements = service.events()
+        if self.type == INSERTION:
+            return evenements.insert(calendarId=calendar_id, body=self.corps)
+        if self.type == MODIFICATION:
+            return evenements.update(calendarId=calendar_id, eventId=self.event_id, body=self.corps)
+        return evenements.delete(calendarId=calendar_id, eventId=self.event_id)
+
+
+class ResultatOperation:
+    """Issue d'une opération : l'événement renvoyé par l'API, ou l'erreur classée."""
+    operation: OperationCalendrier
+    evenement: dict | None
+    erreur: ErreurCalendrier | None
+    essais: int
+
+    def __init__(self, operation: OperationCalendrier, evenement: dict | None = None, erreur: ErreurCalendrier | None = None, essais: int = 1) -> None:
+        """
+        Initialise le résultat.
+
+        Args:
+            operation (OperationCalendrier): Opération envoyée.
+            evenement (dict | None, optionnel): Réponse de l'API en cas de succès.
+            erreur (ErreurCalendrier | None, optionnel): Erreur du dernier essai.
+            essais (int, optionnel): Nombre d'envois effectués.
+        """
+        self.operation = operation
+        self.evenement = evenement
+        self.erreur = erreur
+        self.essais = essais
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle du résultat.
+
+        Returns:
+            str: Représentation lisible du résultat.
+        """
+        return f"ResultatOperation({self.operation!r}, réussi: {self.reussi}, erreur: {self.erreur!r})"
+
+    @property
+    def reussi(self) -> bool:
+        """Succès de l'opération (une suppression d'un événement déjà absent compte comme un succès)."""
+        return self.erreur is None or (self.operation.type == SUPPRESSION and self.erreur.absent)
+
+
+def _envoyer_lot(service: Any, calendar_id: str, lot: list[OperationCalendrier]) -> dict[int, tuple[dict | None, ErreurCalendrier | None]]:
+    """
+    Envoie une requête groupée et collecte la réponse de chaque opération.
+
+    Args:
+        service (Any): Service Calendar v3.
+        calendar_id (str): Agenda visé.
+        lot (list[OperationCalendrier]): Au plus TAILLE_MAX_LOT opérations.
+
+    Returns:
+        dict[int, tuple[dict | None, ErreurCalendrier | None]]: (réponse, erreur) par position dans le lot.
+    """
+    reponses: dict[int, tuple[dict | None, ErreurCalendrier | None]] = {}
+
+    def recevoir(request_id: str, reponse: Any, exception: Exception | None) -> None:
+        reponses[int(request_id)] = (None, convertir_erreur(exception)) if exception is not None else (reponse or {}, None)
+
+    groupe = service.new_batch_http_request(callback=recevoir)
+    for position, operation in enumerate(lot):
+        groupe.add(operation.requete(service, calendar_id), request_id=str(position))
+    try:
+        groupe.execute()
+    except Exception as e:
+        # la requête groupée elle-même a échoué : aucune opération n'a de réponse
+        erreur = convertir_erreur(e)
+        for position in range(len(lot)):
+            reponses.setdefault(position, (None, erreur))
+    for position in range(len(lot)):
+        reponses.setdefault(position, (None, ErreurCalendrier("pas de réponse dans la requête groupée", reessayable=True)))
+    return reponses
+
+
+def executer_par_lots(operations: Iterable[OperationCalendrier], service: Any, calendar_id: str, essais: int = ESSAIS, attente: float = ATTENTE_INITIALE) -> list[ResultatOperation]:
+    """
+    Envoie des opérations Google Agenda par requêtes groupées de TAILLE_MAX_LOT.
+
+    Chaque opération a sa propre réponse : seules celles en échec temporaire
+    (réseau, quota, erreur serveur) sont renvoyées, regroupées à nouveau, après
+    une attente croissante. Le service peut être un faux service local (tests, mesures).
+
+    Exemple:
+        resultats = executer_par_lots([OperationCalendrier(INSERTION, rdv.id, create_event(rdv)) for rdv in rdvs], service, CALENDAR_ID)
+
+    Args:
+        operations (Iterable[OperationCalendrier]): Opérations à envoyer.
+        service (Any): Service Calendar v3 (new_batch_http_request, events).
+        calendar_id (str): Agenda visé.
+        essais (int, optionnel): Nombre maximum d'envois d'une opération. Défaut: ESSAIS.
+        attente (float, optionnel): Attente avant le deuxième envoi, doublée ensuite (secondes). Défaut: ATTENTE_INITIALE.
+
+    Returns:
+        list[ResultatOperation]: Un résultat par opération, dans l'ordre des opérations.
+    """
+    operations = list(operations)
+    resultats: list[ResultatOperation | None] = [None] * len(operations)
+    a_envoyer = list(range(len(operations)))
+    for essai in range(1, essais + 1):
+        if essai > 1:
+            time.sleep(attente * 2 ** (essai - 2))
+        echecs = []
+        for debut in range(0, len(a_envoyer), TAILLE_MAX_LOT):
+            positions = a_envoyer[debut:debut + TAILLE_MAX_LOT]
+            reponses = _envoyer_lot(service, calendar_id, [operations[position] for position in positions])
+            for rang, position in enumerate(positions):
+                evenement, erreur = reponses[rang]
+                resultat = ResultatOperation(operations[position], evenement, erreur, essai)
+                resultats[position] = resultat
+                if not resultat.reussi and erreur.reessayable:
+                    echecs.append(position)
+        if not echecs:
+            break
+        a_envoyer = echecs
+    return resultats
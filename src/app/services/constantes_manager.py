@@ -1,25 +1,117 @@
+import copy
 import json
 import os
+import tempfile
+import threading
+import time as horloge
+from datetime import time
 
 CONST_PATH = os.path.join(os.environ['APPDATA'], 'CabiLib', 'Constantes.json').replace('\\', '/')
 
+# Délai (secondes) entre deux vérifications de la date de modification du fichier
+DELAI_VERIFICATION = 1.0
+
+# Cache du fichier : chargé une fois, rechargé si le fichier est modifié par ailleurs
+_CACHE = None
+_CACHE_MTIME = None
+_DERNIERE_VERIFICATION = 0.0
+_VERROU = threading.RLock()
+
+
+def _mtime():
+    """Retourne la date de modification du fichier (ns), ou None s'il n'existe pas."""
+    try:
+        return os.stat(CONST_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _constantes():
+    """Retourne le dictionnaire en cache, en le (re)chargeant si le fichier a changé.
+
+    La date de modification n'est vérifiée qu'une fois par DELAI_VERIFICATION :
+    les lectures répétées (facturation de masse, construction du planning) ne touchent pas au disque.
+    """
+    global _CACHE, _CACHE_MTIME, _DERNIERE_VERIFICATION
+    with _VERROU:
+        maintenant = horloge.monotonic()
+        if _CACHE is not None and maintenant - _DERNIERE_VERIFICATION < DELAI_VERIFICATION:
+            return _CACHE
+        _DERNIERE_VERIFICATION = maintenant
+        mtime = _mtime()
+        if _CACHE is None or mtime != _CACHE_MTIME:
+            with open(CONST_PATH, encoding='utf-8') as f:
+                _CACHE = json.load(f)
+            _CACHE_MTIME = mtime
+        return _CACHE
+
+def invalider():
+    """Oublie le cache : la prochaine lecture relit le fichier."""
+    global _CACHE, _CACHE_MTIME
+    with _VERROU:
+        _CACHE = None
+        _CACHE_MTIME = None
+
 def load_constantes():
-    """Charge toutes les constantes depuis le fichier JSON."""
-    with open(CONST_PATH, encoding='utf-8') as f:
-        return json.load(f)
+    """Charge toutes les constantes (copie du cache, modifiable sans effet de bord)."""
+    return copy.deepcopy(_constantes())
 
 def save_constantes(data):
-    """Écrit toutes les constantes dans le fichier JSON."""
-    with open(CONST_PATH, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """Écrit toutes les constantes dans le fichier JSON.
+
+    L'écriture passe par un fichier temporaire renommé à la fin : en cas d'arrêt
+    brutal, le fichier contient soit l'ancienne soit la nouvelle version, jamais un JSON tronqué.
+    """
+    global _CACHE, _CACHE_MTIME, _DERNIERE_VERIFICATION
+    dossier = os.path.dirname(CONST_PATH)
+    with _VERROU:
+        fd, chemin_temp = tempfile.mkstemp(dir=dossier, prefix='.Constantes-', suffix='.json.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(chemin_temp, CONST_PATH)
+        except BaseException:
+            if os.path.exists(chemin_temp):
+                os.remove(chemin_temp)
+            raise
+        _CACHE = copy.deepcopy(data)
+        _CACHE_MTIME = _mtime()
+        _DERNIERE_VERIFICATION = horloge.monotonic()
+
+def get_constante(key, defaut=None):
+    """Récupère une constante par sa clé (None ou `defaut` si elle est absente)."""
+    valeur = _constantes().get(key, defaut)
+    # les listes et dictionnaires sont copiés pour que l'appelant ne modifie pas le cache
+    if isinstance(valeur, (list, dict)):
+        return copy.deepcopy(valeur)
+    return valeur
+
+def get_entier(key, defaut=0):
+    """Récupère une constante numérique entière (`defaut` si absente ou invalide)."""
+    try:
+        return int(get_constante(key, defaut))
+    except (TypeError, ValueError):
+        return defaut
+
+def get_texte(key, defaut=""):
+    """Récupère une constante texte (`defaut` si absente ou vide)."""
+    valeur = get_constante(key)
+    return str(valeur) if valeur not in (None, "") else defaut
+
+def get_liste(key):
+    """Récupère une constante liste (liste vide si absente)."""
+    valeur = get_constante(key)
+    return valeur if isinstance(valeur, list) else []
 
-def get_constante(key):
-    """Récupère une constante par sa clé."""
-    data = load_constantes()
-    return data.get(key)
+def get_heure(key, defaut="08:00"):
+    """Récupère une heure au format "H:MM" sous forme d'objet time."""
+    heures, minutes = map(int, get_texte(key, defaut).split(":"))
+    return time(heures, minutes)
 
 def set_constante(key, value):
     """Modifie une constante et sauvegarde le fichier."""
-    data = load_constantes()
-    data[key] = value
-    save_constantes(data)
+    with _VERROU:
+        data = load_constantes()
+        data[key] = value
+        save_constantes(data)
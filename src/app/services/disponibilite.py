@@ -0,0 +1,278 @@
+"""
+Moteur de disponibilité des créneaux.
+
+Les rendez-vous d'une plage sont chargés en une seule requête (index sur la date)
+dans un index trié par heure de début. Comme aucun rendez-vous ne dure plus que
+le plus long type de rendez-vous, les rendez-vous qui chevauchent [debut, fin[
+ont forcément leur début dans [debut - duree_max, fin[ : une recherche
+dichotomique borne la zone à examiner, ce qui donne un coût en O(log n + k)
+au lieu d'un parcours de toute la table.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta
+from typing import TYPE_CHECKING
+
+from app.database.connexion import session
+from app.services import constantes_manager
+
+if TYPE_CHECKING:
+    from app.model.rendezVous import RendezVous
+
+
+class Intervalle:
+    """Occupation d'un rendez-vous existant dans le planning."""
+    __slots__ = ("debut", "fin", "rdv_id", "type_id", "estgroupe")
+
+    def __init__(self, debut: datetime, fin: datetime, rdv_id: int, type_id: int, estgroupe: bool) -> None:
+        """
+        Args:
+            debut (datetime): Début du rendez-vous.
+            fin (datetime): Fin du rendez-vous (exclue).
+            rdv_id (int): Identifiant du rendez-vous.
+            type_id (int): Identifiant du type de rendez-vous.
+            estgroupe (bool): Indique si le type est une séance de groupe.
+        """
+        self.debut = debut
+        self.fin = fin
+        self.rdv_id = rdv_id
+        self.type_id = type_id
+        self.estgroupe = estgroupe
+
+    def __lt__(self, other: 'Intervalle') -> bool:
+        """Ordre de tri de l'index : par début puis par identifiant."""
+        return (self.debut, self.rdv_id) < (other.debut, other.rdv_id)
+
+    def __repr__(self) -> str:
+        """Retourne une représentation textuelle de l'occupation."""
+        return f"Intervalle(RDV {self.rdv_id}, {self.debut} - {self.fin}, Type ID: {self.type_id})"
+
+
+class IndexCreneaux:
+    """Index trié des rendez-vous d'une plage, interrogeable en temps logarithmique."""
+
+    def __init__(self, intervalles: list[Intervalle], types: dict[int, tuple[timedelta, bool]]) -> None:
+        """
+        Args:
+            intervalles (list[Intervalle]): Rendez-vous existants.
+            types (dict[int, tuple[timedelta, bool]]): Durée et caractère groupé de chaque type de rendez-vous.
+        """
+        self.types = types
+        self.intervalles: list[Intervalle] = sorted(intervalles)
+        self.debuts: list[datetime] = [i.debut for i in self.intervalles]
+        self.duree_max: timedelta = max((duree for duree, _ in types.values()), default=timedelta(0))
+
+    @staticmethod
+    def charger_types() -> dict[int, tuple[timedelta, bool]]:
+        """
+        Charge la durée et le caractère groupé de tous les types de rendez-vous.
+
+        Returns:
+            dict[int, tuple[timedelta, bool]]: (durée, estgroupe) par identifiant de type.
+        """
+        with session() as connexion:
+            rows = connexion.execute("SELECT id, duree, estgroupe FROM type_rdv").fetchall()
+        return {row[0]: (timedelta(minutes=int(row[1] or 0)), bool(row[2])) for row in rows}
+
+    @staticmethod
+    def charger(date_debut: datetime, date_fin: datetime, types: dict[int, tuple[timedelta, bool]] | None = None) -> 'IndexCreneaux':
+        """
+        Construit l'index de tous les rendez-vous pouvant occuper la plage [date_debut, date_fin[.
+
+        Args:
+            date_debut (datetime): Début de la plage.
+            date_fin (datetime): Fin de la plage.
+            types (dict[int, tuple[timedelta, bool]] | None, optionnel): Types déjà chargés, sinon lus en base.
+
+        Returns:
+            IndexCreneaux: Index prêt à être interrogé.
+        """
+        if types is None:
+            types = IndexCreneaux.charger_types()
+        duree_max = max((duree for duree, _ in types.values()), default=timedelta(0))
+        with session() as connexion:
+            rows = connexion.execute(
+                'SELECT id, date AS "date [horodatage]", type_id FROM rendez_vous WHERE date >= ? AND date < ?',
+                (date_debut - duree_max, date_fin)
+            ).fetchall()
+        intervalles = []
+        for rdv_id, date, type_id in rows:
+            if type_id not in types:
+                # rendez-vous sans type connu : ignoré comme dans l'ancienne jointure SQL
+                continue
+            duree, estgroupe = types[type_id]
+            intervalles.append(Intervalle(date, date + duree, rdv_id, type_id, estgroupe))
+        return IndexCreneaux(intervalles, types)
+
+    def ajouter(self, intervalle: Intervalle) -> None:
+        """
+        Ajoute un rendez-vous à l'index (ex : après création d'un rendez-vous ou d'une série).
+
+        Args:
+            intervalle (Intervalle): Occupation à ajouter.
+        """
+        position = bisect_right(self.intervalles, intervalle)
+        self.intervalles.insert(position, intervalle)
+        self.debuts.insert(position, intervalle.debut)
+        if intervalle.fin - intervalle.debut > self.duree_max:
+            self.duree_max = intervalle.fin - intervalle.debut
+
+    def retirer(self, rdv_id: int) -> None:
+        """
+        Retire un rendez-vous de l'index.
+
+        Args:
+            rdv_id (int): Identifiant du rendez-vous à retirer.
+        """
+        for position, intervalle in enumerate(self.intervalles):
+            if intervalle.rdv_id == rdv_id:
+                del self.intervalles[position]
+                del self.debuts[position]
+                return
+
+    def chevauchements(self, debut: datetime, fin: datetime, exclure_id: int | None = None) -> list[Intervalle]:
+        """
+        Retourne les rendez-vous qui chevauchent [debut, fin[.
+
+        Args:
+            debut (datetime): Début du créneau.
+            fin (datetime): Fin du créneau (exclue).
+            exclure_id (int | None, optionnel): Rendez-vous à ignorer (cas d'une modification).
+
+        Returns:
+            list[Intervalle]: Rendez-vous en conflit, triés par début.
+        """
+        gauche = bisect_left(self.debuts, debut - self.duree_max)
+        droite = bisect_left(self.debuts, fin)
+        return [i for i in self.intervalles[gauche:droite]
+                if i.fin > debut and i.rdv_id != exclure_id]
+
+    def est_libre(self, debut: datetime, type_id: int, exclure_id: int | None = None) -> bool:
+        """
+        Indique si un rendez-vous du type donné peut être placé à `debut`.
+
+        Un créneau est libre s'il ne chevauche aucun rendez-vous, ou, pour une
+        séance de groupe, si tous les rendez-vous qui le chevauchent sont du même type.
+
+        Args:
+            debut (datetime): Début du rendez-vous.
+            type_id (int): Identifiant du type de rendez-vous.
+            exclure_id (int | None, optionnel): Rendez-vous à ignorer (cas d'une modification).
+
+        Returns:
+            bool: True si le créneau est libre, False sinon.
+        """
+        duree, estgroupe = self.types[type_id]
+        conflits = self.chevauchements(debut, debut + duree, exclure_id)
+        if estgroupe:
+            return all(conflit.type_id == type_id for conflit in conflits)
+        return not conflits
+
+    def prochains_creneaux_libres(self, type_id: int, nombre: int, date_debut: datetime, date_fin: datetime,
+                                  heure_ouverture: time, heure_fermeture: time, pas: timedelta) -> list[datetime]:
+        """
+        Recherche les `nombre` premiers créneaux libres pour un type de rendez-vous.
+
+        Les créneaux candidats sont alignés sur `pas` à partir de l'heure d'ouverture,
+        du lundi au samedi, et le rendez-vous doit se terminer avant la fermeture.
+        Le parcours avance dans l'ordre chronologique : en cas de conflit, il saute
+        directement après la fin du rendez-vous qui bloque au lieu de tester chaque pas.
+
+        Args:
+            type_id (int): Identifiant du type de rendez-vous à placer.
+            nombre (int): Nombre maximum de créneaux à retourner.
+            date_debut (datetime): Aucun créneau ne commence avant cette date.
+            date_fin (datetime): Aucun créneau ne commence après cette date.
+            heure_ouverture (time): Heure d'ouverture du cabinet.
+            heure_fermeture (time): Heure de fermeture du cabinet.
+            pas (timedelta): Granularité des créneaux (ex : 15 minutes).
+
+        Returns:
+            list[datetime]: Débuts des créneaux libres, par ordre chronologique.
+        """
+        duree, estgroupe = self.types[type_id]
+        resultats: list[datetime] = []
+        jour = date_debut.date()
+        while len(resultats) < nombre and jour <= date_fin.date():
+            if jour.weekday() == 6:  # pas de rendez-vous le dimanche
+                jour += timedelta(days=1)
+                continue
+            ouverture = datetime.combine(jour, heure_ouverture)
+            dernier_debut = min(datetime.combine(jour, heure_fermeture) - duree, date_fin)
+            candidat = ouverture
+            if candidat < date_debut:
+                # aligner sur le premier pas qui suit date_debut
+                candidat += -((ouverture - date_debut) // pas) * pas
+            while candidat <= dernier_debut and len(resultats) < nombre:
+                bloquants = [c for c in self.chevauchements(candidat, candidat + duree)
+                             if not (estgroupe and c.type_id == type_id)]
+                if not bloquants:
+                    resultats.append(candidat)
+                    candidat += pas
+                else:
+                    fin_blocage = max(c.fin for c in bloquants)
+                    candidat = ouverture - ((ouverture - fin_blocage) // pas) * pas
+            jour += timedelta(days=1)
+        return resultats
+
+
+def creneau_libre(rdv: 'RendezVous') -> bool:
+    """
+    Vérifie si le créneau d'un rendez-vous est libre.
+
+    Args:
+        rdv (RendezVous): Rendez-vous à vérifier (son id est exclu s'il existe déjà).
+
+    Returns:
+        bool: True si le créneau est libre, False sinon.
+    """
+    return creneaux_libres([rdv])[0]
+
+
+def creneaux_libres(rdvs: list['RendezVous']) -> list[bool]:
+    """
+    Vérifie en une seule requête la disponibilité de plusieurs créneaux candidats.
+
+    Chaque candidat est comparé aux rendez-vous enregistrés, indépendamment des
+    autres candidats.
+
+    Args:
+        rdvs (list[RendezVous]): Rendez-vous candidats.
+
+    Returns:
+        list[bool]: Pour chaque candidat, True si son créneau est libre.
+    """
+    if not rdvs:
+        return []
+    types = IndexCreneaux.charger_types()
+    debut = min(rdv.date for rdv in rdvs)
+    fin = max(rdv.date + types[rdv.type_id][0] for rdv in rdvs)
+    index = IndexCreneaux.charger(debut, fin, types)
+    return [index.est_libre(rdv.date, rdv.type_id, rdv.id) for rdv in rdvs]
+
+
+def rechercher_creneaux_libres(type_id: int, nombre: int = 5, date_debut: datetime | None = None,
+                               horizon: timedelta = timedelta(days=183)) -> list[datetime]:
+    """
+    Retourne les prochains créneaux libres pour un type de rendez-vous, selon les
+    horaires du cabinet (HEURE_DEBUT, HEURE_FIN, DUREE_CRENNEAU).
+
+    Pour des recherches répétées (ex : à chaque frappe dans une boîte de dialogue),
+    charger une fois l'IndexCreneaux et appeler directement prochains_creneaux_libres.
+
+    Args:
+        type_id (int): Identifiant du type de rendez-vous à placer.
+        nombre (int, optionnel): Nombre de créneaux souhaités. Défaut: 5.
+        date_debut (datetime | None, optionnel): Début de la recherche. Défaut: maintenant.
+        horizon (timedelta, optionnel): Étendue de la recherche. Défaut: 6 mois.
+
+    Returns:
+        list[datetime]: Débuts des créneaux libres, par ordre chronologique.
+    """
+    if date_debut is None:
+        date_debut = datetime.now().replace(second=0, microsecond=0)
+    date_fin = date_debut + horizon
+    heure_ouverture = constantes_manager.get_heure("HEURE_DEBUT", "08:00")
+    heure_fermeture = constantes_manager.get_heure("HEURE_FIN", "20:00")
+    pas = timedelta(minutes=constantes_manager.get_entier("DUREE_CRENNEAU", 15) or 15)
+    index = IndexCreneaux.charger(date_debut, date_fin)
+    return index.prochains_creneaux_libres(type_id, nombre, date_debut, date_fin, heure_ouverture, heure_fermeture, pas)
@@ -0,0 +1,142 @@
+from datetime import datetime
+
+from app.database.connexion import session
+from app.model.facture import Facture
+from app.model.ligneFacture import LigneFacture
+from app.model.patient import Patient
+from app.model.rendezVous import RendezVous
+from app.model.typeRDV import TypeRDV
+
+# Statut des rendez-vous exclus de la facturation
+PRESENCES_NON_FACTUREES = ("Absent excusé", "Annulé")
+
+
+class BrouillonFacture:
+    """Facture calculée en mémoire, pas encore enregistrée en base."""
+    facture: Facture
+    lignes: list[LigneFacture]
+    rdvs_factures: list[int]
+    rdvs_non_factures: list[int]
+    rdvs_absents: list[RendezVous]
+    rdvs_a_renseigner: list[RendezVous]
+    annulation_factures: list[str]
+
+    def __init__(self, facture: Facture) -> None:
+        """
+        Initialise un brouillon vide.
+
+        Args:
+            facture (Facture): Facture en cours de préparation.
+        """
+        self.facture = facture
+        self.lignes = []
+        self.rdvs_factures = []
+        self.rdvs_non_factures = []
+        self.rdvs_absents = []
+        self.rdvs_a_renseigner = []
+        self.annulation_factures = []
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle du brouillon.
+
+        Returns:
+            str: Représentation lisible du brouillon.
+        """
+        return f"BrouillonFacture(ID: {self.facture.id}, {len(self.lignes)} ligne(s), {len(self.rdvs_absents)} absence(s), {len(self.rdvs_a_renseigner)} à renseigner)"
+
+    def ajouter_ligne(self, rdv_id: int, montant: float) -> None:
+        """
+        Ajoute une ligne au brouillon (une seule ligne par rendez-vous).
+
+        Args:
+            rdv_id (int): Identifiant du rendez-vous facturé.
+            montant (float): Montant facturé.
+        """
+        if rdv_id in self.rdvs_factures:
+            return
+        self.lignes.append(LigneFacture(self.facture.id, rdv_id, montant))
+        self.rdvs_factures.append(rdv_id)
+
+
+def preparer_facture(patient: Patient, start_date: datetime, end_date: datetime, types_rdv: dict[int, TypeRDV]) -> BrouillonFacture:
+    """
+    Calcule la facture d'un patient sur une période sans rien écrire en base.
+
+    - Rendez-vous présents : facturés au prix de leur type.
+    - Rendez-vous déjà facturés : leur facture est annulée et remplacée, ses lignes sont reprises.
+    - Rendez-vous absents : mis de côté, à facturer ou non via facturer_absences.
+    - Rendez-vous excusés ou annulés : marqués comme non facturables.
+    - Rendez-vous sans présence renseignée : listés dans rdvs_a_renseigner (la facture ne doit pas être émise).
+
+    Args:
+        patient (Patient): Le patient à facturer.
+        start_date (datetime): Début de la période de facturation.
+        end_date (datetime): Fin de la période de facturation.
+        types_rdv (dict[int, TypeRDV]): Types de rendez-vous indexés par identifiant (pour les prix).
+
+    Returns:
+        BrouillonFacture: La facture calculée.
+    """
+    date_emission = datetime.today().date()
+    facture = Facture(Facture.generate_numero_facture(date_emission), patient.id, date_emission)
+    brouillon = BrouillonFacture(facture)
+
+    for rdv in RendezVous.getRendezVousByPatientAndDateRange(patient.id, start_date, end_date):
+        # si le rendez-vous est déjà facturé, sa facture sera annulée et remplacée
+        if rdv.facture_id is not None and str(rdv.facture_id) != "-1":
+            if rdv.facture_id not in brouillon.annulation_factures:
+                brouillon.annulation_factures.append(rdv.facture_id)
+            continue
+
+        if rdv.presence == "Absent":
+            brouillon.rdvs_absents.append(rdv)
+        elif rdv.presence == "Présent":
+            brouillon.ajouter_ligne(rdv.id, types_rdv[rdv.type_id].prix)
+        elif rdv.presence == "A définir":
+            brouillon.rdvs_a_renseigner.append(rdv)
+        elif rdv.presence in PRESENCES_NON_FACTUREES:
+            brouillon.rdvs_non_factures.append(rdv.id)
+        else:
+            print("Statut de présence inconnu pour le rendez-vous ID :", rdv.id, "\t", rdv.presence)
+
+    # reprise des lignes des factures annulées
+    for ligne in LigneFacture.getAllLignesByFactureIds(brouillon.annulation_factures):
+        brouillon.ajouter_ligne(ligne.rdv_id, ligne.montant_facture)
+
+    return brouillon
+
+
+def facturer_absences(brouillon: BrouillonFacture, montant: float) -> None:
+    """
+    Ajoute au brouillon une ligne par rendez-vous absent.
+
+    Args:
+        brouillon (BrouillonFacture): La facture en préparation.
+        montant (float): Montant facturé par absence (0 pour garder la trace du choix de ne pas facturer).
+    """
+    for rdv in brouillon.rdvs_absents:
+        brouillon.ajouter_ligne(rdv.id, montant)
+
+
+def enregistrer_facture(brouillon: BrouillonFacture) -> None:
+    """
+    Enregistre le brouillon dans une seule transaction : la facture, ses lignes
+    et le rattachement des rendez-vous. En cas d'erreur rien n'est écrit.
+
+    Si le brouillon n'a aucune ligne, seuls les rendez-vous non facturables sont marqués.
+
+    Args:
+        brouillon (BrouillonFacture): La facture à enregistrer.
+    """
+    with session(ecriture=True):
+        if brouillon.lignes:
+            # le numéro est attribué dans la transaction pour rester unique
+            facture_id = Facture.addFacture(brouillon.facture)
+            brouillon.facture.id = facture_id
+            for ligne in brouillon.lignes:
+                ligne.facture_id = facture_id
+            LigneFacture.addLignesFacture(brouillon.lignes)
+            RendezVous.updateFactureIdRendezVous(brouillon.rdvs_factures, facture_id)
+        if brouillon.rdvs_non_factures:
+            RendezVous.updateFactureIdRendezVous(brouillon.rdvs_non_factures, "-1")
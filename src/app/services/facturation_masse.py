@@ -0,0 +1,189 @@
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable
+
+from app.database.connexion import fermer_connexion
+from app.model.facture import Facture
+from app.model.patient import Patient
+from app.services.facturation import BrouillonFacture, enregistrer_facture
+import app.services.facture_generator as fg
+import app.services.mail_sender as ms
+
+
+class BilanFacturation:
+    """Résumé d'une facturation de masse."""
+    factures: list[Facture]
+    sans_facture: list[Patient]
+    a_renseigner: list[Patient]
+    sans_pdf: list[Facture]
+    non_traites: list[Patient]
+    erreurs: list[tuple[Patient | None, str]]
+    annule: bool
+
+    def __init__(self) -> None:
+        """
+        Initialise un bilan vide.
+        """
+        self.factures = []
+        self.sans_facture = []
+        self.a_renseigner = []
+        self.sans_pdf = []
+        self.non_traites = []
+        self.erreurs = []
+        self.annule = False
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle du bilan.
+
+        Returns:
+            str: Représentation lisible du bilan.
+        """
+        return f"BilanFacturation({len(self.factures)} facture(s), {len(self.sans_facture)} sans facture, {len(self.a_renseigner)} à renseigner, {len(self.sans_pdf)} sans PDF, {len(self.non_traites)} non traité(s), {len(self.erreurs)} erreur(s), annulé: {self.annule})"
+
+
+class FacturationMasse:
+    """
+    Moteur de facturation de masse.
+
+    Les brouillons (calculés au préalable, absences confirmées) sont enregistrés
+    un par un par le seul thread qui exécute `executer` : il est l'unique écrivain
+    de la base. Le rendu PDF, coûteux, est réparti sur un ProcessPoolExecutor ;
+    les brouillons Gmail sont créés au fil des PDF terminés.
+    """
+
+    def __init__(self, brouillons: list[tuple[Patient, BrouillonFacture]], date_debut: datetime, date_fin: datetime, creer_brouillons_mail: bool = True, on_progression: Callable[[int, int, str], None] | None = None) -> None:
+        """
+        Initialise une facturation de masse.
+
+        Args:
+            brouillons (list[tuple[Patient, BrouillonFacture]]): Les factures à émettre, avec leur patient.
+            date_debut (datetime): Début de la période facturée.
+            date_fin (datetime): Fin de la période facturée.
+            creer_brouillons_mail (bool, optionnel): Créer un brouillon Gmail par facture. Défaut: True.
+            on_progression (Callable[[int, int, str], None] | None, optionnel): Appelé avec (traités, total, message) après chaque patient.
+        """
+        self.brouillons = brouillons
+        self.date_debut = date_debut
+        self.date_fin = date_fin
+        self.creer_brouillons_mail = creer_brouillons_mail
+        self.on_progression = on_progression
+        self._annulation = threading.Event()
+
+    def annuler(self) -> None:
+        """
+        Demande l'arrêt de la facturation. Les factures déjà enregistrées sont
+        conservées ; les rendus PDF non commencés sont abandonnés.
+        """
+        self._annulation.set()
+
+    def est_annule(self) -> bool:
+        """
+        Indique si l'arrêt a été demandé.
+
+        Returns:
+            bool: True si annuler() a été appelé.
+        """
+        return self._annulation.is_set()
+
+    def _progression(self, traites: int, message: str) -> None:
+        """
+        Transmet l'avancement à l'appelant.
+
+        Args:
+            traites (int): Nombre de patients traités.
+            message (str): Description de la dernière étape.
+        """
+        if self.on_progression is not None:
+            self.on_progression(traites, len(self.brouillons), message)
+
+    def _creer_brouillon_mail(self, patient: Patient, chemin_pdf: str) -> None:
+        """
+        Crée le brouillon Gmail accompagnant une facture.
+
+        Args:
+            patient (Patient): Le patient facturé.
+            chemin_pdf (str): Chemin du PDF à joindre.
+        """
+        ms.save_draft(None, 'me', {
+            'to': patient.email,
+            'subject': f'Votre facture du {self.date_debut.date()} au {self.date_fin.date()}',
+            'body': f'Bonjour {patient.prenom},\n\nVeuillez trouver ci-joint votre facture pour la période du {self.date_debut.date()} au {self.date_fin.date()}.\n\nCordialement,\nVotre Cabinet Médical',
+            'attachments': [chemin_pdf]
+        })
+
+    def executer(self) -> BilanFacturation:
+        """
+        Enregistre les factures, fait rendre les PDF en parallèle et crée les brouillons mail.
+        A appeler depuis un thread de travail : l'appel bloque jusqu'à la fin.
+
+        Returns:
+            BilanFacturation: Le résumé de la facturation.
+        """
+        bilan = BilanFacturation()
+        traites = 0
+        a_rendre = [(patient, brouillon) for patient, brouillon in self.brouillons if brouillon.lignes]
+        nb_processus = max(1, min(os.cpu_count() or 1, len(a_rendre)))
+        try:
+            for patient, brouillon in self.brouillons:
+                if not brouillon.lignes:
+                    # rien à facturer : seuls les rendez-vous non facturables sont marqués
+                    enregistrer_facture(brouillon)
+                    bilan.sans_facture.append(patient)
+                    traites += 1
+            if traites:
+                self._progression(traites, f"{traites} patient(s) sans rendez-vous à facturer")
+
+            with ProcessPoolExecutor(max_workers=nb_processus) as executor:
+                rendus: dict[Future, tuple[Patient, Facture]] = {}
+                for index, (patient, brouillon) in enumerate(a_rendre):
+                    if self.est_annule():
+                        # rien n'est écrit pour les patients restants
+                        bilan.non_traites.extend(patient for patient, _ in a_rendre[index:])
+                        break
+                    try:
+                        enregistrer_facture(brouillon)
+                        donnees = fg.preparer_donnees_facture(brouillon.facture, patient, brouillon.lignes, brouillon.annulation_factures, self.date_debut, self.date_fin)
+                    except Exception as e:
+                        print(f"[ERREUR] {e}")
+                        bilan.erreurs.append((patient, str(e)))
+                        traites += 1
+                        self._progression(traites, f"Erreur pour {patient.prenom} {patient.nom}")
+                        continue
+                    path, filename = fg.chemin_facture(brouillon.facture)
+                    rendus[executor.submit(fg.rendre_et_enregistrer, donnees, path, filename)] = (patient, brouillon.facture)
+
+                for future in as_completed(rendus):
+                    patient, facture = rendus[future]
+                    traites += 1
+                    if future.cancelled():
+                        bilan.sans_pdf.append(facture)
+                        continue
+                    if self.est_annule():
+                        # les rendus pas encore commencés sont abandonnés
+                        for autre in rendus:
+                            autre.cancel()
+                    try:
+                        chemin_pdf = future.result()
+                    except Exception as e:
+                        print(f"[ERREUR PDF] {e}")
+                        bilan.sans_pdf.append(facture)
+                        bilan.erreurs.append((patient, str(e)))
+                        self._progression(traites, f"Erreur PDF pour la facture {facture.id}")
+                        continue
+                    bilan.factures.append(facture)
+                    if self.creer_brouillons_mail and not self.est_annule():
+                        try:
+                            self._creer_brouillon_mail(patient, chemin_pdf)
+                        except Exception as e:
+                            print(f"[ERREUR MAIL] {e}")
+                            bilan.erreurs.append((patient, f"Brouillon mail non créé : {e}"))
+                    self._progression(traites, f"Facture {facture.id} générée pour {patient.prenom} {patient.nom}")
+        finally:
+            # le thread de travail ne garde pas sa connexion ouverte
+            fermer_connexion()
+
+        bilan.annule = self.est_annule()
+        return bilan
@@ -1,5 +1,4 @@
 from datetime import timedelta, datetime
-from weasyprint import HTML, CSS
 import os
 import sys
 import base64
@@ -21,7 +20,25 @@ def format_date_fr(date_obj):
     }
     return f"{date_obj.day} {mois[date_obj.month]} {date_obj.year}"
 
-def generate_facture_pdf(facture: Facture, patient: Patient, lignes: list[LigneFacture], annulation_factures: list[str], date_debut: datetime, date_fin: datetime) -> bytes:
+def preparer_donnees_facture(facture: Facture, patient: Patient, lignes: list[LigneFacture], annulation_factures: list[str], date_debut: datetime, date_fin: datetime) -> dict:
+    """
+    Rassemble tout ce qui est nécessaire au rendu d'une facture (constantes, logo,
+    lignes lues en base) sous forme de chaînes.
+
+    Le rendu qui suit ne lit plus ni la base ni les constantes : le dictionnaire
+    retourné peut être transmis à un autre processus pour générer le PDF.
+
+    Args:
+        facture (Facture): La facture à rendre.
+        patient (Patient): Le patient facturé.
+        lignes (list[LigneFacture]): Les lignes de la facture.
+        annulation_factures (list[str]): Les factures annulées et remplacées.
+        date_debut (datetime): Début de la période facturée.
+        date_fin (datetime): Fin de la période facturée.
+
+    Returns:
+        dict: Données du gabarit HTML.
+    """
     # --- 1. Chargement des constantes ---
     PRACTITIONER_NAME = constantes_manager.get_constante("PRACTITIONER_NAME") 
     PRACTITIONER_PHONE = constantes_manager.get_constante("PRACTITIONER_PHONE") 
@@ -98,6 +115,58 @@ def generate_facture_pdf(facture: Facture, patient: Patient, lignes: list[LigneF
         </tr>
         """
 
+    return {
+        "PRACTITIONER_NAME": PRACTITIONER_NAME,
+        "PRACTITIONER_PHONE": PRACTITIONER_PHONE,
+        "CABINET_ADDRESS": CABINET_ADDRESS,
+        "PRACTITIONER_EMAIL": PRACTITIONER_EMAIL,
+        "SIRET": SIRET,
+        "APE": APE,
+        "ADELI": ADELI,
+        "logo_img_tag": logo_img_tag,
+        "NOM_PAYEUR": NOM_PAYEUR,
+        "ADRESSE_PAYEUR": ADRESSE_PAYEUR,
+        "VILLE_PAYEUR": VILLE_PAYEUR,
+        "DATE_EMISSION_STR": DATE_EMISSION_STR,
+        "DATE_ECHEANCE": DATE_ECHEANCE,
+        "FACTURE_ID": facture.id,
+        "PATIENT_NOM_COMPLET": f"{patient.prenom} {patient.nom}",
+        "texte_periode": texte_periode,
+        "annulation_block": annulation_block,
+        "trs_html": trs_html,
+        "total_amount": total_amount,
+    }
+
+def generer_html_facture(donnees: dict) -> str:
+    """
+    Construit le HTML d'une facture à partir des données préparées.
+
+    Args:
+        donnees (dict): Données retournées par preparer_donnees_facture.
+
+    Returns:
+        str: Document HTML de la facture.
+    """
+    PRACTITIONER_NAME = donnees["PRACTITIONER_NAME"]
+    PRACTITIONER_PHONE = donnees["PRACTITIONER_PHONE"]
+    CABINET_ADDRESS = donnees["CABINET_ADDRESS"]
+    PRACTITIONER_EMAIL = donnees["PRACTITIONER_EMAIL"]
+    SIRET = donnees["SIRET"]
+    APE = donnees["APE"]
+    ADELI = donnees["ADELI"]
+    logo_img_tag = donnees["logo_img_tag"]
+    NOM_PAYEUR = donnees["NOM_PAYEUR"]
+    ADRESSE_PAYEUR = donnees["ADRESSE_PAYEUR"]
+    VILLE_PAYEUR = donnees["VILLE_PAYEUR"]
+    DATE_EMISSION_STR = donnees["DATE_EMISSION_STR"]
+    DATE_ECHEANCE = donnees["DATE_ECHEANCE"]
+    FACTURE_ID = donnees["FACTURE_ID"]
+    PATIENT_NOM_COMPLET = donnees["PATIENT_NOM_COMPLET"]
+    texte_periode = donnees["texte_periode"]
+    annulation_block = donnees["annulation_block"]
+    trs_html = donnees["trs_html"]
+    total_amount = donnees["total_amount"]
+
     # --- 5. Template HTML ---
     html_content = f"""
     <!DOCTYPE html>
@@ -283,7 +352,7 @@ def generate_facture_pdf(facture: Facture, patient: Patient, lignes: list[LigneF
             </div>
 
             <div class="right-column">
-                <div class="facture-title">FACTURE {facture.id}</div>
+                <div class="facture-title">FACTURE {FACTURE_ID}</div>
                 {annulation_block}
                 <div style="font-style: italic; font-size: 9pt; margin-top:5px;">A régler avant le {DATE_ECHEANCE}</div>
                 
@@ -304,7 +373,7 @@ def generate_facture_pdf(facture: Facture, patient: Patient, lignes: list[LigneF
                 </tr>
                 <tr>
                     <td>Patient :</td>
-                    <td style="font-weight: bold;">{patient.prenom} {patient.nom}</td>
+                    <td style="font-weight: bold;">{PATIENT_NOM_COMPLET}</td>
                 </tr>
             </table>
         </div>
@@ -339,8 +408,68 @@ def generate_facture_pdf(facture: Facture, patient: Patient, lignes: list[LigneF
     </html>
     """
 
-    pdf = HTML(string=html_content).write_pdf()
-    return pdf
+    return html_content
+
+def rendre_pdf(donnees: dict) -> bytes:
+    """
+    Rend une facture en PDF avec WeasyPrint.
+
+    Args:
+        donnees (dict): Données retournées par preparer_donnees_facture.
+
+    Returns:
+        bytes: Contenu du PDF.
+    """
+    # WeasyPrint (lourd à importer) n'est chargé qu'au premier rendu
+    from weasyprint import HTML
+
+    return HTML(string=generer_html_facture(donnees)).write_pdf()
+
+def rendre_et_enregistrer(donnees: dict, path: str, filename: str) -> str:
+    """
+    Rend une facture et l'écrit sur disque. Exécuté dans un processus de travail
+    lors de la facturation de masse : ne touche pas à la base de données.
+
+    Args:
+        donnees (dict): Données retournées par preparer_donnees_facture.
+        path (str): Dossier de destination.
+        filename (str): Nom du fichier PDF.
+
+    Returns:
+        str: Chemin du fichier écrit.
+    """
+    save_facture_pdf(rendre_pdf(donnees), path, filename)
+    return os.path.join(path, filename)
+
+def generate_facture_pdf(facture: Facture, patient: Patient, lignes: list[LigneFacture], annulation_factures: list[str], date_debut: datetime, date_fin: datetime) -> bytes:
+    """
+    Rend le PDF d'une facture à partir des objets du modèle (préparation des données puis rendu).
+
+    Args:
+        facture (Facture): La facture.
+        patient (Patient): Le patient facturé.
+        lignes (list[LigneFacture]): Les lignes de la facture.
+        annulation_factures (list[str]): Les numéros des factures annulées et remplacées.
+        date_debut (datetime): Début de la période facturée.
+        date_fin (datetime): Fin de la période facturée.
+
+    Returns:
+        bytes: Contenu du fichier PDF.
+    """
+    return rendre_pdf(preparer_donnees_facture(facture, patient, lignes, annulation_factures, date_debut, date_fin))
+
+def chemin_facture(facture: Facture) -> tuple[str, str]:
+    """
+    Retourne le dossier et le nom du fichier PDF d'une facture.
+
+    Args:
+        facture (Facture): La facture.
+
+    Returns:
+        tuple[str, str]: Dossier (un sous-dossier par mois d'émission) et nom du fichier.
+    """
+    basepath = constantes_manager.get_constante("FACTURES_DIR")
+    return os.path.join(basepath, facture.date_emission.strftime("%Y-%m")), f"{facture.id}.pdf"
 
 def save_facture_pdf(pdf_bytes: bytes, path:str ,filename: str) -> None:
     abs_dir = os.path.abspath(path)
@@ -352,8 +481,6 @@ def save_facture_pdf(pdf_bytes: bytes, path:str ,filename: str) -> None:
 
 def create_and_save (facture: Facture, patient: Patient, lignes: list[LigneFacture], annulation_factures: list[str], date_debut: datetime, date_fin: datetime) -> str:
     pdf = generate_facture_pdf(facture, patient, lignes, annulation_factures, date_debut, date_fin)
-    filename = f"{facture.id}.pdf"
-    basepath = constantes_manager.get_constante("FACTURES_DIR")
-    path = facture.date_emission.strftime("%Y-%m")
-    save_facture_pdf(pdf, os.path.join(basepath, path), filename)
-    return os.path.join(basepath, path, filename)
\ No newline at end of file
+    path, filename = chemin_facture(facture)
+    save_facture_pdf(pdf, path, filename)
+    return os.path.join(path, filename)
\ No newline at end of file
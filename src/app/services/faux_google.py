@@ -0,0 +1,574 @@
+import copy
+import itertools
+import json
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+try:
+    from zoneinfo import ZoneInfo
+except Exception:
+    ZoneInfo = None
+
+# Nombre maximum de requêtes par requête groupée (limite de l'API Google Agenda)
+TAILLE_MAX_LOT = 50
+# Nombre d'événements par page par défaut et au maximum (comme l'API)
+PAGE_DEFAUT = 250
+PAGE_MAX = 2500
+
+
+class ReglagesFaux:
+    """Comportement simulé des faux services : latence, échecs et quotas."""
+    latence: float
+    taux_echec: float
+    statut_echec: int
+    quota_par_minute: int | None
+    quota_total: int | None
+    graine: int
+
+    def __init__(self, latence: float = 0.0, taux_echec: float = 0.0, statut_echec: int = 503, quota_par_minute: int | None = None, quota_total: int | None = None, graine: int = 0) -> None:
+        """
+        Initialise les réglages.
+
+        Args:
+            latence (float, optionnel): Durée d'un aller-retour HTTP (secondes), une seule fois par requête groupée. Défaut: 0.
+            taux_echec (float, optionnel): Probabilité d'échec de chaque requête (0 à 1). Défaut: 0.
+            statut_echec (int, optionnel): Code HTTP des échecs simulés. Défaut: 503.
+            quota_par_minute (int | None, optionnel): Requêtes acceptées sur une minute glissante (403 rateLimitExceeded au-delà). Défaut: illimité.
+            quota_total (int | None, optionnel): Requêtes acceptées sur la vie du service (403 dailyLimitExceeded au-delà). Défaut: illimité.
+            graine (int, optionnel): Graine du tirage des échecs, pour des mesures reproductibles. Défaut: 0.
+        """
+        self.latence = latence
+        self.taux_echec = taux_echec
+        self.statut_echec = statut_echec
+        self.quota_par_minute = quota_par_minute
+        self.quota_total = quota_total
+        self.graine = graine
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle des réglages.
+
+        Returns:
+            str: Représentation lisible des réglages.
+        """
+        return f"ReglagesFaux(latence: {self.latence}s, échecs: {self.taux_echec:.0%} ({self.statut_echec}), quota/min: {self.quota_par_minute}, quota total: {self.quota_total}, graine: {self.graine})"
+
+    @staticmethod
+    def depuis_texte(texte: str) -> 'ReglagesFaux':
+        """
+        Lit des réglages écrits "nom=valeur" séparés par des virgules
+        (ex : "latence=0.2,taux_echec=0.05,quota_par_minute=600").
+
+        Args:
+            texte (str): Réglages ; une chaîne vide donne les réglages par défaut.
+
+        Returns:
+            ReglagesFaux: Les réglages lus.
+
+        Raises:
+            ValueError: Si un nom de réglage est inconnu.
+        """
+        types = {"latence": float, "taux_echec": float, "statut_echec": int, "quota_par_minute": int, "quota_total": int, "graine": int}
+        valeurs = {}
+        for element in filter(None, (morceau.strip() for morceau in texte.split(","))):
+            nom, _, valeur = element.partition("=")
+            nom = nom.strip()
+            if nom not in types:
+                raise ValueError(f"Réglage inconnu : {nom!r}")
+            valeurs[nom] = types[nom](valeur)
+        return ReglagesFaux(**valeurs)
+
+
+class _Reponse:
+    """Réponse HTTP minimale portée par FausseHttpError (comme HttpError.resp)."""
+
+    def __init__(self, status: int) -> None:
+        self.status = status
+
+
+class FausseHttpError(Exception):
+    """Erreur renvoyée par les faux services, avec le même accès au statut et à la raison que googleapiclient.errors.HttpError."""
+    resp: _Reponse
+    content: bytes
+
+    def __init__(self, statut: int, raison: str, message: str = "") -> None:
+        """
+        Initialise l'erreur.
+
+        Args:
+            statut (int): Code HTTP.
+            raison (str): Raison de l'API (ex : "rateLimitExceeded").
+            message (str, optionnel): Description de l'erreur.
+        """
+        super().__init__(f"HTTP {statut} {raison}{' : ' + message if message else ''}")
+        self.resp = _Reponse(statut)
+        self.content = json.dumps({"error": {"code": statut, "message": message or raison, "errors": [{"reason": raison, "message": message or raison}]}}).encode()
+
+
+class _Requete:
+    """Requête préparée : rien n'est fait avant execute(), comme avec googleapiclient."""
+
+    def __init__(self, service: '_FauxService', action: Callable[[], Any]) -> None:
+        self._service = service
+        self._action = action
+
+    def execute(self) -> Any:
+        """Envoie la requête (un aller-retour HTTP)."""
+        self._service._aller_retour()
+        return self._service._traiter(self._action)
+
+
+class _RequeteGroupee:
+    """Requête groupée (new_batch_http_request) : un aller-retour HTTP, une réponse par requête."""
+
+    def __init__(self, service: '_FauxService', callback: Callable | None) -> None:
+        self._service = service
+        self._callback = callback
+        self._requetes: list[tuple[str, _Requete, Callable | None]] = []
+        self._numeros = itertools.count(1)
+
+    def add(self, request: _Requete, callback: Callable | None = None, request_id: str | None = None) -> None:
+        """
+        Ajoute une requête au groupe.
+
+        Args:
+            request (_Requete): Requête d'un faux service.
+            callback (Callable | None, optionnel): Fonction propre à cette requête.
+            request_id (str | None, optionnel): Identifiant renvoyé au callback. Défaut: numéro d'ordre.
+
+        Raises:
+            ValueError: Au-delà de TAILLE_MAX_LOT requêtes.
+        """
+        if len(self._requetes) >= TAILLE_MAX_LOT:
+            raise ValueError(f"Une requête groupée est limitée à {TAILLE_MAX_LOT} requêtes")
+        self._requetes.append((request_id if request_id is not None else str(next(self._numeros)), request, callback))
+
+    def execute(self) -> None:
+        """Envoie le groupe ; chaque requête réussit ou échoue séparément."""
+        self._service._aller_retour()
+        for request_id, requete, callback in self._requetes:
+            try:
+                reponse, erreur = self._service._traiter(requete._action), None
+            except FausseHttpError as e:
+                reponse, erreur = None, e
+            destinataire = callback or self._callback
+            if destinataire is not None:
+                destinataire(request_id, reponse, erreur)
+
+
+class _FauxService:
+    """
+    Base des faux services : compteurs, latence, échecs et quotas simulés.
+    Les appels sont protégés par un verrou (service partagé entre threads).
+    """
+
+    def __init__(self, reglages: ReglagesFaux | None = None) -> None:
+        """
+        Initialise le service.
+
+        Args:
+            reglages (ReglagesFaux | None, optionnel): Comportement simulé. Défaut: aucune latence ni échec.
+        """
+        self.reglages = reglages or ReglagesFaux()
+        self.appels_http = 0
+        self.requetes = 0
+        self.echecs = 0
+        self._aleatoire = random.Random(self.reglages.graine)
+        self._acceptees = 0
+        self._recentes: deque[float] = deque()
+        self._verrou = threading.RLock()
+
+    def new_batch_http_request(self, callback: Callable | None = None) -> _RequeteGroupee:
+        """
+        Prépare une requête groupée.
+
+        Args:
+            callback (Callable | None, optionnel): Fonction (request_id, response, exception) appelée pour chaque requête.
+
+        Returns:
+            _RequeteGroupee: Groupe à remplir avec add puis à envoyer avec execute.
+        """
+        return _RequeteGroupee(self, callback)
+
+    def statistiques(self) -> dict[str, int]:
+        """
+        Compteurs du service.
+
+        Returns:
+            dict[str, int]: Allers-retours HTTP, requêtes traitées et requêtes en échec.
+        """
+        with self._verrou:
+            return {"appels_http": self.appels_http, "requetes": self.requetes, "echecs": self.echecs}
+
+    def _aller_retour(self) -> None:
+        """Compte un aller-retour HTTP et attend la latence simulée (hors verrou)."""
+        with self._verrou:
+            self.appels_http += 1
+        if self.reglages.latence:
+            time.sleep(self.reglages.latence)
+
+    def _traiter(self, action: Callable[[], Any]) -> Any:
+        """Applique quotas et échecs simulés puis exécute une requête."""
+        with self._verrou:
+            self.requetes += 1
+            try:
+                self._verifier_quotas()
+                if self.reglages.taux_echec and self._aleatoire.random() < self.reglages.taux_echec:
+                    raise FausseHttpError(self.reglages.statut_echec, "backendError", "échec simulé")
+                return action()
+            except FausseHttpError:
+                self.echecs += 1
+                raise
+
+    def _verifier_quotas(self) -> None:
+        """Lève une erreur 403 si un quota est dépassé (les requêtes refusées ne comptent pas)."""
+        if self.reglages.quota_total is not None and self._acceptees >= self.reglages.quota_total:
+            raise FausseHttpError(403, "dailyLimitExceeded", "quota total atteint")
+        if self.reglages.quota_par_minute is not None:
+            maintenant = time.monotonic()
+            while self._recentes and maintenant - self._recentes[0] >= 60:
+                self._recentes.popleft()
+            if len(self._recentes) >= self.reglages.quota_par_minute:
+                raise FausseHttpError(403, "rateLimitExceeded", "quota par minute atteint")
+            self._recentes.append(maintenant)
+        self._acceptees += 1
+
+    def _requete(self, action: Callable[[], Any]) -> _Requete:
+        """Prépare une requête exécutant action."""
+        return _Requete(self, action)
+
+
+def _instant(moment: dict | str, fuseau: str | None = None) -> datetime:
+    """
+    Instant (avec fuseau) d'un champ start/end d'événement ou d'un paramètre timeMin/timeMax.
+
+    Args:
+        moment (dict | str): {"dateTime": ..., "timeZone": ...}, {"date": ...} ou texte RFC 3339.
+        fuseau (str | None, optionnel): Fuseau d'une date sans décalage. Défaut: UTC.
+
+    Returns:
+        datetime: Instant comparable aux autres.
+    """
+    if isinstance(moment, dict):
+        fuseau = moment.get("timeZone", fuseau)
+        moment = moment.get("dateTime") or moment.get("date")
+    instant = datetime.fromisoformat(moment.replace("Z", "+00:00"))
+    if instant.tzinfo is None:
+        try:
+            instant = instant.replace(tzinfo=ZoneInfo(fuseau))
+        except Exception:
+            instant = instant.replace(tzinfo=timezone.utc)
+    return instant
+
+
+def _maintenant() -> str:
+    """Horodatage RFC 3339 des champs created/updated."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class FauxServiceCalendrier(_FauxService):
+    """
+    Faux service Google Agenda v3 en mémoire : calendarList, calendars et events
+    (insert, get, update, patch, delete, list avec pagination, syncToken et showDeleted),
+    requêtes groupées. Seules les fonctionnalités utilisées par l'application sont simulées.
+    """
+
+    def __init__(self, reglages: ReglagesFaux | None = None) -> None:
+        """
+        Initialise un service sans agenda.
+
+        Args:
+            reglages (ReglagesFaux | None, optionnel): Comportement simulé.
+        """
+        super().__init__(reglages)
+        self.agendas: dict[str, dict] = {}
+        # événements par agenda, avec le numéro de la dernière modification de chacun
+        self.evenements: dict[str, dict[str, dict]] = {}
+        self._modifications: dict[str, dict[str, int]] = {}
+        self._sequence = 0
+        # les jetons antérieurs sont refusés (410), comme après une expiration côté Google
+        self._premier_jeton_valide = 0
+        self._numeros = itertools.count(1)
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle du service.
+
+        Returns:
+            str: Représentation lisible du service.
+        """
+        nombre = sum(len(evenements) for evenements in self.evenements.values())
+        return f"FauxServiceCalendrier({len(self.agendas)} agenda(s), {nombre} événement(s), {self.appels_http} appel(s) HTTP, {self.requetes} requête(s), {self.echecs} échec(s))"
+
+    def calendarList(self) -> '_ListeAgendas':
+        """Ressource calendarList (list)."""
+        return _ListeAgendas(self)
+
+    def calendars(self) -> '_Agendas':
+        """Ressource calendars (insert)."""
+        return _Agendas(self)
+
+    def events(self) -> '_Evenements':
+        """Ressource events (insert, get, update, patch, delete, list)."""
+        return _Evenements(self)
+
+    def expirer_jetons(self) -> None:
+        """
+        Fait expirer les jetons de synchronisation déjà donnés : la lecture suivante
+        avec l'un d'eux est refusée (410), ce qui impose une lecture complète.
+        """
+        with self._verrou:
+            self._premier_jeton_valide = self._sequence + 1
+
+    def _nouvel_identifiant(self, prefixe: str) -> str:
+        return f"{prefixe}{next(self._numeros):06d}"
+
+    def _evenements_de(self, calendar_id: str) -> dict[str, dict]:
+        """Evénements d'un agenda (404 si l'agenda n'existe pas)."""
+        if calendar_id not in self.evenements:
+            raise FausseHttpError(404, "notFound", f"agenda {calendar_id} introuvable")
+        return self.evenements[calendar_id]
+
+    def _evenement(self, calendar_id: str, event_id: str) -> dict:
+        """Evénement existant (404 s'il n'a jamais existé, 410 s'il est supprimé)."""
+        evenement = self._evenements_de(calendar_id).get(event_id)
+        if evenement is None:
+            raise FausseHttpError(404, "notFound", f"événement {event_id} introuvable")
+        if evenement["status"] == "cancelled":
+            raise FausseHttpError(410, "deleted", f"événement {event_id} supprimé")
+        return evenement
+
+    def _enregistrer(self, calendar_id: str, evenement: dict) -> dict:
+        """Enregistre une version d'événement et retourne la copie renvoyée à l'appelant."""
+        self._sequence += 1
+        evenement["updated"] = _maintenant()
+        self.evenements[calendar_id][evenement["id"]] = evenement
+        self._modifications[calendar_id][evenement["id"]] = self._sequence
+        return copy.deepcopy(evenement)
+
+
+class _ListeAgendas:
+    def __init__(self, service: FauxServiceCalendrier) -> None:
+        self._service = service
+
+    def list(self, **parametres) -> _Requete:
+        service = self._service
+        return service._requete(lambda: {"items": [copy.deepcopy(agenda) for agenda in service.agendas.values()]})
+
+
+class _Agendas:
+    def __init__(self, service: FauxServiceCalendrier) -> None:
+        self._service = service
+
+    def insert(self, body: dict, **parametres) -> _Requete:
+        service = self._service
+
+        def inserer() -> dict:
+            agenda = dict(copy.deepcopy(body), id=f"{service._nouvel_identifiant('agenda')}@group.calendar.google.com")
+            service.agendas[agenda["id"]] = agenda
+            service.evenements[agenda["id"]] = {}
+            service._modifications[agenda["id"]] = {}
+            return copy.deepcopy(agenda)
+        return service._requete(inserer)
+
+
+class _Evenements:
+    def __init__(self, service: FauxServiceCalendrier) -> None:
+        self._service = service
+
+    def insert(self, calendarId: str, body: dict, **parametres) -> _Requete:
+        service = self._service
+
+        def inserer() -> dict:
+            service._evenements_de(calendarId)
+            evenement = dict(copy.deepcopy(body), id=body.get("id") or service._nouvel_identifiant("evt"), status="confirmed", created=_maintenant())
+            return service._enregistrer(calendarId, evenement)
+        return service._requete(inserer)
+
+    def get(self, calendarId: str, eventId: str, **parametres) -> _Requete:
+        service = self._service
+        return service._requete(lambda: copy.deepcopy(service._evenement(calendarId, eventId)))
+
+    def update(self, calendarId: str, eventId: str, body: dict, **parametres) -> _Requete:
+        service = self._service
+
+        def modifier() -> dict:
+            ancien = service._evenement(calendarId, eventId)
+            evenement = dict(copy.deepcopy(body), id=eventId, status="confirmed", created=ancien["created"])
+            return service._enregistrer(calendarId, evenement)
+        return service._requete(modifier)
+
+    def patch(self, calendarId: str, eventId: str, body: dict, **parametres) -> _Requete:
+        service = self._service
+
+        def completer() -> dict:
+            evenement = copy.deepcopy(service._evenement(calendarId, eventId))
+            evenement.update(copy.deepcopy(body))
+            return service._enregistrer(calendarId, evenement)
+        return service._requete(completer)
+
+    def delete(self, calendarId: str, eventId: str, **parametres) -> _Requete:
+        service = self._service
+
+        def supprimer() -> str:
+            evenement = copy.deepcopy(service._evenement(calendarId, eventId))
+            # l'événement reste visible comme supprimé pour les lectures showDeleted / syncToken
+            evenement["status"] = "cancelled"
+            service._enregistrer(calendarId, evenement)
+            return ""
+        return service._requete(supprimer)
+
+    def list(self, calendarId: str, timeMin: str | None = None, timeMax: str | None = None, syncToken: str | None = None, pageToken: str | None = None,
+             maxResults: int = PAGE_DEFAUT, showDeleted: bool = False, orderBy: str | None = None, **parametres) -> _Requete:
+        service = self._service
+
+        def lister() -> dict:
+            evenements = service._evenements_de(calendarId)
+            modifications = service._modifications[calendarId]
+            if syncToken is not None:
+                if timeMin is not None or timeMax is not None or orderBy is not None:
+                    raise FausseHttpError(400, "invalid", "syncToken ne se combine pas avec timeMin, timeMax ou orderBy")
+                if not syncToken.isdigit() or int(syncToken) < service._premier_jeton_valide:
+                    raise FausseHttpError(410, "fullSyncRequired", "jeton de synchronisation expiré")
+                # lecture incrémentale : les événements supprimés sont toujours renvoyés
+                choisis = [evenement for event_id, evenement in evenements.items() if modifications[event_id] > int(syncToken)]
+            else:
+                choisis = [evenement for evenement in evenements.values() if showDeleted or evenement["status"] != "cancelled"]
+                if timeMin is not None:
+                    choisis = [evenement for evenement in choisis if "end" in evenement and _instant(evenement["end"]) > _instant(timeMin)]
+                if timeMax is not None:
+                    choisis = [evenement for evenement in choisis if "start" in evenement and _instant(evenement["start"]) < _instant(timeMax)]
+            if orderBy == "startTime":
+                choisis.sort(key=lambda evenement: _instant(evenement["start"]))
+
+            debut = int(pageToken or 0)
+            taille = min(int(maxResults), PAGE_MAX)
+            reponse = {"kind": "calendar#events", "items": [copy.deepcopy(evenement) for evenement in choisis[debut:debut + taille]]}
+            if debut + taille < len(choisis):
+                reponse["nextPageToken"] = str(debut + taille)
+            elif timeMin is None and timeMax is None:
+                reponse["nextSyncToken"] = str(service._sequence)
+            return reponse
+        return service._requete(lister)
+
+
+class FauxServiceGmail(_FauxService):
+    """
+    Faux service Gmail v1 en mémoire : création de brouillons et envoi de messages.
+    """
+
+    def __init__(self, reglages: ReglagesFaux | None = None) -> None:
+        """
+        Initialise un service sans message.
+
+        Args:
+            reglages (ReglagesFaux | None, optionnel): Comportement simulé.
+        """
+        super().__init__(reglages)
+        self.brouillons: list[dict] = []
+        self.messages: list[dict] = []
+        self._numeros = itertools.count(1)
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle du service.
+
+        Returns:
+            str: Représentation lisible du service.
+        """
+        return f"FauxServiceGmail({len(self.brouillons)} brouillon(s), {len(self.messages)} message(s), {self.appels_http} appel(s) HTTP, {self.echecs} échec(s))"
+
+    def users(self) -> '_Utilisateurs':
+        """Ressource users (drafts.create, messages.send)."""
+        return _Utilisateurs(self)
+
+
+class _Utilisateurs:
+    def __init__(self, service: FauxServiceGmail) -> None:
+        self._service = service
+
+    def drafts(self) -> '_Brouillons':
+        return _Brouillons(self._service)
+
+    def messages(self) -> '_Messages':
+        return _Messages(self._service)
+
+
+class _Brouillons:
+    def __init__(self, service: FauxServiceGmail) -> None:
+        self._service = service
+
+    def create(self, userId: str, body: dict, **parametres) -> _Requete:
+        service = self._service
+
+        def creer() -> dict:
+            numero = next(service._numeros)
+            brouillon = {"id": f"r{numero:06d}", "message": {"id": f"m{numero:06d}", "threadId": f"t{numero:06d}", "labelIds": ["DRAFT"]}}
+            service.brouillons.append(dict(brouillon, userId=userId, raw=body.get("message", {}).get("raw", "")))
+            return brouillon
+        return service._requete(creer)
+
+
+class _Messages:
+    def __init__(self, service: FauxServiceGmail) -> None:
+        self._service = service
+
+    def send(self, userId: str, body: dict, **parametres) -> _Requete:
+        service = self._service
+
+        def envoyer() -> dict:
+            numero = next(service._numeros)
+            message = {"id": f"m{numero:06d}", "threadId": f"t{numero:06d}", "labelIds": ["SENT"]}
+            service.messages.append(dict(message, userId=userId, raw=body.get("raw", "")))
+            return message
+        return service._requete(envoyer)
+
+
+def fabrique_factice(reglages: ReglagesFaux | None = None) -> Callable[[str, str], _FauxService]:
+    """
+    Fabrique de services pour google_api_manager.set_service_factory : l'application
+    utilise alors les faux services en mémoire au lieu de l'API Google.
+
+    Exemple:
+        set_service_factory(fabrique_factice(ReglagesFaux(latence=0.1, taux_echec=0.05)))
+
+    Args:
+        reglages (ReglagesFaux | None, optionnel): Comportement simulé, commun aux services créés.
+
+    Returns:
+        Callable[[str, str], _FauxService]: Fonction (api_name, api_version) -> service.
+    """
+    services = {"calendar": FauxServiceCalendrier, "gmail": FauxServiceGmail}
+
+    def fabriquer(api_name: str, api_version: str) -> _FauxService:
+        if api_name not in services:
+            raise ValueError(f"Pas de faux service pour l'API {api_name} {api_version}")
+        return services[api_name](reglages)
+    return fabriquer
+
+
+if __name__ == "__main__":
+    # Mesure du débit de l'envoi par requêtes groupées, sans réseau :
+    #   python -m app.services.faux_google "latence=0.1,taux_echec=0.05" 500
+    import sys
+
+    from app.services.calendrier_lots import INSERTION, OperationCalendrier, executer_par_lots
+
+    reglages = ReglagesFaux.depuis_texte(sys.argv[1] if len(sys.argv) > 1 else "latence=0.1")
+    nombre = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    service = FauxServiceCalendrier(reglages)
+    agenda = service.calendars().insert(body={"summary": "Mesure"}).execute()["id"]
+    operations = [
+        OperationCalendrier(INSERTION, numero, {"summary": f"RDV {numero}", "start": {"dateTime": "2026-01-05T09:00:00", "timeZone": "Europe/Paris"}, "end": {"dateTime": "2026-01-05T09:45:00", "timeZone": "Europe/Paris"}})
+        for numero in range(nombre)
+    ]
+    debut = time.perf_counter()
+    resultats = executer_par_lots(operations, service, agenda, attente=0.0)
+    duree = time.perf_counter() - debut
+    reussis = sum(resultat.reussi for resultat in resultats)
+    print(reglages)
+    print(f"{reussis}/{nombre} opérations en {duree:.2f} s ({nombre / duree:.0f} op/s), {service.statistiques()}")
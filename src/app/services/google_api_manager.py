@@ -1,8 +1,7 @@
 import os
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+
+# The Google client libraries are slow to import: they are loaded on first use
+# (validate_token, get_service) so that they stay out of application startup.
 
 
 # Scopes used by the application
@@ -16,6 +15,12 @@ SCOPES = [
 _CREDS = None
 _SERVICE_CACHE = {}
 
+# Optional factory(api_name, api_version) used instead of googleapiclient (offline tests, benchmarks)
+_SERVICE_FACTORY = None
+# Environment variable selecting the in-process fake services, with their settings
+# (e.g. CABILIB_FAUX_GOOGLE="latence=0.1,taux_echec=0.05"; an empty value uses the defaults)
+FAKE_SERVICES_ENV = 'CABILIB_FAUX_GOOGLE'
+
 
 def validate_token():
     """Validate or obtain OAuth2 credentials and cache them in module state."""
@@ -23,6 +28,10 @@ def validate_token():
     if _CREDS is not None and _CREDS.valid:
         return _CREDS
 
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds = None
     token_path = 'src/token.json'
     creds_path = 'src/credentials.json'
@@ -43,16 +52,49 @@ def validate_token():
     return _CREDS
 
 
+def set_service_factory(factory):
+    """Replace the real service clients with those built by ``factory(api_name, api_version)``.
+
+    Used to run the calendar and mail paths offline, e.g. with
+    ``app.services.faux_google.fabrique_factice()``. Pass None to go back to the
+    real clients. Services already built are dropped; callers keeping state tied
+    to a service (such as ``calendar_api.CALENDAR_ID``) must reset it themselves.
+    """
+    global _SERVICE_FACTORY
+    _SERVICE_FACTORY = factory
+    _SERVICE_CACHE.clear()
+
+
+def _factory_from_environment():
+    """Install the fake services if FAKE_SERVICES_ENV is set, and return the factory in use."""
+    global _SERVICE_FACTORY
+    settings = os.environ.get(FAKE_SERVICES_ENV)
+    if _SERVICE_FACTORY is None and settings is not None:
+        from app.services.faux_google import ReglagesFaux, fabrique_factice
+        _SERVICE_FACTORY = fabrique_factice(ReglagesFaux.depuis_texte(settings))
+    return _SERVICE_FACTORY
+
+
 def get_service(api_name, api_version):
     """Return a cached google-api service client for (api_name, api_version).
 
     This avoids recreating service objects and centralises credential handling.
+    When a service factory is installed (set_service_factory or FAKE_SERVICES_ENV),
+    it builds the service instead and no OAuth token is needed.
     """
     key = (api_name, api_version)
     service = _SERVICE_CACHE.get(key)
     if service is not None:
         return service
 
+    factory = _factory_from_environment()
+    if factory is not None:
+        service = factory(api_name, api_version)
+        _SERVICE_CACHE[key] = service
+        return service
+
+    from googleapiclient.discovery import build
+
     creds = validate_token()
     service = build(api_name, api_version, credentials=creds)
     _SERVICE_CACHE[key] = service
@@ -0,0 +1,208 @@
+from datetime import datetime
+from typing import Any
+
+from app.database.connexion import session
+from app.services.calendrier_lots import convertir_erreur
+
+try:
+    from zoneinfo import ZoneInfo
+    FUSEAU = ZoneInfo("Europe/Paris")
+except Exception:
+    # base des fuseaux absente : fuseau local du système
+    FUSEAU = None
+
+# Clé de synchro_etat du jeton de synchronisation (un par agenda)
+CLE_JETON = "jeton_synchro:{}"
+# Champs demandés à l'API : seuls ceux utiles au rapprochement
+CHAMPS = "items(id,status,start,description,extendedProperties),nextPageToken,nextSyncToken"
+# Rendez-vous lus par requête lors du rapprochement
+TAILLE_RAPPROCHEMENT = 500
+
+
+class BilanLecture:
+    """Résumé d'une lecture des modifications de l'agenda."""
+    complete: bool
+    evenements: int
+    deplaces: list[tuple[int, datetime, datetime]]
+    supprimes: list[tuple[int, datetime]]
+    ignores: list[int]
+
+    def __init__(self, complete: bool) -> None:
+        """
+        Initialise un bilan vide.
+
+        Args:
+            complete (bool): Lecture complète de l'agenda (premier passage ou jeton expiré).
+        """
+        self.complete = complete
+        self.evenements = 0
+        self.deplaces = []
+        self.supprimes = []
+        self.ignores = []
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle du bilan.
+
+        Returns:
+            str: Représentation lisible du bilan.
+        """
+        return f"BilanLecture({'complète' if self.complete else 'incrémentale'}, {self.evenements} événement(s), {len(self.deplaces)} déplacé(s), {len(self.supprimes)} supprimé(s), {len(self.ignores)} ignoré(s))"
+
+    @property
+    def dates(self) -> list[datetime]:
+        """Dates touchées dans le planning (anciennes et nouvelles), pour invalider l'affichage."""
+        return [date for _, ancienne, nouvelle in self.deplaces for date in (ancienne, nouvelle)] + [date for _, date in self.supprimes]
+
+
+def debut_local(evenement: dict) -> datetime | None:
+    """
+    Heure de début d'un événement, en heure de Paris sans fuseau (comme en base).
+
+    Args:
+        evenement (dict): Evénement renvoyé par l'API.
+
+    Returns:
+        datetime | None: Début de l'événement, None pour un événement sur la journée entière.
+    """
+    debut = evenement.get("start", {}).get("dateTime")
+    if not debut:
+        return None
+    debut = datetime.fromisoformat(debut.replace("Z", "+00:00"))
+    if debut.tzinfo is not None:
+        debut = debut.astimezone(FUSEAU).replace(tzinfo=None)
+    return debut
+
+
+def synchroniser_depuis_agenda(service: Any, calendar_id: str) -> BilanLecture:
+    """
+    Reporte sur les rendez-vous les modifications faites dans l'agenda Google
+    (événement déplacé ou supprimé depuis le téléphone, par exemple).
+
+    Seuls les événements modifiés depuis le passage précédent sont demandés
+    (jeton nextSyncToken gardé dans synchro_etat). Sans jeton, ou si Google
+    l'a expiré (410), l'agenda est relu entièrement et un nouveau jeton est pris.
+
+    Règles de rapprochement :
+        - un rendez-vous avec une opération encore en file (outbox_calendrier) garde
+          la version locale, qui sera envoyée ;
+        - un rendez-vous facturé n'est pas supprimé ;
+        - les événements qui ne viennent pas de CabiLib sont ignorés.
+
+    Args:
+        service (Any): Service Calendar v3 (ou faux service local).
+        calendar_id (str): Agenda lu.
+
+    Returns:
+        BilanLecture: Les changements appliqués.
+    """
+    cle = CLE_JETON.format(calendar_id)
+    with session() as connexion:
+        ligne = connexion.execute("SELECT valeur FROM synchro_etat WHERE cle = ?", (cle,)).fetchone()
+    jeton = ligne[0] if ligne else None
+
+    try:
+        bilan, jeton = _lire(service, calendar_id, jeton)
+    except Exception as e:
+        if jeton is None or convertir_erreur(e).statut != 410:
+            raise
+        # jeton expiré : lecture complète
+        bilan, jeton = _lire(service, calendar_id, None)
+
+    if jeton:
+        with session(ecriture=True) as connexion:
+            connexion.execute("INSERT OR REPLACE INTO synchro_etat (cle, valeur) VALUES (?, ?)", (cle, jeton))
+    return bilan
+
+
+def _lire(service: Any, calendar_id: str, jeton: str | None) -> tuple[BilanLecture, str | None]:
+    """
+    Lit les pages d'événements (modifiés depuis le jeton, ou tous) et les rapproche page par page.
+
+    Args:
+        service (Any): Service Calendar v3.
+        calendar_id (str): Agenda lu.
+        jeton (str | None): Jeton du passage précédent, None pour une lecture complète.
+
+    Returns:
+        tuple[BilanLecture, str | None]: Le bilan et le jeton du prochain passage.
+    """
+    bilan = BilanLecture(complete=jeton is None)
+    page = None
+    while True:
+        parametres = {"calendarId": calendar_id, "showDeleted": True, "maxResults": 2500, "fields": CHAMPS}
+        if jeton:
+            parametres["syncToken"] = jeton
+        if page:
+            parametres["pageToken"] = page
+        reponse = service.events().list(**parametres).execute()
+        evenements = reponse.get("items", [])
+        bilan.evenements += len(evenements)
+        _rapprocher(evenements, bilan)
+        page = reponse.get("nextPageToken")
+        if not page:
+            return bilan, reponse.get("nextSyncToken")
+
+
+def _rapprocher(evenements: list[dict], bilan: BilanLecture) -> None:
+    """
+    Applique aux rendez-vous les déplacements et suppressions d'une page d'événements.
+
+    Args:
+        evenements (list[dict]): Evénements de la page.
+        bilan (BilanLecture): Bilan complété.
+    """
+    from app.services.calendar_api import rdv_id_evenement
+
+    for debut in range(0, len(evenements), TAILLE_RAPPROCHEMENT):
+        tranche = evenements[debut:debut + TAILLE_RAPPROCHEMENT]
+        with session(ecriture=True) as connexion:
+            marqueurs = ", ".join("?" for _ in tranche)
+            # rendez-vous liés aux événements, avec l'éventuelle opération en attente
+            lignes = connexion.execute(
+                f'SELECT r.id, r.google_event_id, r.date AS "date [horodatage]", r.facture_id, o.id IS NOT NULL'
+                f" FROM rendez_vous r LEFT JOIN outbox_calendrier o ON o.rdv_id = r.id"
+                f" WHERE r.google_event_id IN ({marqueurs})",
+                [evenement["id"] for evenement in tranche]
+            ).fetchall()
+            par_evenement = {ligne[1]: ligne for ligne in lignes}
+            # événements créés avant google_event_id : retrouvés par l'identifiant du rendez-vous
+            anciens = {rdv_id_evenement(evenement): evenement["id"] for evenement in tranche if evenement["id"] not in par_evenement}
+            anciens.pop(None, None)
+            if anciens:
+                marqueurs = ", ".join("?" for _ in anciens)
+                for ligne in connexion.execute(
+                    f'SELECT r.id, r.google_event_id, r.date AS "date [horodatage]", r.facture_id, o.id IS NOT NULL'
+                    f" FROM rendez_vous r LEFT JOIN outbox_calendrier o ON o.rdv_id = r.id"
+                    f" WHERE r.id IN ({marqueurs}) AND r.google_event_id IS NULL",
+                    list(anciens)
+                ):
+                    par_evenement[anciens[ligne[0]]] = ligne
+
+            deplacements = []
+            suppressions = []
+            rattachements = []
+            for evenement in tranche:
+                ligne = par_evenement.get(evenement["id"])
+                if ligne is None:
+                    continue
+                rdv_id, google_event_id, date, facture_id, en_attente = ligne
+                if google_event_id is None:
+                    rattachements.append((evenement["id"], rdv_id))
+                if en_attente:
+                    bilan.ignores.append(rdv_id)
+                elif evenement.get("status") == "cancelled":
+                    if facture_id not in (None, "", "-1"):
+                        bilan.ignores.append(rdv_id)
+                        continue
+                    suppressions.append((rdv_id,))
+                    bilan.supprimes.append((rdv_id, date))
+                else:
+                    nouvelle_date = debut_local(evenement)
+                    if nouvelle_date is not None and nouvelle_date != date:
+                        deplacements.append((nouvelle_date, rdv_id))
+                        bilan.deplaces.append((rdv_id, date, nouvelle_date))
+            # écriture directe : ces changements viennent de l'agenda, rien n'est mis en file
+            connexion.executemany("UPDATE rendez_vous SET date = ? WHERE id = ?", deplacements)
+            connexion.executemany("DELETE FROM rendez_vous WHERE id = ?", suppressions)
+            connexion.executemany("UPDATE rendez_vous SET google_event_id = ? WHERE id = ? AND google_event_id IS NULL", rattachements)
@@ -0,0 +1,137 @@
+from datetime import date, datetime, time, timedelta
+
+from app.model.rendezVous import OccupationDemiJournee, RendezVous
+from app.services import constantes_manager
+from app.services.recurrence import jours_feries
+
+# Heure de séparation entre le matin et l'après-midi
+DEBUT_APRES_MIDI = time(12, 0)
+
+
+class OccupationJour:
+    """
+    Occupation d'un jour du planning : temps occupé et capacité de chaque demi-journée.
+
+    L'indice 0 correspond au matin, l'indice 1 à l'après-midi.
+    """
+    jour: date
+    capacite: tuple[int, int]
+    demi_journees: tuple[list[OccupationDemiJournee], list[OccupationDemiJournee]]
+
+    def __init__(self, jour: date, capacite: tuple[int, int]) -> None:
+        """
+        Initialise un jour sans rendez-vous.
+
+        Args:
+            jour (date): Jour concerné.
+            capacite (tuple[int, int]): Minutes ouvertes le matin et l'après-midi (0 si fermé).
+        """
+        self.jour = jour
+        self.capacite = capacite
+        self.demi_journees = ([], [])
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle de l'occupation du jour.
+
+        Returns:
+            str: Représentation lisible de l'occupation.
+        """
+        return f"OccupationJour({self.jour}, {self.nombre()} RDV, matin {self.taux(0):.0%}, après-midi {self.taux(1):.0%})"
+
+    @property
+    def ferme(self) -> bool:
+        """True si le cabinet est fermé ce jour-là (dimanche ou jour férié)."""
+        return self.capacite == (0, 0)
+
+    def minutes(self, demi_journee: int) -> int:
+        """
+        Temps occupé d'une demi-journée.
+
+        Args:
+            demi_journee (int): 0 pour le matin, 1 pour l'après-midi.
+
+        Returns:
+            int: Minutes occupées.
+        """
+        return sum(ligne.minutes for ligne in self.demi_journees[demi_journee])
+
+    def taux(self, demi_journee: int) -> float:
+        """
+        Taux d'occupation d'une demi-journée.
+
+        Args:
+            demi_journee (int): 0 pour le matin, 1 pour l'après-midi.
+
+        Returns:
+            float: Part du temps ouvert occupée (peut dépasser 1 en cas de chevauchement).
+        """
+        capacite = self.capacite[demi_journee]
+        return self.minutes(demi_journee) / capacite if capacite else 0.0
+
+    def minutes_libres(self) -> int:
+        """
+        Temps libre sur la journée.
+
+        Returns:
+            int: Minutes ouvertes non occupées.
+        """
+        return sum(max(0, self.capacite[i] - self.minutes(i)) for i in (0, 1))
+
+    def nombre(self) -> int:
+        """
+        Nombre de rendez-vous de la journée.
+
+        Returns:
+            int: Nombre de rendez-vous (patients).
+        """
+        return sum(ligne.nombre for lignes in self.demi_journees for ligne in lignes)
+
+
+def capacite_jour(jour: date, feries: frozenset[date] = frozenset()) -> tuple[int, int]:
+    """
+    Calcule les minutes ouvertes du matin et de l'après-midi d'un jour.
+
+    Args:
+        jour (date): Jour concerné.
+        feries (frozenset[date], optionnel): Jours fériés à considérer comme fermés.
+
+    Returns:
+        tuple[int, int]: Minutes ouvertes le matin et l'après-midi.
+    """
+    if jour.weekday() == 6 or jour in feries:
+        return 0, 0
+    ouverture = datetime.combine(jour, constantes_manager.get_heure("HEURE_DEBUT", "08:00"))
+    fermeture = datetime.combine(jour, constantes_manager.get_heure("HEURE_FIN", "20:00"))
+    midi = min(max(datetime.combine(jour, DEBUT_APRES_MIDI), ouverture), fermeture)
+    return int((midi - ouverture).total_seconds() // 60), int((fermeture - midi).total_seconds() // 60)
+
+
+def occupation_periode(date_debut: date, date_fin: date) -> dict[date, OccupationJour]:
+    """
+    Calcule l'occupation de chaque jour d'une période à partir d'une seule requête agrégée.
+
+    Args:
+        date_debut (date): Premier jour de la période.
+        date_fin (date): Dernier jour de la période (inclus).
+
+    Returns:
+        dict[date, OccupationJour]: Occupation de chaque jour de la période, dans l'ordre.
+    """
+    if isinstance(date_debut, datetime):
+        date_debut = date_debut.date()
+    if isinstance(date_fin, datetime):
+        date_fin = date_fin.date()
+
+    feries = frozenset().union(*(jours_feries(annee) for annee in range(date_debut.year, date_fin.year + 1)))
+    jours: dict[date, OccupationJour] = {}
+    jour = date_debut
+    while jour <= date_fin:
+        jours[jour] = OccupationJour(jour, capacite_jour(jour, feries))
+        jour += timedelta(days=1)
+
+    for ligne in RendezVous.getOccupationPeriode(date_debut, date_fin, DEBUT_APRES_MIDI.strftime('%H:%M')):
+        occupation = jours.get(ligne.jour)
+        if occupation is not None:
+            occupation.demi_journees[int(ligne.apres_midi)].append(ligne)
+    return jours
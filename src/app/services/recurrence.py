@@ -0,0 +1,143 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from app.model.rendezVous import RendezVous
+from app.services.disponibilite import creneaux_libres
+
+
+@lru_cache(maxsize=None)
+def jours_feries(annee: int) -> frozenset[date]:
+    """
+    Retourne les jours fériés français d'une année (fixes et liés à Pâques).
+
+    Args:
+        annee (int): Année concernée.
+
+    Returns:
+        frozenset[date]: Dates des jours fériés.
+    """
+    # Calcul de la date de Pâques (algorithme de Meeus/Jones/Butcher)
+    a = annee % 19
+    b, c = divmod(annee, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mois, jour = divmod(h + l - 7 * m + 114, 31)
+    paques = date(annee, mois, jour + 1)
+
+    return frozenset({
+        date(annee, 1, 1),    # Jour de l'an
+        date(annee, 5, 1),    # Fête du travail
+        date(annee, 5, 8),    # Victoire 1945
+        date(annee, 7, 14),   # Fête nationale
+        date(annee, 8, 15),   # Assomption
+        date(annee, 11, 1),   # Toussaint
+        date(annee, 11, 11),  # Armistice
+        date(annee, 12, 25),  # Noël
+        paques + timedelta(days=1),   # Lundi de Pâques
+        paques + timedelta(days=39),  # Ascension
+        paques + timedelta(days=50),  # Lundi de Pentecôte
+    })
+
+
+class RegleRecurrence:
+    """Règle de répétition d'un rendez-vous (hebdomadaire ou toutes les N semaines)."""
+    intervalle_semaines: int
+    date_fin: date | None
+    nombre: int | None
+    sauter_feries: bool
+    dates_exclues: set[date]
+
+    def __init__(self, intervalle_semaines: int = 1, date_fin: date | None = None, nombre: int | None = None, sauter_feries: bool = True, dates_exclues: set[date] | None = None) -> None:
+        """
+        Initialise une règle de récurrence.
+
+        Args:
+            intervalle_semaines (int, optionnel): 1 pour chaque semaine, 2 pour une semaine sur deux. Défaut: 1.
+            date_fin (date | None, optionnel): Dernière date possible de la série (incluse).
+            nombre (int | None, optionnel): Nombre maximum de rendez-vous de la série.
+            sauter_feries (bool, optionnel): Ignorer les occurrences tombant un jour férié. Défaut: True.
+            dates_exclues (set[date] | None, optionnel): Autres dates à ignorer (congés, vacances...).
+
+        Raises:
+            ValueError: Si ni date de fin ni nombre ne sont fournis, ou si l'intervalle est invalide.
+        """
+        if date_fin is None and nombre is None:
+            raise ValueError("Une série doit avoir une date de fin ou un nombre de rendez-vous")
+        if intervalle_semaines < 1:
+            raise ValueError("L'intervalle de la série doit être d'au moins une semaine")
+        self.intervalle_semaines = intervalle_semaines
+        self.date_fin = date_fin
+        self.nombre = nombre
+        self.sauter_feries = sauter_feries
+        self.dates_exclues = dates_exclues or set()
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle de la règle.
+
+        Returns:
+            str: Représentation lisible de la règle.
+        """
+        return f"RegleRecurrence(toutes les {self.intervalle_semaines} semaine(s), fin: {self.date_fin}, nombre: {self.nombre})"
+
+    def dates(self, premiere: datetime) -> list[datetime]:
+        """
+        Calcule les dates de la série à partir de la première occurrence.
+
+        Les jours fériés et dates exclues sont sautés sans décaler la série ;
+        ils ne comptent pas dans `nombre`.
+
+        Args:
+            premiere (datetime): Date et heure de la première occurrence.
+
+        Returns:
+            list[datetime]: Dates des occurrences retenues.
+        """
+        pas = timedelta(weeks=self.intervalle_semaines)
+        resultat: list[datetime] = []
+        courante = premiere
+        while True:
+            if self.date_fin is not None and courante.date() > self.date_fin:
+                break
+            if self.nombre is not None and len(resultat) >= self.nombre:
+                break
+            jour = courante.date()
+            if not (self.sauter_feries and jour in jours_feries(jour.year)) and jour not in self.dates_exclues:
+                resultat.append(courante)
+            courante += pas
+        return resultat
+
+
+def creer_serie(modele: RendezVous, regle: RegleRecurrence) -> tuple[list[RendezVous], list[RendezVous]]:
+    """
+    Crée une série de rendez-vous à partir d'un rendez-vous modèle.
+
+    Toutes les occurrences sont vérifiées en une fois contre le moteur de
+    disponibilité, puis les occurrences libres sont insérées dans une seule transaction.
+
+    Args:
+        modele (RendezVous): Premier rendez-vous de la série (patient, date, type, motif, présence).
+        regle (RegleRecurrence): Règle de répétition.
+
+    Returns:
+        tuple[list[RendezVous], list[RendezVous]]: Les rendez-vous créés et ceux non créés faute de créneau libre.
+
+    Raises:
+        sqlite3.Error: Si l'enregistrement de la série échoue (aucun rendez-vous créé).
+    """
+    candidats = [
+        RendezVous(modele.patient_id, date_rdv, modele.motif, modele.type_id, modele.presence)
+        for date_rdv in regle.dates(modele.date)
+    ]
+    libres = creneaux_libres(candidats)
+    libres_rdv = [rdv for rdv, libre in zip(candidats, libres) if libre]
+    conflits = [rdv for rdv, libre in zip(candidats, libres) if not libre]
+    # un échec de l'insertion remonte à l'appelant : rien n'est annoncé comme créé
+    ids = set(RendezVous.addRendezVousSerie(libres_rdv))
+    crees = [rdv for rdv in libres_rdv if rdv.id in ids]
+    return crees, conflits
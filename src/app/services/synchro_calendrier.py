@@ -0,0 +1,501 @@
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable
+
+from app.database.connexion import fermer_connexion, session
+from app.services.calendrier_lots import (INSERTION, MODIFICATION, SUPPRESSION, TAILLE_MAX_LOT, ErreurCalendrier,
+                                          OperationCalendrier, convertir_erreur, executer_par_lots)
+
+if TYPE_CHECKING:
+    from app.controllers.taches import ExecuteurTaches
+    from app.model.rendezVous import RendezVous
+
+# Délai avant un nouvel essai : DELAI_INITIAL, doublé à chaque échec, plafonné à DELAI_MAX
+DELAI_INITIAL = timedelta(seconds=5)
+DELAI_MAX = timedelta(hours=1)
+# Echecs temporaires successifs après lesquels une opération est abandonnée (environ 10 heures de nouveaux essais)
+TENTATIVES_MAX = 20
+# Opérations lues dans la file et envoyées ensemble (une requête groupée)
+TAILLE_LOT = TAILLE_MAX_LOT
+# Attente maximale entre deux passages quand la file est vide
+ATTENTE_MAX = 60.0
+# Intervalle entre deux lectures des modifications faites dans l'agenda (secondes)
+INTERVALLE_LECTURE = 300.0
+
+# Clé de synchro_etat : rattachement des événements créés avant google_event_id fait
+CLE_RATTACHEMENT = "rattachement_evenements"
+
+
+def ajouter_insertions(connexion: sqlite3.Connection, rdv_ids: list[int]) -> None:
+    """
+    Enregistre dans la file l'envoi à Google Agenda de rendez-vous créés.
+    A appeler dans la transaction qui crée les rendez-vous.
+
+    Args:
+        connexion (sqlite3.Connection): Connexion de la transaction en cours.
+        rdv_ids (list[int]): Identifiants des rendez-vous créés.
+    """
+    maintenant = datetime.now()
+    connexion.executemany(
+        "INSERT INTO outbox_calendrier (rdv_id, operation, prochain_essai) VALUES (?, ?, ?)"
+        " ON CONFLICT(rdv_id) DO UPDATE SET operation = excluded.operation, version = version + 1,"
+        " tentatives = 0, abandonnee = 0, prochain_essai = excluded.prochain_essai",
+        [(rdv_id, INSERTION, maintenant) for rdv_id in rdv_ids]
+    )
+
+
+def ajouter_modification(connexion: sqlite3.Connection, rdv_id: int, ancienne_date: datetime, ancien_type_id: int) -> None:
+    """
+    Enregistre dans la file la modification d'un rendez-vous dans Google Agenda.
+    A appeler dans la transaction qui modifie le rendez-vous.
+
+    Si une opération est déjà en attente pour ce rendez-vous, elle est conservée
+    (une insertion reste une insertion, une modification garde la date encore
+    présente dans l'agenda) : seul l'état final du rendez-vous sera envoyé.
+
+    Args:
+        connexion (sqlite3.Connection): Connexion de la transaction en cours.
+        rdv_id (int): Identifiant du rendez-vous.
+        ancienne_date (datetime): Date du rendez-vous avant modification.
+        ancien_type_id (int): Type du rendez-vous avant modification.
+    """
+    connexion.execute(
+        "INSERT INTO outbox_calendrier (rdv_id, operation, ancienne_date, ancien_type_id, prochain_essai) VALUES (?, ?, ?, ?, ?)"
+        " ON CONFLICT(rdv_id) DO UPDATE SET version = version + 1, tentatives = 0, abandonnee = 0, prochain_essai = excluded.prochain_essai",
+        (rdv_id, MODIFICATION, ancienne_date, ancien_type_id, datetime.now())
+    )
+
+
+def ajouter_suppression(connexion: sqlite3.Connection, rdv: 'RendezVous') -> None:
+    """
+    Enregistre dans la file la suppression de l'événement d'un rendez-vous supprimé.
+    A appeler dans la transaction qui supprime le rendez-vous.
+
+    Une insertion encore en attente devient une suppression sans événement connu :
+    rien ne sera envoyé, sauf si l'insertion était en cours d'envoi (l'identifiant
+    de l'événement créé est alors reporté sur la ligne).
+
+    Args:
+        connexion (sqlite3.Connection): Connexion de la transaction en cours.
+        rdv (RendezVous): Le rendez-vous supprimé.
+    """
+    connexion.execute(
+        "INSERT INTO outbox_calendrier (rdv_id, operation, ancienne_date, ancien_type_id, google_event_id, prochain_essai) VALUES (?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT(rdv_id) DO UPDATE SET operation = excluded.operation,"
+        " ancienne_date = CASE operation WHEN ? THEN NULL ELSE ancienne_date END,"
+        " google_event_id = COALESCE(excluded.google_event_id, google_event_id),"
+        " version = version + 1, tentatives = 0, abandonnee = 0, prochain_essai = excluded.prochain_essai",
+        (rdv.id, SUPPRESSION, rdv.date, rdv.type_id, rdv.google_event_id, datetime.now(), INSERTION)
+    )
+
+
+def nombre_en_attente() -> int:
+    """
+    Nombre de rendez-vous en attente de synchronisation (hors opérations abandonnées).
+
+    Returns:
+        int: Taille de la file.
+    """
+    with session() as connexion:
+        return connexion.execute("SELECT COUNT(*) FROM outbox_calendrier WHERE abandonnee = 0").fetchone()[0]
+
+
+def operations_abandonnees() -> list[tuple[int, str, datetime | None, int, str]]:
+    """
+    Opérations abandonnées après un échec définitif ou TENTATIVES_MAX échecs, à signaler au praticien.
+    Elles ne sont relancées qu'à la prochaine modification du rendez-vous ou à la demande
+    du praticien (relancer_abandonnees).
+
+    Returns:
+        list[tuple[int, str, datetime | None, int, str]]: (rendez-vous, opération, date du rendez-vous,
+            tentatives, dernière erreur) de chaque opération.
+    """
+    with session() as connexion:
+        # la date d'un rendez-vous supprimé est celle gardée dans la file
+        return connexion.execute(
+            'SELECT o.rdv_id, o.operation, COALESCE(r.date, o.ancienne_date) AS "date [horodatage]", o.tentatives, o.derniere_erreur'
+            " FROM outbox_calendrier o LEFT JOIN rendez_vous r ON r.id = o.rdv_id WHERE o.abandonnee = 1 ORDER BY o.id"
+        ).fetchall()
+
+
+def relancer_abandonnees() -> int:
+    """
+    Remet en file les opérations abandonnées, pour un nouvel essai (leur dernière erreur est conservée).
+
+    Returns:
+        int: Nombre d'opérations relancées.
+    """
+    with session(ecriture=True) as connexion:
+        return connexion.execute(
+            "UPDATE outbox_calendrier SET abandonnee = 0, tentatives = 0, prochain_essai = ? WHERE abandonnee = 1",
+            (datetime.now(),)
+        ).rowcount
+
+
+def delai_nouvel_essai(tentatives: int) -> timedelta:
+    """
+    Délai avant le prochain essai d'une opération (backoff exponentiel avec gigue).
+
+    Args:
+        tentatives (int): Nombre d'échecs déjà subis, celui-ci compris.
+
+    Returns:
+        timedelta: Délai d'attente.
+    """
+    delai = min(DELAI_MAX, DELAI_INITIAL * 2 ** min(tentatives - 1, 20))
+    # gigue : les opérations en échec ne sont pas toutes relancées au même instant
+    return delai * random.uniform(0.8, 1.2)
+
+
+class SynchroCalendrier:
+    """
+    Synchronisation en arrière-plan avec Google Agenda, dans les deux sens.
+
+    L'enregistrement d'un rendez-vous n'écrit que dans la base locale (rendez-vous et
+    file dans la même transaction) ; la boucle de synchronisation, exécutée comme une
+    tâche (ExecuteurTaches) dans un pool de threads dédié, vide la file, réessaie les envois en
+    échec (réseau coupé, quota...) avec un délai croissant, et ne retire une opération
+    qu'une fois l'envoi réussi. Les opérations en attente survivent à un redémarrage.
+
+    Toutes les INTERVALLE_LECTURE secondes, il reporte aussi sur les rendez-vous les
+    événements déplacés ou supprimés dans l'agenda (lecture_agenda) et prévient les
+    écouteurs des dates touchées. Les écouteurs d'état sont prévenus après chaque envoi
+    et à l'arrêt de la boucle sur une erreur, pour afficher l'état de la file.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise une synchronisation arrêtée.
+        """
+        self._reveil = threading.Event()
+        self._arret = threading.Event()
+        self._taches: 'ExecuteurTaches | None' = None
+        self._en_cours = False
+        self.erreur: Exception | None = None
+        self._rattache = False
+        self._prochaine_lecture = 0.0
+        self._ecouteurs: list[Callable[[list[datetime]], None]] = []
+        self._ecouteurs_etat: list[Callable[[], None]] = []
+
+    def ajouter_ecouteur(self, ecouteur: Callable[[list[datetime]], None]) -> None:
+        """
+        Enregistre une fonction appelée (depuis le thread de synchronisation) avec les
+        dates des rendez-vous modifiés à partir de l'agenda.
+
+        Args:
+            ecouteur (Callable[[list[datetime]], None]): Fonction à appeler.
+        """
+        self._ecouteurs.append(ecouteur)
+
+    def ajouter_ecouteur_etat(self, ecouteur: Callable[[], None]) -> None:
+        """
+        Enregistre une fonction appelée (depuis le thread de synchronisation ou celui de
+        l'interface) quand l'état de la file ou de la boucle a pu changer.
+
+        Args:
+            ecouteur (Callable[[], None]): Fonction à appeler.
+        """
+        self._ecouteurs_etat.append(ecouteur)
+
+    def _prevenir_etat(self) -> None:
+        """
+        Prévient les écouteurs d'état.
+        """
+        for ecouteur in self._ecouteurs_etat:
+            try:
+                ecouteur()
+            except Exception as e:
+                print(f"[ERREUR] {e}")
+
+    def demarrer(self) -> None:
+        """
+        Lance la boucle de synchronisation (sans effet si elle tourne déjà).
+        A appeler depuis le thread de l'interface : la fin de la boucle y est signalée.
+        """
+        from PySide6.QtCore import QThreadPool
+
+        from app.controllers.taches import ExecuteurTaches
+
+        if self._en_cours:
+            return
+        if self._taches is None:
+            # pool dédié : la boucle n'occupe pas un thread du pool des tâches de l'interface
+            pool = QThreadPool()
+            pool.setMaxThreadCount(1)
+            self._taches = ExecuteurTaches(pool=pool)
+        self._arret.clear()
+        self._en_cours = True
+        self.erreur = None
+        self._taches.soumettre(self._boucle, on_resultat=self._on_fin, on_erreur=self._on_erreur)
+
+    def arreter(self, attente: float | None = None) -> None:
+        """
+        Demande l'arrêt de la boucle après l'opération en cours.
+
+        Args:
+            attente (float | None, optionnel): Secondes d'attente de la fin de la boucle. Défaut: pas d'attente.
+        """
+        self._arret.set()
+        self._reveil.set()
+        if attente is not None and self._taches is not None:
+            self._taches.pool.waitForDone(int(attente * 1000))
+
+    def _on_fin(self, _resultat: None) -> None:
+        """
+        Fin normale de la boucle (arrêt demandé), signalée dans le thread de l'interface.
+        """
+        self._en_cours = False
+
+    def _on_erreur(self, erreur: Exception) -> None:
+        """
+        Arrêt de la boucle sur une erreur imprévue, signalé dans le thread de l'interface.
+        L'erreur est gardée dans self.erreur ; demarrer() relance la boucle.
+
+        Args:
+            erreur (Exception): Erreur levée par la boucle.
+        """
+        self._en_cours = False
+        self.erreur = erreur
+        print(f"[ERREUR CALENDAR] synchronisation arrêtée : {erreur}")
+        self._prevenir_etat()
+
+    def reveiller(self) -> None:
+        """
+        Signale de nouvelles opérations dans la file : le thread les traite sans attendre.
+        """
+        self._reveil.set()
+
+    def _boucle(self) -> None:
+        """
+        Traite la file jusqu'à l'arrêt, en dormant jusqu'au prochain essai prévu.
+        """
+        try:
+            while not self._arret.is_set():
+                self._reveil.clear()
+                try:
+                    attente = self.traiter()
+                except Exception as e:
+                    print(f"[ERREUR CALENDAR] {e}")
+                    attente = ATTENTE_MAX
+                self._reveil.wait(attente)
+        finally:
+            fermer_connexion()
+
+    def traiter(self) -> float:
+        """
+        Envoie les opérations arrivées à échéance, par requêtes groupées de TAILLE_LOT.
+
+        Returns:
+            float: Secondes jusqu'au prochain essai prévu (au plus ATTENTE_MAX).
+        """
+        if not self._rattache:
+            self._rattacher()
+        while not self._arret.is_set():
+            with session() as connexion:
+                lignes = connexion.execute(
+                    'SELECT id, rdv_id, operation, ancienne_date AS "ancienne_date [horodatage]", ancien_type_id, google_event_id, version, tentatives'
+                    " FROM outbox_calendrier WHERE prochain_essai <= ? AND abandonnee = 0 ORDER BY id LIMIT ?",
+                    (datetime.now(), TAILLE_LOT)
+                ).fetchall()
+            if not lignes:
+                break
+            self._envoyer(lignes)
+            self._prevenir_etat()
+            if len(lignes) < TAILLE_LOT:
+                break
+
+        # les envois passent avant la lecture : les changements locaux en attente sont prioritaires
+        if not self._arret.is_set() and time.monotonic() >= self._prochaine_lecture:
+            self._lire_agenda()
+        attente = min(ATTENTE_MAX, max(0.0, self._prochaine_lecture - time.monotonic()))
+
+        with session() as connexion:
+            prochain = connexion.execute('SELECT MIN(prochain_essai) AS "prochain [horodatage]" FROM outbox_calendrier WHERE abandonnee = 0').fetchone()[0]
+        if prochain is None:
+            return attente
+        return min(attente, max(0.0, (prochain - datetime.now()).total_seconds()))
+
+    def _lire_agenda(self) -> None:
+        """
+        Reporte les modifications faites dans l'agenda et prévient les écouteurs.
+        En cas d'échec (hors ligne), la lecture est retentée à l'intervalle suivant.
+        """
+        import app.services.calendar_api as calendar_api
+        from app.services.lecture_agenda import synchroniser_depuis_agenda
+
+        self._prochaine_lecture = time.monotonic() + INTERVALLE_LECTURE
+        if calendar_api.CALENDAR_ID is None and calendar_api.create_calendar_if_not_exist() is None:
+            return
+        try:
+            bilan = synchroniser_depuis_agenda(calendar_api.get_calendarV3_service(), calendar_api.CALENDAR_ID)
+        except Exception as e:
+            print(f"[ERREUR CALENDAR] lecture de l'agenda : {e}")
+            return
+        if bilan.deplaces or bilan.supprimes:
+            for ecouteur in self._ecouteurs:
+                try:
+                    ecouteur(bilan.dates)
+                except Exception as e:
+                    print(f"[ERREUR] {e}")
+
+    def _rattacher(self) -> None:
+        """
+        Rattrapage unique (par base) du google_event_id des rendez-vous synchronisés
+        avant son introduction. En cas d'échec (hors ligne), il sera retenté au passage suivant.
+        """
+        import app.services.calendar_api as calendar_api
+
+        with session() as connexion:
+            fait = connexion.execute("SELECT 1 FROM synchro_etat WHERE cle = ?", (CLE_RATTACHEMENT,)).fetchone()
+            # rendez-vous sans événement connu, hors insertions encore en file
+            a_rattacher = connexion.execute(
+                "SELECT 1 FROM rendez_vous WHERE google_event_id IS NULL"
+                " AND id NOT IN (SELECT rdv_id FROM outbox_calendrier) LIMIT 1"
+            ).fetchone()
+        if not fait and a_rattacher:
+            try:
+                calendar_api.rattacher_evenements()
+            except Exception as e:
+                print(f"[ERREUR CALENDAR] rattachement des événements : {e}")
+                return
+        with session(ecriture=True) as connexion:
+            connexion.execute("INSERT OR REPLACE INTO synchro_etat (cle, valeur) VALUES (?, ?)", (CLE_RATTACHEMENT, datetime.now()))
+        self._rattache = True
+
+    def _envoyer(self, lignes: list[tuple]) -> None:
+        """
+        Envoie un lot d'opérations de la file dans une requête groupée et met la file à jour.
+
+        Args:
+            lignes (list[tuple]): Lignes de outbox_calendrier (id, rdv_id, operation, ancienne_date,
+                ancien_type_id, google_event_id, version, tentatives).
+        """
+        import app.services.calendar_api as calendar_api
+        from app.model.rendezVous import RendezVous
+
+        if calendar_api.CALENDAR_ID is None and calendar_api.create_calendar_if_not_exist() is None:
+            erreur = ErreurCalendrier("agenda Google indisponible", reessayable=True)
+            for ligne in lignes:
+                self._echec(ligne, erreur)
+            return
+
+        preparees: list[tuple[tuple, OperationCalendrier, 'RendezVous | None']] = []
+        for ligne in lignes:
+            try:
+                operation, rdv = self._preparer(ligne)
+            except Exception as e:
+                self._echec(ligne, convertir_erreur(e))
+                continue
+            if operation is None:
+                # plus rien à envoyer (rendez-vous supprimé, jamais envoyé...)
+                self._terminer(ligne, None, None)
+                continue
+            preparees.append((ligne, operation, rdv))
+        if not preparees:
+            return
+
+        resultats = executer_par_lots([operation for _, operation, _ in preparees], calendar_api.get_calendarV3_service(), calendar_api.CALENDAR_ID)
+        for (ligne, operation, rdv), resultat in zip(preparees, resultats):
+            if resultat.reussi:
+                event_id = (resultat.evenement or {}).get("id") if operation.type != SUPPRESSION else None
+                if event_id and rdv is not None and event_id != rdv.google_event_id:
+                    RendezVous.updateGoogleEventIds([(event_id, rdv.id)])
+                self._terminer(ligne, rdv, event_id)
+            elif operation.type == MODIFICATION and resultat.erreur.absent:
+                # événement supprimé dans l'agenda alors que le rendez-vous existe : il est recréé
+                RendezVous.updateGoogleEventIds([(None, rdv.id)])
+                with session(ecriture=True) as connexion:
+                    connexion.execute(
+                        "UPDATE outbox_calendrier SET operation = ?, prochain_essai = ? WHERE id = ? AND version = ?",
+                        (INSERTION, datetime.now(), ligne[0], ligne[6])
+                    )
+            else:
+                self._echec(ligne, resultat.erreur)
+
+    def _preparer(self, ligne: tuple) -> tuple[OperationCalendrier | None, 'RendezVous | None']:
+        """
+        Construit la requête d'une ligne de la file à partir de l'état actuel du rendez-vous.
+
+        Args:
+            ligne (tuple): Ligne de outbox_calendrier.
+
+        Returns:
+            tuple[OperationCalendrier | None, RendezVous | None]: Requête à envoyer (None si rien à faire) et rendez-vous envoyé.
+        """
+        import app.services.calendar_api as calendar_api
+        from app.model.rendezVous import RendezVous
+
+        _, rdv_id, operation, ancienne_date, ancien_type_id, google_event_id, _, _ = ligne
+        if operation == SUPPRESSION:
+            if google_event_id is None:
+                if ancienne_date is None:
+                    # jamais envoyé à l'agenda : rien à supprimer
+                    return None, None
+                evenement = calendar_api.chercher_evenement(RendezVous(None, ancienne_date, "", ancien_type_id, "", id=rdv_id))
+                if evenement is None:
+                    return None, None
+                google_event_id = evenement["id"]
+            return OperationCalendrier(SUPPRESSION, rdv_id, event_id=google_event_id), None
+
+        rdv = RendezVous.getRendezVousById(rdv_id)
+        if rdv is None:
+            # rendez-vous supprimé entre-temps : plus rien à envoyer
+            return None, None
+        corps = calendar_api.create_event(rdv)
+        if operation == INSERTION:
+            return OperationCalendrier(INSERTION, rdv_id, corps), rdv
+        event_id = rdv.google_event_id
+        if event_id is None:
+            evenement = calendar_api.chercher_evenement(RendezVous(rdv.patient_id, ancienne_date, rdv.motif, ancien_type_id, rdv.presence, rdv.facture_id, rdv.id))
+            if evenement is None:
+                # aucun événement à modifier dans l'agenda : il est créé
+                return OperationCalendrier(INSERTION, rdv_id, corps), rdv
+            event_id = evenement["id"]
+        return OperationCalendrier(MODIFICATION, rdv_id, corps, event_id), rdv
+
+    def _terminer(self, ligne: tuple, rdv: 'RendezVous | None', event_id: str | None) -> None:
+        """
+        Retire de la file une opération envoyée, sauf si le rendez-vous a changé pendant l'envoi.
+
+        Args:
+            ligne (tuple): Ligne de outbox_calendrier.
+            rdv (RendezVous | None): Rendez-vous envoyé (None pour une suppression).
+            event_id (str | None): Evénement créé ou modifié.
+        """
+        operation_id, version = ligne[0], ligne[6]
+        with session(ecriture=True) as connexion:
+            if rdv is not None:
+                # modifié ou supprimé pendant l'envoi : l'événement existe désormais avec l'état
+                # envoyé, la ligne repart de cet état (une insertion devient une modification)
+                connexion.execute(
+                    "UPDATE outbox_calendrier SET operation = CASE operation WHEN ? THEN ? ELSE ? END,"
+                    " ancienne_date = ?, ancien_type_id = ?, google_event_id = ? WHERE id = ? AND version <> ?",
+                    (SUPPRESSION, SUPPRESSION, MODIFICATION, rdv.date, rdv.type_id, event_id, operation_id, version)
+                )
+            connexion.execute("DELETE FROM outbox_calendrier WHERE id = ? AND version = ?", (operation_id, version))
+
+    def _echec(self, ligne: tuple, erreur: ErreurCalendrier) -> None:
+        """
+        Reporte une opération en échec avec un délai croissant si l'erreur est temporaire.
+        Après une erreur définitive, ou TENTATIVES_MAX échecs, l'opération est abandonnée :
+        elle reste dans la file avec sa dernière erreur (operations_abandonnees) sans être réessayée.
+
+        Args:
+            ligne (tuple): Ligne de outbox_calendrier.
+            erreur (ErreurCalendrier): Erreur classée.
+        """
+        operation_id, rdv_id, version, tentatives = ligne[0], ligne[1], ligne[6], ligne[7] + 1
+        abandon = not erreur.reessayable or tentatives >= TENTATIVES_MAX
+        with session(ecriture=True) as connexion:
+            connexion.execute(
+                "UPDATE outbox_calendrier SET tentatives = ?, prochain_essai = ?, derniere_erreur = ?, abandonnee = ? WHERE id = ? AND version = ?",
+                (tentatives, datetime.now() + delai_nouvel_essai(tentatives), str(erreur), int(abandon), operation_id, version)
+            )
+        print(f"[ERREUR CALENDAR] rendez-vous {rdv_id} (essai {tentatives}{', abandonné' if abandon else ''}) : {erreur}")
+
+
+# Instance unique, démarrée au lancement de l'application
+synchro = SynchroCalendrier()
@@ -0,0 +1,151 @@
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Etapes qui terminent le démarrage : le rapport est écrit quand toutes ont été marquées
+ETAPES_FINALES = ("premier affichage", "liste des patients affichée")
+# Journal des démarrages, à côté de la base (un bloc par lancement)
+CHEMIN_JOURNAL = os.path.join(os.environ.get('APPDATA', '.'), 'CabiLib', 'demarrage.log')
+# Au-delà de cette taille, le journal est repris à zéro
+TAILLE_MAX_JOURNAL = 256 * 1024
+
+
+def debut_processus() -> float | None:
+    """
+    Heure de création du processus (démarrage de l'interpréteur, ou du programme
+    extrait par PyInstaller), au format de time.time().
+
+    Returns:
+        float | None: Horodatage, None si le système ne le donne pas.
+    """
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            creation, sortie, noyau, utilisateur = (wintypes.FILETIME() for _ in range(4))
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.GetProcessTimes(kernel32.GetCurrentProcess(), ctypes.byref(creation), ctypes.byref(sortie), ctypes.byref(noyau), ctypes.byref(utilisateur)):
+                return None
+            # centaines de nanosecondes depuis le 1er janvier 1601
+            return ((creation.dwHighDateTime << 32) | creation.dwLowDateTime) / 1e7 - 11644473600
+        with open("/proc/self/stat") as fichier:
+            # 22e champ : démarrage du processus en tops d'horloge depuis le démarrage du système
+            depart = int(fichier.read().rsplit(")", 1)[1].split()[19]) / os.sysconf("SC_CLK_TCK")
+        with open("/proc/uptime") as fichier:
+            en_marche = float(fichier.read().split()[0])
+        return time.time() - (en_marche - depart)
+    except Exception:
+        return None
+
+
+class TraceDemarrage:
+    """
+    Horodatage des étapes du démarrage (imports, ouverture de la base, premier onglet,
+    chargement des patients, premier affichage), écrit dans CHEMIN_JOURNAL une fois
+    le démarrage terminé.
+
+    Chaque étape n'est retenue qu'à sa première occurrence : les appels suivants
+    (rechargements, nouveaux affichages) sont ignorés.
+    """
+    etapes: list[tuple[str, float]]
+
+    def __init__(self) -> None:
+        """
+        Initialise la trace, datée du démarrage du processus quand il est connu.
+        """
+        self.etapes = []
+        self._verrou = threading.Lock()
+        self._termine = False
+        debut = debut_processus()
+        if debut is not None:
+            self.etapes.append(("démarrage du processus", debut))
+
+    def __repr__(self) -> str:
+        """
+        Retourne une représentation textuelle de la trace.
+
+        Returns:
+            str: Représentation lisible de la trace.
+        """
+        return f"TraceDemarrage({len(self.etapes)} étape(s), {'terminée' if self._termine else 'en cours'})"
+
+    def marquer(self, etape: str) -> None:
+        """
+        Horodate une étape (utilisable depuis n'importe quel thread).
+
+        Args:
+            etape (str): Nom de l'étape.
+        """
+        maintenant = time.time()
+        with self._verrou:
+            if self._termine or any(nom == etape for nom, _ in self.etapes):
+                return
+            self.etapes.append((etape, maintenant))
+            noms = {nom for nom, _ in self.etapes}
+            self._termine = all(finale in noms for finale in ETAPES_FINALES)
+            if not self._termine:
+                return
+        self.enregistrer(self.rapport())
+
+    def rapport(self) -> str:
+        """
+        Construit le tableau des étapes, en millisecondes depuis la première.
+
+        Returns:
+            str: Rapport lisible (une ligne par étape, avec l'écart à la précédente).
+        """
+        with self._verrou:
+            etapes = sorted(self.etapes, key=lambda etape: etape[1])
+        if not etapes:
+            return "Démarrage : aucune étape"
+        origine = etapes[0][1]
+        executable = os.path.basename(sys.executable) + (" (PyInstaller)" if getattr(sys, "frozen", False) else "")
+        lignes = [f"Démarrage du {datetime.fromtimestamp(origine):%Y-%m-%d %H:%M:%S} ({executable})"]
+        precedent = origine
+        for nom, instant in etapes:
+            lignes.append(f"  {(instant - origine) * 1000:8.0f} ms  (+{(instant - precedent) * 1000:6.0f} ms)  {nom}")
+            precedent = instant
+        return "\n".join(lignes)
+
+    def enregistrer(self, rapport: str) -> None:
+        """
+        Ajoute un rapport au journal des démarrages.
+
+        Args:
+            rapport (str): Rapport à écrire.
+        """
+        try:
+            os.makedirs(os.path.dirname(CHEMIN_JOURNAL), exist_ok=True)
+            mode = "w" if os.path.exists(CHEMIN_JOURNAL) and os.path.getsize(CHEMIN_JOURNAL) > TAILLE_MAX_JOURNAL else "a"
+            with open(CHEMIN_JOURNAL, mode, encoding="utf-8") as journal:
+                journal.write(rapport + "\n\n")
+        except OSError as e:
+            print(f"[ERREUR] {e}")
+
+
+def suivre_premier_affichage(fenetre) -> None:
+    """
+    Marque l'étape "premier affichage" au premier dessin de la fenêtre.
+    PySide6 n'est importé qu'ici : le module peut être chargé avant Qt.
+
+    Args:
+        fenetre (QWidget): Fenêtre principale, avant son affichage.
+    """
+    from PySide6.QtCore import QEvent, QObject
+
+    class _PremierAffichage(QObject):
+        def eventFilter(self, objet, evenement) -> bool:
+            if evenement.type() == QEvent.Type.Paint:
+                trace.marquer("premier affichage")
+                objet.removeEventFilter(self)
+            return False
+
+    # le filtre a la fenêtre pour parent : il vit aussi longtemps qu'elle
+    fenetre.installEventFilter(_PremierAffichage(fenetre))
+
+
+# Instance unique, créée au premier import (en tête de main.py)
+trace = TraceDemarrage()
@@ -1,6 +1,7 @@
 from PySide6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QDateEdit,
                                QRadioButton, QButtonGroup, QLabel, QComboBox,
-                               QCompleter, QPushButton, QMessageBox, QErrorMessage)
+                               QCompleter, QPushButton, QMessageBox, QErrorMessage,
+                               QProgressBar)
 from PySide6.QtCore import Qt, Signal
 from app.model.facture import Facture
 from app.widgetPersonalise.separator import Separator
@@ -19,6 +20,8 @@ class creerFactureView(QWidget):
     """Signal émis pour générer une facture individuelle (date de début, date de fin, id patient)."""
     refresh: Signal = Signal()
     """Signal pour rafraîchir la vue de facturation."""
+    annuler_facturation: Signal = Signal()
+    """Signal émis pour interrompre la facturation de masse en cours."""
     
     def __init__(self) -> None:
         """
@@ -113,6 +116,21 @@ class creerFactureView(QWidget):
         self.creer_button.clicked.connect(self.on_creer_clicked)
         self.main_layout.addWidget(self.creer_button)
 
+        # Avancement de la facturation de masse
+        self.progression_widget = QWidget()
+        self.progression_widget.setHidden(True)
+        progression_layout = QVBoxLayout(self.progression_widget)
+        self.progression_label = QLabel()
+        progression_layout.addWidget(self.progression_label)
+        barre_layout = QHBoxLayout()
+        self.progression_bar = QProgressBar()
+        barre_layout.addWidget(self.progression_bar)
+        self.annuler_button = QPushButton("Annuler")
+        self.annuler_button.clicked.connect(self.on_annuler_clicked)
+        barre_layout.addWidget(self.annuler_button)
+        progression_layout.addLayout(barre_layout)
+        self.main_layout.addWidget(self.progression_widget)
+
     def on_refresh(self):
         self.refresh.emit()
 
@@ -186,7 +204,74 @@ class creerFactureView(QWidget):
         
         QMessageBox.information(self, "Facture générée", msg)
 
+    def afficher_erreur(self, message: str, erreur: Exception):
+        """Afficher l'échec d'un chargement"""
+        QMessageBox.critical(self, "Facturation", f"{message}\n\n{erreur}")
+
     def erreur_generation_facture(self):
         """Afficher une erreur de génération de facture"""
         msg = "Aucune facture n'a pu être générée pour le patient sélectionné."
-        QMessageBox.warning(self, "Erreur de génération de facture", msg)
\ No newline at end of file
+        QMessageBox.warning(self, "Erreur de génération de facture", msg)
+
+    def on_annuler_clicked(self):
+        """Demander l'arrêt de la facturation de masse"""
+        self.annuler_button.setEnabled(False)
+        self.progression_label.setText("Annulation en cours...")
+        self.annuler_facturation.emit()
+
+    def debut_preparation_facturation(self):
+        """Afficher le calcul des factures en cours et bloquer le lancement d'une autre facturation"""
+        self.creer_button.setEnabled(False)
+        self.annuler_button.setEnabled(False)
+        # barre sans fin : le nombre de factures n'est pas encore connu
+        self.progression_bar.setRange(0, 0)
+        self.progression_label.setText("Calcul des factures...")
+        self.progression_widget.setHidden(False)
+
+    def debut_facturation_masse(self, total: int):
+        """Afficher la barre d'avancement et bloquer le lancement d'une autre facturation"""
+        self.creer_button.setEnabled(False)
+        self.annuler_button.setEnabled(True)
+        self.progression_bar.setRange(0, total)
+        self.progression_bar.setValue(0)
+        self.progression_label.setText(f"Génération de {total} facture(s)...")
+        self.progression_widget.setHidden(False)
+
+    def afficher_progression_facturation(self, traites: int, total: int, message: str):
+        """Mettre à jour l'avancement de la facturation de masse"""
+        self.progression_bar.setRange(0, total)
+        self.progression_bar.setValue(traites)
+        if self.annuler_button.isEnabled():
+            self.progression_label.setText(f"{traites}/{total} - {message}")
+
+    def afficher_bilan_facturation(self, bilan):
+        """Afficher le résumé de la facturation de masse"""
+        self.progression_widget.setHidden(True)
+        self.creer_button.setEnabled(True)
+
+        msg = "Facturation interrompue.\n\n" if bilan.annule else ""
+        msg += f"{len(bilan.factures)} facture(s) générée(s) :\n"
+        for fac in bilan.factures:
+            msg += f"- Facture N° {fac.id} pour le patient ID {fac.patient_id}\n"
+        if bilan.sans_facture:
+            msg += f"\n{len(bilan.sans_facture)} patient(s) sans rendez-vous à facturer.\n"
+        if bilan.a_renseigner:
+            msg += "\nPatients non facturés (présence à renseigner) :\n"
+            for patient in bilan.a_renseigner:
+                msg += f"- {patient.prenom} {patient.nom}\n"
+        if bilan.sans_pdf:
+            msg += "\nFactures enregistrées sans PDF (à regénérer) :\n"
+            for fac in bilan.sans_pdf:
+                msg += f"- Facture N° {fac.id}\n"
+        if bilan.non_traites:
+            msg += f"\n{len(bilan.non_traites)} patient(s) non traité(s) après l'annulation.\n"
+        if bilan.erreurs:
+            msg += "\nErreurs :\n"
+            for patient, erreur in bilan.erreurs:
+                nom = f"{patient.prenom} {patient.nom}" if patient is not None else "Facturation"
+                msg += f"- {nom} : {erreur}\n"
+
+        if bilan.erreurs or bilan.annule:
+            QMessageBox.warning(self, "Facturation terminée", msg)
+        else:
+            QMessageBox.information(self, "Facturation terminée", msg)
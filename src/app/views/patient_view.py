@@ -1,9 +1,10 @@
-from PySide6.QtWidgets import (QMainWindow, QWidget, QGridLayout, QTableWidget, 
-                               QTableWidgetItem, QLabel, QPushButton, QLineEdit,QComboBox,QDateEdit, QTextEdit, QCompleter)
+from PySide6.QtWidgets import (QMainWindow, QWidget, QGridLayout, QTableView,
+                               QLabel, QPushButton, QLineEdit,QComboBox,QDateEdit, QTextEdit, QCompleter, QMessageBox)
 from PySide6.QtCore import Qt, Signal, QStringListModel,QMargins
 
 from app.model.patient import Patient
 from app.services import constantes_manager
+from app.widgetPersonalise.patient_table import PatientTableModel, PatientFiltreProxy, COLONNE_ID
 import datetime
 
 
@@ -54,19 +55,21 @@ class PatientView(QWidget):
         self.search_bar.textEdited.connect(self.search_changed.emit)
         main_grid.addWidget(self.search_bar, 0, 0)
         
-        # Table des patients
-        self.patient_table = QTableWidget()
-        self.patient_table.setColumnCount(11)
-        self.patient_table.setHorizontalHeaderLabels(["ID", "Nom", "Prenom", "Age","Niveau scolaire","Ecole", "Date de Naissance", "Ville", "Téléphone", "Email","Etat du suivi"])
-        self.patient_table.setColumnHidden(0, True)  # Cacher la colonne ID
+        # Table des patients : le modèle lit la liste par colonnes, la recherche filtre les lignes à travers un proxy
+        self.patient_model = PatientTableModel(self)
+        self.patient_proxy = PatientFiltreProxy(self)
+        self.patient_proxy.setSourceModel(self.patient_model)
+        self.patient_table = QTableView()
+        self.patient_table.setModel(self.patient_proxy)
+        self.patient_table.setColumnHidden(COLONNE_ID, True)  # Cacher la colonne ID
         self.patient_table.setColumnWidth(3,50)
         self.patient_table.setColumnWidth(5,150)
         self.patient_table.setColumnWidth(9,300)
-        self.patient_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.patient_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.patient_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.patient_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.patient_table.setSelectionBehavior(QTableView.SelectRows)
+        self.patient_table.setSelectionMode(QTableView.SingleSelection)
         self.patient_table.horizontalHeader().setStretchLastSection(True)
-        self.patient_table.cellClicked.connect(lambda row, col: self.patient_selected.emit(row))
+        self.patient_table.clicked.connect(lambda index: self.patient_selected.emit(self.patient_proxy.mapToSource(index).row()))
         self.patient_table.setSortingEnabled(True)
         main_grid.addWidget(self.patient_table, 1, 0, 1, 2)
         main_grid.setRowStretch(1, 2)  # La table prend 2x plus de place que les autres lignes
@@ -226,38 +229,21 @@ class PatientView(QWidget):
         self.refresh.emit()
 
 
-    def load_patients(self, patients_data):
-        """Charger les données des patients dans la table
+    def load_patients(self, liste_patients):
+        """Charger la liste des patients dans la table
         
         Args:
-            patients_data: Liste de Patient
+            liste_patients: ListePatients (colonnes de la liste, sans le détail des patients)
         """
-        self.patient_table.setSortingEnabled(False)  # Désactiver le tri pendant l'insertion
-        self.patient_table.setRowCount(0)
-        for patient in patients_data:
-            row_position = self.patient_table.rowCount()
-            self.patient_table.insertRow(row_position)
-    
-            self.patient_table.setItem(row_position, 0, QTableWidgetItem(str(patient.id)))
-            self.patient_table.setItem(row_position, 1, QTableWidgetItem(patient.nom))
-            self.patient_table.setItem(row_position, 2, QTableWidgetItem(str(patient.prenom)))
-            
-            # Age - avec tri numérique
-            age_item = QTableWidgetItem()
-            age_item.setData(Qt.DisplayRole, (datetime.datetime.now() - patient.date_naissance).days // 365)  # Utiliser setData pour tri numérique
-            self.patient_table.setItem(row_position, 3, age_item)
-
-            self.patient_table.setItem(row_position, 4, QTableWidgetItem(patient.niveau))
-            self.patient_table.setItem(row_position, 5, QTableWidgetItem(patient.ecole))
-
-            self.patient_table.setItem(row_position, 6, QTableWidgetItem(patient.date_naissance.strftime("%Y-%m-%d")))
-
-            self.patient_table.setItem(row_position, 7, QTableWidgetItem(patient.ville))
-            self.patient_table.setItem(row_position, 8, QTableWidgetItem(patient.telephone1))
-            self.patient_table.setItem(row_position, 9, QTableWidgetItem(patient.email))
-            self.patient_table.setItem(row_position,10,QTableWidgetItem(patient.etat_suivi))
-        
-        self.patient_table.setSortingEnabled(True)  # Réactiver le tri
+        self.patient_model.set_liste(liste_patients)
+
+    def ajouter_patient(self, patient):
+        """Ajouter un patient créé à la table"""
+        self.patient_model.ajouter(patient)
+
+    def retirer_patient(self, patient_id):
+        """Retirer un patient supprimé de la table"""
+        self.patient_model.retirer(patient_id)
     
     def display_patient_details(self, patient ):
         """Afficher les détails d'un patient dans le formulaire"""
@@ -303,46 +289,47 @@ class PatientView(QWidget):
         )
     
     def get_selected_row(self):
-        """Récupérer la ligne sélectionnée"""
-        selected_items = self.patient_table.selectedItems()
-        if selected_items:
-            return selected_items[0].row()
+        """Récupérer la ligne sélectionnée (dans le modèle de la table)"""
+        selected_rows = self.patient_table.selectionModel().selectedRows()
+        if selected_rows:
+            return self.patient_proxy.mapToSource(selected_rows[0]).row()
         return None
+
+    def patient_id_a(self, row):
+        """Récupérer l'identifiant du patient d'une ligne"""
+        return self.patient_model.patient_id(row)
     
     def update_table_row(self, row, patient):
         """Mettre à jour une ligne dans la table"""
-        # ID - avec tri numérique
-        id_item = QTableWidgetItem()
-        id_item.setData(Qt.DisplayRole, patient.id)
-        self.patient_table.setItem(row, 0, id_item)
-        
-        self.patient_table.setItem(row, 1, QTableWidgetItem(patient.nom))
-        self.patient_table.setItem(row, 2, QTableWidgetItem(patient.prenom))
-        
-        # Age - avec tri numérique
-        age_item = QTableWidgetItem()
-        age_item.setData(Qt.DisplayRole, (datetime.datetime.now() - patient.date_naissance).days // 365)
-        self.patient_table.setItem(row, 3, age_item)
+        self.patient_model.mettre_a_jour(row, patient)
 
-        self.patient_table.setItem(row, 4, QTableWidgetItem(patient.niveau))
-        self.patient_table.setItem(row, 5, QTableWidgetItem(patient.ecole))
-        
-        self.patient_table.setItem(row, 6, QTableWidgetItem(patient.date_naissance.strftime("%Y-%m-%d")))
-        self.patient_table.setItem(row, 7, QTableWidgetItem(patient.ville))
-        self.patient_table.setItem(row, 8, QTableWidgetItem(patient.telephone1))
-        self.patient_table.setItem(row, 9, QTableWidgetItem(patient.email))
-        self.patient_table.setItem(row,10,QTableWidgetItem(patient.etat_suivi))
+    def restaurer_patient(self, patient):
+        """Remettre la ligne d'un patient aux valeurs enregistrées en base (modification refusée)"""
+        if patient is None:
+            return
+        row = self.patient_model.liste.ligne(patient.id)
+        if row is not None:
+            self.patient_model.mettre_a_jour(row, patient)
+
+    def afficher_erreur(self, message, erreur):
+        """Afficher l'échec d'un chargement ou d'un enregistrement
+
+        Args:
+            message: Ce qui n'a pas pu être fait
+            erreur: Erreur levée
+        """
+        QMessageBox.critical(self, "Patients", f"{message}\n\n{erreur}")
     
-    def filter_rows(self, search_text):
-        """Filtrer les lignes selon le texte de recherche"""
-        for row in range(self.patient_table.rowCount()):
-            match = False
-            for column in range(1,self.patient_table.columnCount()):
-                item = self.patient_table.item(row, column)
-                if item and search_text.lower() in item.text().lower():
-                    match = True
-                    break
-            self.patient_table.setRowHidden(row, not match)
+    def filtrer_patients(self, patient_ids):
+        """Filtrer les lignes selon le résultat de la recherche
+        
+        Args:
+            patient_ids: Identifiants trouvés, par pertinence (None pour afficher tous les patients)
+        """
+        self.patient_proxy.set_resultats(patient_ids)
+        if patient_ids is not None:
+            # Afficher les résultats par pertinence
+            self.patient_table.sortByColumn(COLONNE_ID, Qt.AscendingOrder)
     
     def _on_validate_clicked(self):
         """Gérer le clic sur le bouton Valider"""
@@ -361,7 +348,7 @@ class PatientView(QWidget):
         """Gérer le clic sur le bouton Supprimer le patient"""
         selected_row = self.get_selected_row()
         if selected_row is not None:
-            patient_id = int(self.patient_table.item(selected_row, 0).text())
+            patient_id = self.patient_id_a(selected_row)
             # Émettre un signal ou appeler une méthode du controller pour supprimer le patient
             self.patient_deleted.emit(patient_id)
             self.patient_table.clearSelection()
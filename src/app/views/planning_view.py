@@ -1,16 +1,32 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                               QTableWidgetItem, QPushButton, QLabel, QHeaderView,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                               QPushButton, QLabel, QHeaderView,
                                QToolTip, QComboBox, QCompleter,QFrame,QDateEdit,QTimeEdit,
-                               QMessageBox)
+                               QMessageBox, QStackedWidget, QScrollArea, QDialog,
+                               QDialogButtonBox, QTableWidget, QTableWidgetItem)
 from PySide6.QtCore import Qt, Signal, QStringListModel, QTime
-from PySide6.QtGui import QColor, QFont, QCursor
+from PySide6.QtGui import QFont, QCursor
 from datetime import datetime, timedelta
-from app.model.rendezVous import RendezVous
+from app.model.rendezVous import RendezVous, RendezVousSemaine
 from app.model.typeRDV import TypeRDV
 from app.model.patient import Patient
 
 from app.widgetPersonalise.separator import Separator
+from app.widgetPersonalise.planning_grille import PlanningModel, PlanningDelegate
+from app.widgetPersonalise.planning_apercu import ApercuOccupation
 from app.services import constantes_manager
+from app.services.recurrence import RegleRecurrence
+from app.services.calendrier_lots import INSERTION, MODIFICATION, SUPPRESSION
+
+# Modes d'affichage du planning : nom affiché et libellés des boutons de navigation
+MODES_PLANNING = {
+    "Semaine": ("◀ Semaine précédente", "Semaine suivante ▶"),
+    "Mois": ("◀ Mois précédent", "Mois suivant ▶"),
+    "4 semaines": ("◀ 4 semaines précédentes", "4 semaines suivantes ▶"),
+    "Trimestre": ("◀ Trimestre précédent", "Trimestre suivant ▶"),
+}
+
+# Libellés des opérations de la file de synchronisation avec Google Agenda
+OPERATIONS_SYNCHRO = {INSERTION: "Création", MODIFICATION: "Modification", SUPPRESSION: "Suppression"}
 
 class PlanningView(QWidget):
     """Vue pour afficher le planning hebdomadaire des rendez-vous"""
@@ -26,8 +42,16 @@ class PlanningView(QWidget):
     """Signal émis lors de la demande de suppression d'un rendez-vous."""
     creer_clicked: Signal = Signal(object)
     """Signal émis lors de la création d'un rendez-vous."""
+    creer_serie_clicked: Signal = Signal(object, object)
+    """Signal émis lors de la création d'une série de rendez-vous (rendez-vous modèle, règle de récurrence)."""
     refresh: Signal = Signal()
     """Signal pour rafraîchir la vue du planning."""
+    mode_changed: Signal = Signal(str)
+    """Signal émis lors du changement de mode d'affichage (Semaine, Mois, 4 semaines, Trimestre)."""
+    jour_apercu_clicked: Signal = Signal(object)
+    """Signal émis lors du clic sur un jour de la vue d'ensemble (date)."""
+    relancer_synchro_clicked: Signal = Signal()
+    """Signal émis lors de la demande d'un nouvel essai des envois à Google Agenda en échec."""
     
     def __init__(self) -> None:
         """
@@ -83,7 +107,6 @@ class PlanningView(QWidget):
         idpatient_layout.addWidget(self.patient_input)
 
         presence_option = constantes_manager.get_constante("PRESENCE_OPTIONS") or []
-        print("Presence options loaded:", presence_option)
         self.presence_input = QComboBox()
         self.presence_input.addItems(presence_option)
         self.presence_input.setEditable(True)
@@ -132,6 +155,21 @@ class PlanningView(QWidget):
         self.type_rdv_input.setCompleter(self.type_rdv_completer)
         type_rdv_layout.addWidget(self.type_rdv_input)
 
+        #répétition du RDV (série hebdomadaire)
+        repetition_layout = QHBoxLayout()
+        rdv_panel_layout.addLayout(repetition_layout)
+        repetition_layout.addWidget(QLabel("Répéter :"))
+        self.repetition_input = QComboBox()
+        self.repetition_input.addItem("Jamais", 0)
+        self.repetition_input.addItem("Chaque semaine", 1)
+        self.repetition_input.addItem("Toutes les 2 semaines", 2)
+        repetition_layout.addWidget(self.repetition_input)
+        repetition_layout.addWidget(QLabel("Jusqu'au :"))
+        self.repetition_fin_input = QDateEdit()
+        self.repetition_fin_input.setCalendarPopup(True)
+        self.repetition_fin_input.setDate(datetime.now().date() + timedelta(weeks=12))
+        repetition_layout.addWidget(self.repetition_fin_input)
+
         rdv_panel_layout.addWidget(Separator(Qt.Horizontal))
         actions_layout = QHBoxLayout()
         rdv_panel_layout.addLayout(actions_layout)
@@ -169,14 +207,17 @@ class PlanningView(QWidget):
         header_layout.addWidget(self.btn_previous)
         header_layout.addWidget(self.label_week, 1)
         header_layout.addWidget(self.btn_next)
+
+        self.mode_input = QComboBox()
+        self.mode_input.addItems(list(MODES_PLANNING))
+        self.mode_input.currentTextChanged.connect(self.mode_changed.emit)
+        header_layout.addWidget(self.mode_input)
         
         planning_layout.addLayout(header_layout)
         
-        # Tableau du planning
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)  # Heure + 6 jours (Lundi à Samedi)
-        self.table.setHorizontalHeaderLabels(["Heure", "Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi"])
-        
+        # Tableau du planning : les cellules sont calculées par le modèle, dessinées par le délégué
+        self.table = QTableView()
+
         # Créneaux horaires de 8h à 20h par tranches de 15 min
         self.time_slots : list[str] = []
         heure_debut = constantes_manager.get_constante("HEURE_DEBUT")or "08:00"
@@ -187,38 +228,28 @@ class PlanningView(QWidget):
         for hour in range(h_debut, h_fin):
             for minute in range(0, 60, precision):
                 self.time_slots.append(f"{hour:02d}:{minute:02d}")
-        
-        self.table.setRowCount(len(self.time_slots))
-        
-        # Remplir la colonne des heures
-        for i, time_slot in enumerate(self.time_slots):
-            item = QTableWidgetItem(time_slot)
-            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsDragEnabled)
-            
-            item.setTextAlignment(Qt.AlignCenter)
-            font = QFont()
-            font.setBold(True)
-            item.setFont(font)
-            self.table.setItem(i, 0, item)
-            self.table.setRowHeight(i, 20)  # Hauteur fixe pour chaque ligne
-            
-        
+
+        self.planning_model = PlanningModel(self.time_slots, precision, self)
+        self.table.setModel(self.planning_model)
+        self.table.setItemDelegate(PlanningDelegate(self.table))
+        self.table.verticalHeader().setDefaultSectionSize(20)  # Hauteur fixe pour chaque ligne
+
         # Configurer la table
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.verticalHeader().setVisible(False)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionMode(QTableWidget.NoSelection)  # Empêche la sélection multiple
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)  # Empêche l'édition
-        self.table.cellClicked.connect(self.on_cell_clicked)
+        self.table.setSelectionMode(QTableView.NoSelection)  # Empêche la sélection multiple
+        self.table.setEditTriggers(QTableView.NoEditTriggers)  # Empêche l'édition
+        self.table.clicked.connect(lambda index: self.on_cell_clicked(index.row(), index.column()))
 
         # Activer le tracking de la souris pour les tooltips instantanés
         self.table.setMouseTracking(True)
         self.table.viewport().setMouseTracking(True)
-        self.table.cellEntered.connect(self.show_instant_tooltip)
+        self.table.entered.connect(lambda index: self.show_instant_tooltip(index.row(), index.column()))
 
         # Améliorer la lisibilité
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #d0d0d0;
                 font-size: 10px;
                 selection-background-color: transparent;
@@ -228,7 +259,29 @@ class PlanningView(QWidget):
         # Ajuster la hauteur des lignes pour tenir dans l'écran
         #self.table.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-        planning_layout.addWidget(self.table)
+        # Vue d'ensemble (mois, 4 semaines, trimestre) : occupation agrégée dessinée par un seul widget
+        self.apercu = ApercuOccupation()
+        self.apercu.jour_clicked.connect(self.jour_apercu_clicked.emit)
+        self.apercu_scroll = QScrollArea()
+        self.apercu_scroll.setWidgetResizable(True)
+        self.apercu_scroll.setWidget(self.apercu)
+
+        self.planning_stack = QStackedWidget()
+        self.planning_stack.addWidget(self.table)
+        self.planning_stack.addWidget(self.apercu_scroll)
+        planning_layout.addWidget(self.planning_stack)
+
+        # Etat de la synchronisation avec Google Agenda : le détail des échecs s'ouvre au clic
+        synchro_layout = QHBoxLayout()
+        synchro_layout.addStretch(1)
+        self.synchro_btn = QPushButton()
+        self.synchro_btn.setFlat(True)
+        self.synchro_btn.setEnabled(False)
+        self.synchro_btn.clicked.connect(self.afficher_operations_abandonnees)
+        synchro_layout.addWidget(self.synchro_btn)
+        planning_layout.addLayout(synchro_layout)
+        self.operations_abandonnees: list[tuple] = []
+        self.erreur_synchro: Exception | None = None
         
     def on_refresh(self):
         """Rafraîchir la vue du planning"""
@@ -245,117 +298,100 @@ class PlanningView(QWidget):
         
         # Récupérer l'heure et le jour
         day_index = col - 1  # 0=Lundi, 1=Mardi, etc.
-        print(self.table.item(row, col).text().split('\n'))
-        text = self.table.item(row, col).text()
-        time_slot = ""
-        if text == "":
-            print("Cellule vide cliquée")
+        ligne = self.planning_model.rdv_a(row, col)
+        if ligne is None:
             time_slot = self.time_slots[row]  # Utiliser le créneau horaire de la ligne
-            
         else :
-            time_slot = self.table.item(row, col).text().split('\n')[0].split('-')[0]  # Extraire l'heure de début via le texte du rdv
+            time_slot = ligne.rdv.date.strftime('%H:%M')  # Heure de début du rdv
         
         # Emettre le signal avec les infos
         self.cell_clicked.emit(day_index, time_slot)
     
     def show_instant_tooltip(self, row, col):
         """Afficher le tooltip instantanément"""
-        item = self.table.item(row, col)
-        if item and item.toolTip():
-            QToolTip.showText(QCursor.pos(), item.toolTip(), self.table)
+        tooltip = self.planning_model.index(row, col).data(Qt.ToolTipRole)
+        if tooltip:
+            QToolTip.showText(QCursor.pos(), tooltip, self.table)
     
     def set_week_label(self, start_date, end_date):
         """Définir le label de la semaine"""
-        try:
-            text = f"Semaine du {start_date.strftime('%d/%m/%Y')} au {end_date.strftime('%d/%m/%Y')}"
-            self.label_week.setText(text)
-            headers = [
-                "Heure",
-                "Lundi " + (start_date + timedelta(days=0)).strftime('%d/%m'),
-                "Mardi " + (start_date + timedelta(days=1)).strftime('%d/%m'),
-                "Mercredi " + (start_date + timedelta(days=2)).strftime('%d/%m'),
-                "Jeudi " + (start_date + timedelta(days=3)).strftime('%d/%m'),
-                "Vendredi " + (start_date + timedelta(days=4)).strftime('%d/%m'),
-                "Samedi " + (start_date + timedelta(days=5)).strftime('%d/%m')
-            ]
-            if not hasattr(self, 'table') or self.table is None:
-                print("[PlanningView] ERREUR: self.table n'existe pas ou est None !")
-                return
-            if self.table.columnCount() != len(headers):
-                print(f"[PlanningView] Correction du nombre de colonnes: table attend {self.table.columnCount()} colonnes, headers={len(headers)}")
-                self.table.setColumnCount(len(headers))
-            self.table.setHorizontalHeaderLabels(headers)
-        except Exception as e:
-            import traceback
-            print("Erreur dans set_week_label:", e)
-            traceback.print_exc()
+        text = f"Semaine du {start_date.strftime('%d/%m/%Y')} au {end_date.strftime('%d/%m/%Y')}"
+        self.label_week.setText(text)
+        # Les en-têtes des jours sont calculés par le modèle
+        self.planning_model.set_debut_semaine(start_date)
     
+    def set_periode_label(self, text: str) -> None:
+        """Définir le label de la période affichée par la vue d'ensemble"""
+        self.label_week.setText(text)
+
+    def set_mode(self, mode: str) -> None:
+        """
+        Afficher la grille de la semaine ou la vue d'ensemble
+        Args:
+            mode (str): Mode d'affichage, clé de MODES_PLANNING.
+        """
+        self.mode_input.blockSignals(True)
+        self.mode_input.setCurrentText(mode)
+        self.mode_input.blockSignals(False)
+        precedent, suivant = MODES_PLANNING[mode]
+        self.btn_previous.setText(precedent)
+        self.btn_next.setText(suivant)
+        self.planning_stack.setCurrentWidget(self.table if mode == "Semaine" else self.apercu_scroll)
+
+    def set_apercu(self, debut, nb_semaines: int, occupation: dict, mois: int | None = None) -> None:
+        """
+        Afficher l'occupation d'une période dans la vue d'ensemble
+        Args:
+            debut (date): Lundi de la première semaine affichée.
+            nb_semaines (int): Nombre de semaines affichées.
+            occupation (dict[date, OccupationJour]): Occupation de chaque jour de la période.
+            mois (int | None, optionnel): Mois affiché en vue mois.
+        """
+        self.apercu.set_periode(debut, nb_semaines, occupation, mois)
+
     def clear_planning(self):
         """Effacer tous les rendez-vous du planning"""
-        if not hasattr(self, 'table') or self.table is None:
-            return
-        for row in range(self.table.rowCount()):
-            for col in range(1, self.table.columnCount()):
-                try:
-                    self.table.setItem(row, col, QTableWidgetItem(""))
-                    if (self.table.rowSpan(row, col) > 1 or self.table.columnSpan(row, col) > 1):
-                        self.table.setSpan(row, col, 1, 1)  # Reset span
-                except Exception as e:
-                    print(f"[PlanningView] ERREUR clear_planning: row={row}, col={col}, {e}")
+        self.planning_model.vider()
+        self.table.clearSpans()
+
+    def set_rdvs_semaine(self, start_date, lignes: list[RendezVousSemaine]) -> None:
+        """
+        Remplacer les rendez-vous affichés par ceux d'une semaine
+        Args:
+            start_date (datetime): Lundi de la semaine.
+            lignes (list[RendezVousSemaine]): Rendez-vous hydratés de la semaine.
+        """
+        self.planning_model.set_semaine(start_date, lignes)
+        self.table.clearSpans()
+        for row, col, hauteur in self.planning_model.fusions():
+            self.table.setSpan(row, col, hauteur, 1)  # Fusionner les cellules selon la durée
     
-    def add_rdv_to_planning(self,Rdv:RendezVous,patient:Patient,type_rendez_vous:TypeRDV) -> None:
+    def add_rdv_to_planning(self, ligne: RendezVousSemaine) -> None:
         """
         Ajouter un rendez-vous au planning
         Args:
-            Rdv (RendezVous): Objet RendezVous à ajouter au planning.
-            patient (Patient): Objet Patient associé au rendez-vous.
-            type_rendez_vous (TypeRDV): Objet TypeRDV associé au rendez-vous.
+            ligne (RendezVousSemaine): Rendez-vous hydraté (patient et type inclus) à ajouter au planning.
         """
-        date = Rdv.date
-        jour_index = date.weekday()  # 0=Lundi, 6=Dimanche
-        hour = date.hour
-        minute = date.minute
-        # Arrondir au créneau de 15 min le plus proche
-        rounded_minute = (minute // 15) * 15
-        time_slot = f"{hour:02d}:{rounded_minute:02d}"
-        
-        # Trouver la ligne correspondant à l'heure
-        try:
-            row = self.time_slots.index(time_slot)
-        except ValueError:
-            return  # Heure non trouvée
-        
-        col = jour_index + 1  # +1 car colonne 0 = heures
-        if (col < 1 or col >= self.table.columnCount()):
-
-            return  # Jour hors plage
-        
-        # Créer le texte du RDV - compact
-        rdv_text = f"{date.strftime('%H:%M')}-{(date +type_rendez_vous.duree).strftime('%H:%M')}\n{patient.nom} {patient.prenom}"
-        
-        item = QTableWidgetItem(rdv_text)
-        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-        item.setTextAlignment(Qt.AlignCenter)
-        
-        # Police compacte
-        font = QFont()
-        font.setPointSize(9)
-        font.setBold(True)
-        item.setFont(font)
-
-        toolTip = f"""
-        <b>{patient.nom} {patient.prenom}</b><br>
-        {date.strftime('%d/%m/%Y')}<br>
-        {date.strftime('%H:%M')} - {(date + type_rendez_vous.duree).strftime('%H:%M')}<br>
-        {type_rendez_vous.localisation}<br>
+        position = self.planning_model.ajouter(ligne)
+        if position is None:
+            return  # Heure ou jour hors plage
+        hauteur = self.planning_model.hauteur(position)
+        if hauteur > 1:
+            self.table.setSpan(position[0], position[1], hauteur, 1)  # Fusionner les cellules selon la durée
+
+    def retirer_rdv_du_planning(self, rdv_id: int) -> None:
         """
-        item.setToolTip(toolTip)
-        
-        item.setBackground(QColor(type_rendez_vous.couleur))
-
-        if type_rendez_vous.duree > timedelta(minutes=15):
-            self.table.setSpan(row, col, max(1, type_rendez_vous.duree.total_seconds() // (15 * 60)), 1)  # Fusionner les cellules selon la durée
-        self.table.setItem(row, col, item)
+        Retirer un rendez-vous du planning
+        Args:
+            rdv_id (int): Identifiant du rendez-vous à retirer.
+        """
+        position = self.planning_model.retirer(rdv_id)
+        if position is None:
+            return
+        # Recalculer la fusion avec les rendez-vous restant dans la cellule
+        hauteur = self.planning_model.hauteur(position)
+        if self.table.rowSpan(*position) != hauteur:
+            self.table.setSpan(position[0], position[1], hauteur, 1)
     
     def get_current_week_start(self):
         """Retourner la date du lundi de la semaine actuelle"""
@@ -392,34 +428,22 @@ class PlanningView(QWidget):
     def afficher_details_rdv(self):
         """Afficher les détails du rendez-vous dans le panneau"""
         if not self.rdvs_selectionne or len(self.rdvs_selectionne) == 0:
-            print("Aucun RDV sélectionné")
             return
         rdv = self.rdvs_selectionne[0]
-        print(rdv)
         if rdv is None:
-            print("RDV est None")
             return
         # Sélectionner le patient
         if(rdv.patient_id is not None):
             index = self.find_index_by_data(self.patient_input, rdv.patient_id)
-            print("[DEBUG] index patient recherché :",index)
             if index != -1:
-                try :
-                    self.patient_input.setCurrentIndex(index)
-                    print("patient_mis a jour")
-                except Exception as e:
-                    print(f"Error setting patient index: {e}")
+                self.patient_input.setCurrentIndex(index)
         else:
             self.patient_input.setCurrentIndex(0)  # Aucun
 
         # Définir la date et l'heure
         if (rdv.date is not None):
-            try : 
-                self.date_input.setDate(rdv.date.date())
-                self.time_input.setTime(rdv.date.time())
-                print("date mis a jour")
-            except Exception as e:
-                print(f"Error setting date/time: {e}")
+            self.date_input.setDate(rdv.date.date())
+            self.time_input.setTime(rdv.date.time())
         else :
             self.date_input.setDate(datetime(2000,1,1,0,1,1))
 
@@ -428,20 +452,12 @@ class PlanningView(QWidget):
             type_rdv_index = self.find_index_by_data(self.type_rdv_input, rdv.type_id)
 
             if type_rdv_index != -1:
-                try :
-                    self.type_rdv_input.setCurrentIndex(type_rdv_index)
-                    print("type mis a jour")
-                except Exception as e:
-                    print(f"Error setting type RDV index: {e}")
+                self.type_rdv_input.setCurrentIndex(type_rdv_index)
         else:
             self.type_rdv_input.setCurrentIndex(0)  # Aucun
 
         if (rdv.presence is not None):
-            try :
-                self.presence_input.setCurrentText(rdv.presence)
-                print("presence mis a jour")
-            except Exception as e:
-                print(f"Error setting presence: {e}")
+            self.presence_input.setCurrentText(rdv.presence)
         else:
             self.presence_input.setCurrentIndex(0)  # Aucun
 
@@ -453,11 +469,11 @@ class PlanningView(QWidget):
     
     def on_clear_clicked(self):
         """Effacer le formulaire de RDV"""
-        print("Clearing RDV form")
         self.patient_input.setCurrentIndex(0)
         self.date_input.setDate(datetime.now().date())
         self.time_input.setTime(datetime.now().time())
         self.type_rdv_input.setCurrentIndex(0)
+        self.repetition_input.setCurrentIndex(0)
         self.rdvs_selectionne = [RendezVous(None,None,None,None,None,None)]
 
     def on_creer_clicked(self):
@@ -469,12 +485,17 @@ class PlanningView(QWidget):
         self.rdvs_selectionne[0].type_id = int(self.type_rdv_input.currentData()) if self.type_rdv_input.currentData() is not None else None
         self.rdvs_selectionne[0].presence = self.presence_input.currentText() if self.presence_input.currentText() != "" else None
 
-        print("RDV to create/modify:", self.rdvs_selectionne[0])
+        # une série n'est proposée qu'à la création d'un nouveau rendez-vous
+        intervalle_semaines = self.repetition_input.currentData()
+        if self.rdvs_selectionne[0].id is None and intervalle_semaines:
+            regle = RegleRecurrence(intervalle_semaines, date_fin=self.repetition_fin_input.date().toPython())
+            self.creer_serie_clicked.emit(self.rdvs_selectionne[0], regle)
+            return
+
         self.creer_clicked.emit(self.rdvs_selectionne[0])
 
     def on_supprimer_clicked(self):
         """Gérer le clic sur le bouton Supprimer"""
-        print("Deleting RDV:", self.rdvs_selectionne[0])
         self.supprimer_clicked.emit(self.rdvs_selectionne[0])
         self.on_clear_clicked()
 
@@ -482,6 +503,78 @@ class PlanningView(QWidget):
         """Afficher un message indiquant que le créneau est indisponible"""
         QMessageBox.warning(self, "Créneau Indisponible", "Le créneau sélectionné est indisponible.")
 
+    def afficher_bilan_serie(self, crees: list[RendezVous], conflits: list[RendezVous]) -> None:
+        """
+        Afficher le résultat de la création d'une série de rendez-vous
+        Args:
+            crees (list[RendezVous]): Rendez-vous créés.
+            conflits (list[RendezVous]): Rendez-vous non créés car le créneau était occupé.
+        """
+        msg = f"{len(crees)} rendez-vous créé(s)."
+        if conflits:
+            msg += "\n\nCréneaux indisponibles (non créés) :\n"
+            msg += "\n".join(f"- {rdv.date.strftime('%d/%m/%Y à %H:%M')}" for rdv in conflits)
+            QMessageBox.warning(self, "Série de rendez-vous", msg)
+        else:
+            QMessageBox.information(self, "Série de rendez-vous", msg)
+
+    def afficher_erreur_serie(self, erreur: Exception) -> None:
+        """Afficher l'échec de l'enregistrement d'une série de rendez-vous"""
+        QMessageBox.critical(self, "Série de rendez-vous", f"La série n'a pas pu être enregistrée, aucun rendez-vous n'a été créé.\n\n{erreur}")
+
+    def afficher_erreur(self, message: str, erreur: Exception) -> None:
+        """Afficher l'échec d'un chargement ou d'une écriture de rendez-vous en base"""
+        QMessageBox.critical(self, "Planning", f"{message}\n\n{erreur}")
+
+    def set_etat_synchro(self, en_attente: int, abandonnees: list[tuple], erreur: Exception | None) -> None:
+        """
+        Afficher l'état de la synchronisation avec Google Agenda
+        Args:
+            en_attente (int): Nombre d'opérations en attente d'envoi.
+            abandonnees (list[tuple]): Opérations abandonnées (rendez-vous, opération, date, tentatives, dernière erreur).
+            erreur (Exception | None): Erreur ayant arrêté la synchronisation, None si elle tourne.
+        """
+        self.operations_abandonnees = abandonnees
+        self.erreur_synchro = erreur
+        if erreur is not None:
+            texte = "Google Agenda : synchronisation arrêtée"
+        elif en_attente or abandonnees:
+            texte = f"Google Agenda : {en_attente} en attente, {len(abandonnees)} en échec"
+        else:
+            texte = "Google Agenda : à jour"
+        self.synchro_btn.setText(texte)
+        self.synchro_btn.setStyleSheet("color: #c62828;" if erreur is not None or abandonnees else "")
+        self.synchro_btn.setEnabled(erreur is not None or bool(abandonnees))
+
+    def afficher_operations_abandonnees(self) -> None:
+        """Afficher les opérations non envoyées à Google Agenda avec leur dernière erreur (et proposer un nouvel essai)"""
+        dialogue = QDialog(self)
+        dialogue.setWindowTitle("Synchronisation Google Agenda")
+        dialogue.resize(700, 300)
+        layout = QVBoxLayout(dialogue)
+        if self.erreur_synchro is not None:
+            layout.addWidget(QLabel(f"La synchronisation s'est arrêtée sur une erreur :\n{self.erreur_synchro}"))
+        if self.operations_abandonnees:
+            layout.addWidget(QLabel("Ces rendez-vous n'ont pas pu être envoyés à Google Agenda :"))
+            table = QTableWidget(len(self.operations_abandonnees), 4)
+            table.setHorizontalHeaderLabels(["Rendez-vous", "Opération", "Tentatives", "Dernière erreur"])
+            table.setEditTriggers(QTableWidget.NoEditTriggers)
+            table.verticalHeader().setVisible(False)
+            table.horizontalHeader().setStretchLastSection(True)
+            for ligne, (_, operation, date, tentatives, derniere_erreur) in enumerate(self.operations_abandonnees):
+                table.setItem(ligne, 0, QTableWidgetItem(date.strftime("%d/%m/%Y à %H:%M") if date else "—"))
+                table.setItem(ligne, 1, QTableWidgetItem(OPERATIONS_SYNCHRO.get(operation, operation)))
+                table.setItem(ligne, 2, QTableWidgetItem(str(tentatives)))
+                table.setItem(ligne, 3, QTableWidgetItem(derniere_erreur or ""))
+            layout.addWidget(table)
+        boutons = QDialogButtonBox(QDialogButtonBox.Close)
+        reessayer_btn = boutons.addButton("Réessayer", QDialogButtonBox.AcceptRole)
+        reessayer_btn.clicked.connect(self.relancer_synchro_clicked.emit)
+        boutons.accepted.connect(dialogue.accept)
+        boutons.rejected.connect(dialogue.reject)
+        layout.addWidget(boutons)
+        dialogue.exec()
+
     def afficher_champs_obligatoires(self):
         """Afficher un message indiquant que des champs obligatoires sont manquants"""
         QMessageBox.warning(self, "Champs Obligatoires", "Veuillez remplir tous les champs obligatoires du rendez-vous.")
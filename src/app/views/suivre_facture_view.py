@@ -1,5 +1,5 @@
 from PySide6.QtWidgets import (QMainWindow, QWidget, QGridLayout, QTableWidget, 
-                               QTableWidgetItem, QLabel, QPushButton, QLineEdit,QComboBox,QDateEdit)
+                               QTableWidgetItem, QLabel, QPushButton, QLineEdit,QComboBox,QDateEdit, QMessageBox)
 from PySide6.QtCore import Qt, Signal
 from app.model.facture import Facture
 
@@ -130,6 +130,15 @@ class SuivreFactureView(QWidget):
             self.facture_table.setItem(row_position, 4, QTableWidgetItem(date_paiement_str))
             self.facture_table.setItem(row_position, 5, QTableWidgetItem(facture.description))
 
+    def afficher_erreur(self, message: str, erreur: Exception) -> None:
+        """
+        Affiche l'échec d'un chargement.
+        Args:
+            message (str): Ce qui n'a pas pu être fait.
+            erreur (Exception): Erreur levée.
+        """
+        QMessageBox.critical(self, "Suivi des factures", f"{message}\n\n{erreur}")
+
     def display_facture_details(self, facture, lignes_facture) -> None:
         """
         Affiche les détails d'une facture sélectionnée.
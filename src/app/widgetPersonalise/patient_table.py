@@ -0,0 +1,165 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QPersistentModelIndex, QSortFilterProxyModel, Qt
+
+from app.model.patient import ListePatients, Patient
+
+# Colonne (masquée) contenant l'identifiant du patient
+COLONNE_ID = 0
+
+# Colonnes de la table : en-tête et champ de ListePatients
+COLONNES = [
+    ("ID", "id"),
+    ("Nom", "nom"),
+    ("Prenom", "prenom"),
+    ("Age", "age"),
+    ("Niveau scolaire", "niveau"),
+    ("Ecole", "ecole"),
+    ("Date de Naissance", "date_naissance"),
+    ("Ville", "ville"),
+    ("Téléphone", "telephone1"),
+    ("Email", "email"),
+    ("Etat du suivi", "etat_suivi"),
+]
+
+
+class PatientTableModel(QAbstractTableModel):
+    """
+    Modèle de la table des patients, lu directement dans les colonnes de ListePatients.
+
+    Aucune cellule n'est créée à l'avance : la vue ne demande que les lignes
+    visibles, le coût de l'affichage ne dépend donc pas du nombre de patients.
+    """
+    def __init__(self, parent=None) -> None:
+        """
+        Initialise un modèle vide.
+
+        Args:
+            parent (QObject, optionnel): Parent Qt.
+        """
+        super().__init__(parent)
+        self.liste = ListePatients([])
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Nombre de patients."""
+        return 0 if parent.isValid() else len(self.liste)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Nombre de colonnes affichées."""
+        return 0 if parent.isValid() else len(COLONNES)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        """En-têtes des colonnes."""
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLONNES[section][0]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Valeur d'une cellule ; l'identifiant et l'âge restent numériques pour le tri."""
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self.liste.valeur(index.row(), COLONNES[index.column()][1])
+
+    def set_liste(self, liste: ListePatients) -> None:
+        """
+        Remplace la liste affichée.
+
+        Args:
+            liste (ListePatients): Colonnes de la liste des patients.
+        """
+        self.beginResetModel()
+        self.liste = liste
+        self.endResetModel()
+
+    def patient_id(self, row: int) -> int:
+        """
+        Identifiant du patient d'une ligne.
+
+        Args:
+            row (int): Ligne du modèle.
+
+        Returns:
+            int: Identifiant du patient.
+        """
+        return self.liste.ids[row]
+
+    def ajouter(self, patient: Patient) -> None:
+        """
+        Ajoute un patient créé.
+
+        Args:
+            patient (Patient): Patient enregistré (avec son identifiant).
+        """
+        row = len(self.liste)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.liste.ajouter(patient)
+        self.endInsertRows()
+
+    def mettre_a_jour(self, row: int, patient: Patient) -> None:
+        """
+        Met à jour la ligne d'un patient modifié.
+
+        Args:
+            row (int): Ligne du modèle.
+            patient (Patient): Nouvelles données du patient.
+        """
+        self.liste.mettre_a_jour(row, patient)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLONNES) - 1))
+
+    def retirer(self, patient_id: int) -> None:
+        """
+        Retire un patient supprimé.
+
+        Args:
+            patient_id (int): Identifiant du patient.
+        """
+        row = self.liste.ligne(patient_id)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.liste.retirer(row)
+        self.endRemoveRows()
+
+
+class PatientFiltreProxy(QSortFilterProxyModel):
+    """
+    Filtre de la table des patients à partir des résultats de la recherche plein texte.
+
+    La recherche est faite par la base (Patient.rechercherPatients) ; le proxy ne fait
+    que garder les lignes dont l'identifiant fait partie des résultats. Trié sur la
+    colonne des identifiants, il affiche les résultats par pertinence.
+    """
+    def __init__(self, parent=None) -> None:
+        """
+        Initialise un filtre qui laisse passer tous les patients.
+
+        Args:
+            parent (QObject, optionnel): Parent Qt.
+        """
+        super().__init__(parent)
+        # rang de chaque patient trouvé, None quand aucune recherche n'est active
+        self._rangs: dict[int, int] | None = None
+
+    def set_resultats(self, patient_ids: list[int] | None) -> None:
+        """
+        Applique le résultat d'une recherche.
+
+        Args:
+            patient_ids (list[int] | None): Identifiants trouvés, du plus pertinent au moins pertinent ; None pour tout afficher.
+        """
+        self._rangs = None if patient_ids is None else {patient_id: rang for rang, patient_id in enumerate(patient_ids)}
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex | QPersistentModelIndex) -> bool:
+        """Garde les patients trouvés par la recherche (tous si aucune recherche n'est active)."""
+        if self._rangs is None:
+            return True
+        return self._patient_id(source_row) in self._rangs
+
+    def lessThan(self, source_left: QModelIndex | QPersistentModelIndex, source_right: QModelIndex | QPersistentModelIndex) -> bool:
+        """Trie par pertinence sur la colonne des identifiants pendant une recherche."""
+        if self._rangs is not None and source_left.column() == COLONNE_ID:
+            return self._rangs.get(self._patient_id(source_left.row()), 0) < self._rangs.get(self._patient_id(source_right.row()), 0)
+        return super().lessThan(source_left, source_right)
+
+    def _patient_id(self, source_row: int) -> int:
+        """Identifiant du patient d'une ligne du modèle source."""
+        return self.sourceModel().patient_id(source_row)
@@ -0,0 +1,216 @@
+from datetime import date, timedelta
+
+from PySide6.QtCore import QEvent, QPointF, QRectF, QSize, Qt, Signal
+from PySide6.QtGui import QColor, QFont, QHelpEvent, QMouseEvent, QPainter, QPaintEvent
+from PySide6.QtWidgets import QSizePolicy, QToolTip, QWidget
+
+from app.services.occupation import OccupationJour
+
+JOURS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi"]
+DEMI_JOURNEES = ["Matin", "Après-midi"]
+
+
+class ApercuOccupation(QWidget):
+    """
+    Vue d'ensemble de l'occupation du planning sur plusieurs semaines (mois, 4 semaines, trimestre).
+
+    Une ligne par semaine, une colonne par jour (Lundi à Samedi). Chaque jour affiche
+    deux barres, matin et après-midi, découpées par type de rendez-vous au prorata
+    du temps occupé : la place restante est la capacité libre.
+
+    Tout est dessiné dans paintEvent à partir de l'occupation agrégée (aucun widget
+    par jour), et seules les semaines visibles sont redessinées : le widget peut être
+    placé dans un QScrollArea pour parcourir un trimestre entier.
+    """
+    jour_clicked: Signal = Signal(object)
+    """Signal émis lors du clic sur un jour (date)."""
+
+    HAUTEUR_ENTETE = 24
+    HAUTEUR_SEMAINE = 84
+    LARGEUR_NUMERO = 36
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        """
+        Initialise un aperçu vide.
+
+        Args:
+            parent (QWidget | None, optionnel): Parent Qt.
+        """
+        super().__init__(parent)
+        self.debut: date | None = None
+        self.nb_semaines = 0
+        self.mois: int | None = None
+        self.occupation: dict[date, OccupationJour] = {}
+        self._couleurs: dict[str, QColor] = {}
+        self.police_entete = QFont()
+        self.police_entete.setBold(True)
+        self.police_jour = QFont()
+        self.police_jour.setPointSize(8)
+        self.setMouseTracking(True)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+    # --- Données ---
+
+    def set_periode(self, debut: date, nb_semaines: int, occupation: dict[date, OccupationJour], mois: int | None = None) -> None:
+        """
+        Remplace la période affichée.
+
+        Args:
+            debut (date): Lundi de la première semaine.
+            nb_semaines (int): Nombre de semaines affichées.
+            occupation (dict[date, OccupationJour]): Occupation de chaque jour de la période.
+            mois (int | None, optionnel): Mois affiché en vue mois ; les jours des autres mois sont grisés.
+        """
+        self.debut = debut
+        self.nb_semaines = nb_semaines
+        self.occupation = occupation
+        self.mois = mois
+        self.setFixedHeight(self.HAUTEUR_ENTETE + nb_semaines * self.HAUTEUR_SEMAINE)
+        self.update()
+
+    def sizeHint(self) -> QSize:
+        """Hauteur nécessaire pour toutes les semaines de la période."""
+        return QSize(800, self.HAUTEUR_ENTETE + self.nb_semaines * self.HAUTEUR_SEMAINE)
+
+    def jour_a(self, position: QPointF) -> date | None:
+        """
+        Retourne le jour situé sous une position du widget.
+
+        Args:
+            position (QPointF): Position dans le widget.
+
+        Returns:
+            date | None: Jour sous la position, ou None hors des jours.
+        """
+        if self.debut is None or position.y() < self.HAUTEUR_ENTETE or position.x() < self.LARGEUR_NUMERO:
+            return None
+        semaine = int((position.y() - self.HAUTEUR_ENTETE) // self.HAUTEUR_SEMAINE)
+        colonne = int((position.x() - self.LARGEUR_NUMERO) // self._largeur_jour())
+        if semaine >= self.nb_semaines or colonne >= len(JOURS):
+            return None
+        return self.debut + timedelta(days=7 * semaine + colonne)
+
+    # --- Événements Qt ---
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        """Émet jour_clicked avec le jour cliqué."""
+        jour = self.jour_a(event.position())
+        if jour is not None and event.button() == Qt.LeftButton:
+            self.jour_clicked.emit(jour)
+
+    def event(self, event: QEvent) -> bool:
+        """Affiche le détail par type du jour survolé."""
+        if event.type() == QEvent.ToolTip:
+            helpEvent: QHelpEvent = event
+            jour = self.jour_a(QPointF(helpEvent.pos()))
+            occupation = self.occupation.get(jour) if jour is not None else None
+            if occupation is None:
+                QToolTip.hideText()
+            else:
+                QToolTip.showText(helpEvent.globalPos(), self._infobulle(occupation), self)
+            return True
+        return super().event(event)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """Dessine l'en-tête et les semaines intersectant la zone à redessiner."""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        zone = event.rect()
+        largeur = self._largeur_jour()
+
+        if zone.top() < self.HAUTEUR_ENTETE:
+            painter.setFont(self.police_entete)
+            painter.setPen(QColor("#333333"))
+            for colonne, nom in enumerate(JOURS):
+                rect = QRectF(self.LARGEUR_NUMERO + colonne * largeur, 0, largeur, self.HAUTEUR_ENTETE)
+                painter.drawText(rect, Qt.AlignCenter, nom)
+
+        if self.debut is None:
+            return
+        premiere = max(0, (zone.top() - self.HAUTEUR_ENTETE) // self.HAUTEUR_SEMAINE)
+        derniere = min(self.nb_semaines - 1, (zone.bottom() - self.HAUTEUR_ENTETE) // self.HAUTEUR_SEMAINE)
+        aujourd_hui = date.today()
+        for semaine in range(premiere, derniere + 1):
+            y = self.HAUTEUR_ENTETE + semaine * self.HAUTEUR_SEMAINE
+            lundi = self.debut + timedelta(days=7 * semaine)
+            painter.setFont(self.police_jour)
+            painter.setPen(QColor("#888888"))
+            painter.drawText(QRectF(0, y, self.LARGEUR_NUMERO, self.HAUTEUR_SEMAINE), Qt.AlignCenter, f"S{lundi.isocalendar()[1]}")
+            for colonne in range(len(JOURS)):
+                jour = lundi + timedelta(days=colonne)
+                rect = QRectF(self.LARGEUR_NUMERO + colonne * largeur, y, largeur, self.HAUTEUR_SEMAINE).adjusted(2, 2, -2, -2)
+                self._dessiner_jour(painter, rect, jour, self.occupation.get(jour), jour == aujourd_hui)
+        painter.end()
+
+    # --- Dessin ---
+
+    def _dessiner_jour(self, painter: QPainter, rect: QRectF, jour: date, occupation: OccupationJour | None, aujourd_hui: bool) -> None:
+        """Dessine la case d'un jour : date, nombre de rendez-vous et barres d'occupation."""
+        hors_mois = self.mois is not None and jour.month != self.mois
+        ferme = occupation is None or occupation.ferme
+        painter.setPen(QColor("#1e88e5") if aujourd_hui else QColor("#d0d0d0"))
+        painter.setBrush(QColor("#f0f0f0") if ferme or hors_mois else QColor("#ffffff"))
+        painter.drawRoundedRect(rect, 3, 3)
+
+        painter.setFont(self.police_jour)
+        painter.setPen(QColor("#aaaaaa") if hors_mois else QColor("#333333"))
+        entete = rect.adjusted(4, 2, -4, 0)
+        entete.setHeight(16)
+        painter.drawText(entete, Qt.AlignLeft | Qt.AlignVCenter, jour.strftime('%d/%m'))
+        if occupation is None:
+            return
+        if occupation.ferme:
+            painter.drawText(entete, Qt.AlignRight | Qt.AlignVCenter, "Fermé")
+            return
+        nombre = occupation.nombre()
+        if nombre:
+            painter.drawText(entete, Qt.AlignRight | Qt.AlignVCenter, f"{nombre} RDV")
+
+        hauteur_barre = (rect.height() - 26) / 2
+        for demi_journee in (0, 1):
+            barre = QRectF(rect.left() + 4, rect.top() + 20 + demi_journee * (hauteur_barre + 2), rect.width() - 8, hauteur_barre)
+            self._dessiner_barre(painter, barre, occupation, demi_journee)
+
+    def _dessiner_barre(self, painter: QPainter, barre: QRectF, occupation: OccupationJour, demi_journee: int) -> None:
+        """Dessine la barre d'une demi-journée : un segment par type, proportionnel au temps occupé."""
+        capacite = occupation.capacite[demi_journee]
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#e8f5e9") if capacite else QColor("#eeeeee"))
+        painter.drawRect(barre)
+        if not capacite:
+            return
+        x = barre.left()
+        for ligne in occupation.demi_journees[demi_journee]:
+            largeur = min(barre.right() - x, barre.width() * ligne.minutes / capacite)
+            if largeur <= 0:
+                break
+            painter.setBrush(self._couleur(ligne.couleur))
+            painter.drawRect(QRectF(x, barre.top(), largeur, barre.height()))
+            x += largeur
+        painter.setPen(QColor("#333333"))
+        painter.drawText(barre.adjusted(3, 0, -3, 0), Qt.AlignRight | Qt.AlignVCenter, f"{occupation.taux(demi_journee):.0%}")
+
+    def _largeur_jour(self) -> float:
+        """Largeur d'une colonne de jour."""
+        return max(1.0, (self.width() - self.LARGEUR_NUMERO) / len(JOURS))
+
+    def _couleur(self, couleur: str) -> QColor:
+        """Retourne la QColor d'un type (créée une seule fois par couleur)."""
+        qcouleur = self._couleurs.get(couleur)
+        if qcouleur is None:
+            qcouleur = QColor(couleur)
+            self._couleurs[couleur] = qcouleur
+        return qcouleur
+
+    @staticmethod
+    def _infobulle(occupation: OccupationJour) -> str:
+        """Texte HTML de l'infobulle d'un jour."""
+        texte = f"<b>{occupation.jour.strftime('%d/%m/%Y')}</b>"
+        if occupation.ferme:
+            return texte + "<br>Fermé"
+        for demi_journee, nom in enumerate(DEMI_JOURNEES):
+            texte += f"<br><b>{nom}</b> : {occupation.taux(demi_journee):.0%}"
+            for ligne in occupation.demi_journees[demi_journee]:
+                texte += f"<br>&nbsp;&nbsp;{ligne.type_nom} : {ligne.nombre} RDV ({ligne.minutes} min)"
+        heures, minutes = divmod(occupation.minutes_libres(), 60)
+        return texte + f"<br>Libre : {heures}h{minutes:02d}"
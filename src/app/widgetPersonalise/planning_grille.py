@@ -0,0 +1,287 @@
+from datetime import datetime, timedelta
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QPersistentModelIndex, Qt
+from PySide6.QtGui import QColor, QFont, QPainter
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+
+from app.model.rendezVous import RendezVousSemaine
+
+JOURS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi"]
+
+
+class PlanningModel(QAbstractTableModel):
+    """
+    Modèle de la grille du planning : une ligne par créneau, une colonne pour
+    l'heure puis une par jour (Lundi à Samedi).
+
+    Le modèle ne garde que les rendez-vous de la semaine, indexés par cellule de
+    début ; textes, couleurs et infobulles sont calculés à la demande dans data().
+    Changer de semaine remplace les données sans recréer de widget.
+    """
+    def __init__(self, time_slots: list[str], precision: int = 15, parent=None) -> None:
+        """
+        Initialise le modèle.
+
+        Args:
+            time_slots (list[str]): Créneaux affichés, au format "HH:MM".
+            precision (int, optionnel): Durée d'un créneau en minutes. Défaut: 15.
+            parent (QObject, optionnel): Parent Qt.
+        """
+        super().__init__(parent)
+        self.time_slots = time_slots
+        self.precision = precision
+        self._ligne_par_slot: dict[str, int] = {slot: row for row, slot in enumerate(time_slots)}
+        self.debut_semaine: datetime | None = None
+        # rendez-vous par cellule de début (row, col) ; plusieurs pour une séance de groupe
+        self._cellules: dict[tuple[int, int], list[RendezVousSemaine]] = {}
+        self._couleurs: dict[str, QColor] = {}
+        # Polices partagées par toutes les cellules
+        self.police_rdv = QFont()
+        self.police_rdv.setPointSize(9)
+        self.police_rdv.setBold(True)
+        self.police_heure = QFont()
+        self.police_heure.setBold(True)
+
+    # --- API Qt ---
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Nombre de créneaux."""
+        return 0 if parent.isValid() else len(self.time_slots)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Colonne des heures + 6 jours."""
+        return 0 if parent.isValid() else len(JOURS) + 1
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        """En-têtes des jours, avec la date si la semaine est connue."""
+        if orientation != Qt.Horizontal or role != Qt.DisplayRole:
+            return None
+        if section == 0:
+            return "Heure"
+        if self.debut_semaine is None:
+            return JOURS[section - 1]
+        return f"{JOURS[section - 1]} {(self.debut_semaine + timedelta(days=section - 1)).strftime('%d/%m')}"
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        """Cellules cliquables, ni sélectionnables ni éditables."""
+        return Qt.ItemIsEnabled
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Calcule à la demande l'affichage d'une cellule."""
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if col == 0:
+            if role == Qt.DisplayRole:
+                return self.time_slots[row]
+            if role == Qt.FontRole:
+                return self.police_heure
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+            return None
+
+        lignes = self._cellules.get((row, col))
+        if not lignes:
+            return None
+        ligne = lignes[0]
+        if role == Qt.DisplayRole:
+            texte = f"{ligne.rdv.date.strftime('%H:%M')}-{(ligne.rdv.date + ligne.duree).strftime('%H:%M')}\n{ligne.patient_nom} {ligne.patient_prenom}"
+            if len(lignes) > 1:
+                texte += f" (+{len(lignes) - 1})"
+            return texte
+        if role == Qt.BackgroundRole:
+            return self._couleur(ligne.couleur)
+        if role == Qt.FontRole:
+            return self.police_rdv
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ToolTipRole:
+            return "<br>".join(self._infobulle(l) for l in lignes)
+        if role == Qt.UserRole:
+            return ligne
+        return None
+
+    # --- Données de la semaine ---
+
+    def set_semaine(self, debut_semaine: datetime, lignes: list[RendezVousSemaine]) -> None:
+        """
+        Remplace les rendez-vous affichés par ceux d'une autre semaine.
+
+        Args:
+            debut_semaine (datetime): Lundi de la semaine.
+            lignes (list[RendezVousSemaine]): Rendez-vous de la semaine.
+        """
+        self.beginResetModel()
+        self.debut_semaine = debut_semaine
+        self._cellules = {}
+        for ligne in lignes:
+            position = self.position(ligne)
+            if position is not None:
+                self._cellules.setdefault(position, []).append(ligne)
+        self.endResetModel()
+
+    def set_debut_semaine(self, debut_semaine: datetime) -> None:
+        """
+        Met à jour les dates des en-têtes.
+
+        Args:
+            debut_semaine (datetime): Lundi de la semaine.
+        """
+        self.debut_semaine = debut_semaine
+        self.headerDataChanged.emit(Qt.Horizontal, 1, len(JOURS))
+
+    def vider(self) -> None:
+        """Retire tous les rendez-vous."""
+        self.beginResetModel()
+        self._cellules = {}
+        self.endResetModel()
+
+    def ajouter(self, ligne: RendezVousSemaine) -> tuple[int, int] | None:
+        """
+        Ajoute un rendez-vous ; seules les cellules concernées sont redessinées.
+
+        Args:
+            ligne (RendezVousSemaine): Rendez-vous à afficher.
+
+        Returns:
+            tuple[int, int] | None: Cellule de début, ou None si le rendez-vous est hors de la grille.
+        """
+        position = self.position(ligne)
+        if position is None:
+            return None
+        self._cellules.setdefault(position, []).append(ligne)
+        self._cellules_modifiees(position, self.hauteur(position))
+        return position
+
+    def retirer(self, rdv_id: int) -> tuple[int, int] | None:
+        """
+        Retire un rendez-vous ; seules les cellules concernées sont redessinées.
+
+        Args:
+            rdv_id (int): Identifiant du rendez-vous.
+
+        Returns:
+            tuple[int, int] | None: Cellule de début libérée, ou None si le rendez-vous n'était pas affiché.
+        """
+        for position, lignes in self._cellules.items():
+            for ligne in lignes:
+                if ligne.rdv.id == rdv_id:
+                    hauteur = self.hauteur(position)
+                    lignes.remove(ligne)
+                    if not lignes:
+                        del self._cellules[position]
+                    self._cellules_modifiees(position, hauteur)
+                    return position
+        return None
+
+    def rdv_a(self, row: int, col: int) -> RendezVousSemaine | None:
+        """
+        Retourne le rendez-vous commençant dans une cellule.
+
+        Args:
+            row (int): Ligne (créneau).
+            col (int): Colonne (1=Lundi).
+
+        Returns:
+            RendezVousSemaine | None: Le premier rendez-vous de la cellule, s'il y en a un.
+        """
+        lignes = self._cellules.get((row, col))
+        return lignes[0] if lignes else None
+
+    def position(self, ligne: RendezVousSemaine) -> tuple[int, int] | None:
+        """
+        Calcule la cellule de début d'un rendez-vous.
+
+        Args:
+            ligne (RendezVousSemaine): Rendez-vous.
+
+        Returns:
+            tuple[int, int] | None: (ligne, colonne), ou None si hors de la grille.
+        """
+        date = ligne.rdv.date
+        # Arrondir au créneau le plus proche
+        time_slot = f"{date.hour:02d}:{(date.minute // self.precision) * self.precision:02d}"
+        row = self._ligne_par_slot.get(time_slot)
+        col = date.weekday() + 1  # +1 car colonne 0 = heures
+        if row is None or col >= self.columnCount():
+            return None
+        return row, col
+
+    def hauteur(self, position: tuple[int, int]) -> int:
+        """
+        Nombre de créneaux couverts par les rendez-vous d'une cellule.
+
+        Args:
+            position (tuple[int, int]): Cellule de début.
+
+        Returns:
+            int: Nombre de lignes à fusionner (au moins 1).
+        """
+        lignes = self._cellules.get(position)
+        if not lignes:
+            return 1
+        duree = max(ligne.duree for ligne in lignes)
+        return max(1, int(duree.total_seconds() // (self.precision * 60)))
+
+    def fusions(self) -> list[tuple[int, int, int]]:
+        """
+        Retourne les fusions de cellules à appliquer sur la vue.
+
+        Returns:
+            list[tuple[int, int, int]]: (ligne, colonne, hauteur) pour chaque cellule de plus d'un créneau.
+        """
+        fusions = []
+        for position in self._cellules:
+            hauteur = self.hauteur(position)
+            if hauteur > 1:
+                fusions.append((position[0], position[1], hauteur))
+        return fusions
+
+    # --- Utilitaires ---
+
+    def _cellules_modifiees(self, position: tuple[int, int], hauteur: int) -> None:
+        """Signale à la vue les cellules à redessiner."""
+        row, col = position
+        fin = min(row + hauteur, self.rowCount()) - 1
+        self.dataChanged.emit(self.index(row, col), self.index(fin, col))
+
+    def _couleur(self, couleur: str) -> QColor:
+        """Retourne la QColor d'un type (créée une seule fois par couleur)."""
+        qcouleur = self._couleurs.get(couleur)
+        if qcouleur is None:
+            qcouleur = QColor(couleur)
+            self._couleurs[couleur] = qcouleur
+        return qcouleur
+
+    @staticmethod
+    def _infobulle(ligne: RendezVousSemaine) -> str:
+        """Texte HTML de l'infobulle d'un rendez-vous."""
+        date = ligne.rdv.date
+        return f"""
+        <b>{ligne.patient_nom} {ligne.patient_prenom}</b><br>
+        {date.strftime('%d/%m/%Y')}<br>
+        {date.strftime('%H:%M')} - {(date + ligne.duree).strftime('%H:%M')}<br>
+        {ligne.localisation}<br>
+        """
+
+
+class PlanningDelegate(QStyledItemDelegate):
+    """Dessine les rendez-vous du planning : bloc de la couleur du type, texte lisible sur ce fond."""
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex | QPersistentModelIndex) -> None:
+        """Dessine une cellule de rendez-vous ; les autres cellules gardent le rendu par défaut."""
+        couleur = index.data(Qt.BackgroundRole)
+        if index.column() == 0 or couleur is None:
+            super().paint(painter, option, index)
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(couleur.darker(130))
+        painter.setBrush(couleur)
+        painter.drawRoundedRect(option.rect.adjusted(1, 1, -1, -1), 3, 3)
+        # texte noir ou blanc selon la luminosité du fond
+        painter.setPen(QColor("#000000") if couleur.lightness() > 140 else QColor("#ffffff"))
+        painter.setFont(index.data(Qt.FontRole) or option.font)
+        painter.drawText(option.rect.adjusted(2, 0, -2, 0), Qt.AlignCenter | Qt.TextWordWrap, index.data(Qt.DisplayRole) or "")
+        painter.restore()
@@ -1,25 +1,31 @@
+# En premier : la trace du démarrage date les imports qui suivent
+from app.services.trace_demarrage import trace, suivre_premier_affichage
+trace.marquer("exécution de main.py")
 import sqlite3
+import multiprocessing
 from app.database.setup_db import initDB
+from app.database.migrations import migrer
 import sys
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QPalette, QColor, QIcon
 from app.views.main_window_view import MainWindow
 from app.controllers.main_controller import MainController
 
-import app.services.calendar_api as calendar_api
+from app.services.synchro_calendrier import synchro
+trace.marquer("imports terminés")
 
 def main():
     """Point d'entrée de l'application"""
     #initDB()
+    # Mettre à jour le schéma de la base existante (tables, index) sans perte de données
+    migrer()
+    trace.marquer("base ouverte et migrée")
     # Initialiser les données de test
     #initAllTestData()
-    try : 
-        calendar_api.create_calendar_if_not_exist()
-    except Exception as e:
-        print(f"[ERREUR] {e}")
-    
     app = QApplication(sys.argv)
     app.setApplicationName("CabiLib - Gestion Cabinet")
+    trace.marquer("QApplication créée")
 
     app.setWindowIcon(QIcon('cabilib_logo.png'))      
     # Forcer le mode clair avec palette personnalisée
@@ -44,13 +50,24 @@ def main():
     
     # Créer la fenêtre principale
     main_window = MainWindow()
+    trace.marquer("fenêtre principale créée")
+    suivre_premier_affichage(main_window)
     controller = MainController(main_window)
+    trace.marquer("contrôleur principal créé")
 
     main_window.show()
+    # Synchronisation Google Agenda en arrière-plan, lancée une fois la fenêtre affichée :
+    # son premier passage retrouve ou crée l'agenda, le démarrage n'attend pas le réseau
+    QTimer.singleShot(0, synchro.demarrer)
 
     # Lancer l'application
-    sys.exit(app.exec())
+    code = app.exec()
+    # laisser la synchronisation terminer l'envoi en cours (le reste de la file est gardé en base)
+    synchro.arreter(attente=5)
+    sys.exit(code)
 
 
 if __name__ == '__main__':
+    # Nécessaire aux processus de rendu des factures dans l'exécutable packagé
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,88 @@
+"""
+Mesure du temps d'import de l'application au démarrage (python -X importtime).
+
+Lance plusieurs fois "import main" dans un nouvel interpréteur, affiche la durée
+médiane et les modules les plus coûteux, et échoue (code de sortie 1) si un module
+lourd réservé à un usage ultérieur est importé au démarrage ou si la durée dépasse
+le seuil donné :
+
+    python mesure_demarrage.py --essais 5 --seuil-ms 800
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules lourds qui ne doivent être importés qu'à leur première utilisation
+MODULES_DIFFERES = ("weasyprint", "googleapiclient", "google_auth_oauthlib", "google.auth", "google.oauth2")
+
+
+def mesurer_imports(module: str = "main") -> dict[str, tuple[int, int]]:
+    """
+    Importe un module dans un nouvel interpréteur avec -X importtime.
+
+    Args:
+        module (str, optionnel): Module à importer. Défaut: "main".
+
+    Returns:
+        dict[str, tuple[int, int]]: Temps propre et cumulé (microsecondes) de chaque module importé.
+
+    Raises:
+        RuntimeError: Si l'import échoue.
+    """
+    resultat = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True
+    )
+    if resultat.returncode != 0:
+        erreur = "\n".join(ligne for ligne in resultat.stderr.splitlines() if not ligne.startswith("import time:"))
+        raise RuntimeError(f"Echec de l'import de {module} :\n{erreur}")
+    temps = {}
+    for ligne in resultat.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not ligne.startswith("import time:") or "imported package" in ligne:
+            continue
+        propre, cumule, nom = ligne[len("import time:"):].split("|", 2)
+        temps[nom.strip()] = (int(propre), int(cumule))
+    return temps
+
+
+def main() -> int:
+    """
+    Mesure le temps d'import de l'application selon les options de la ligne de commande
+    et affiche la durée médiane et les modules les plus coûteux.
+
+    Returns:
+        int: Code de sortie : 1 si un module différé est importé au démarrage ou si le seuil est dépassé, 0 sinon.
+    """
+    parser = argparse.ArgumentParser(description="Mesure du temps d'import au démarrage de CabiLib")
+    parser.add_argument("--essais", type=int, default=5, help="nombre de mesures (la médiane est retenue)")
+    parser.add_argument("--seuil-ms", type=float, default=None, help="durée médiane maximale acceptée (millisecondes)")
+    parser.add_argument("--top", type=int, default=15, help="nombre de modules les plus coûteux affichés")
+    arguments = parser.parse_args()
+
+    mesures = sorted((mesurer_imports() for _ in range(arguments.essais)), key=lambda mesure: mesure["main"][1])
+    durees = [mesure["main"][1] / 1000 for mesure in mesures]
+    mediane = statistics.median(durees)
+    # détail de l'essai médian
+    mesure = mesures[len(mesures) // 2]
+
+    print(f"import main : {mediane:.0f} ms (médiane de {len(durees)} essai(s), min {durees[0]:.0f} ms, max {durees[-1]:.0f} ms)")
+    print(f"{len(mesure)} modules importés ; les plus coûteux (temps propre) :")
+    for nom, (propre, cumule) in sorted(mesure.items(), key=lambda element: element[1][0], reverse=True)[:arguments.top]:
+        print(f"  {propre / 1000:8.1f} ms  (cumulé {cumule / 1000:8.1f} ms)  {nom}")
+
+    echec = False
+    importes = [nom for nom in mesure if nom.startswith(MODULES_DIFFERES)]
+    if importes:
+        print(f"[ERREUR] modules importés au démarrage au lieu de leur première utilisation : {', '.join(sorted(importes))}")
+        echec = True
+    if arguments.seuil_ms is not None and mediane > arguments.seuil_ms:
+        print(f"[ERREUR] démarrage trop lent : {mediane:.0f} ms > {arguments.seuil_ms:.0f} ms")
+        echec = True
+    return 1 if echec else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())